@@ -84,6 +84,8 @@ class Pipe:
     def __init__(self):
         self.valves = self.Valves()
         self.name: str = "Azure AI"
+        # Seconds Open WebUI may reuse the result of `pipes()` before calling it again
+        self.pipes_ttl: int = 300
 
     def validate_environment(self) -> None:
         """
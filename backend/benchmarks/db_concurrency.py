@@ -0,0 +1,124 @@
+"""
+Concurrent throughput of the table methods, synchronous vs async.
+
+Simulates many concurrent requests each reading a user and a chat and
+appending a status to a message, first through the synchronous methods
+called from coroutines (which block the event loop, as the handlers used
+to) and then through their async variants. Also reports the worst event
+loop stall seen by a ticker task, i.e. how long any other request (or a
+streaming response) would have been stuck.
+
+Usage (runs against a throwaway SQLite database unless DATABASE_URL is set):
+
+    python benchmarks/db_concurrency.py --requests 2000 --concurrency 64
+
+The async variants use the async driver, set DATABASE_ENABLE_ASYNC_DRIVER=false
+to measure their thread fallback (the default) instead.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="open-webui-benchmark-"))
+os.environ.setdefault("DATABASE_ENABLE_ASYNC_DRIVER", "true")
+
+from open_webui import config  # noqa: E402,F401  (runs the migrations)
+from open_webui.internal.db import async_engine, dispose_async_engines  # noqa: E402
+from open_webui.models.chats import ChatForm, Chats  # noqa: E402
+from open_webui.models.users import Users  # noqa: E402
+
+
+def seed(chats: int):
+    user_id = str(uuid.uuid4())
+    Users.insert_new_user(user_id, "Benchmark", f"{user_id}@example.com")
+
+    chat_ids = []
+    for i in range(chats):
+        chat = Chats.insert_new_chat(
+            user_id,
+            ChatForm(
+                chat={
+                    "title": f"Chat {i}",
+                    "history": {
+                        "messages": {"m": {"role": "assistant", "content": "x" * 4096}},
+                        "currentId": "m",
+                    },
+                }
+            ),
+        )
+        chat_ids.append(chat.id)
+
+    return user_id, chat_ids
+
+
+async def run_sync(user_id: str, chat_id: str):
+    Users.get_user_by_id(user_id)
+    Chats.get_chat_by_id_and_user_id(chat_id, user_id)
+    Chats.add_message_status_to_chat_by_id_and_message_id(
+        chat_id, "m", {"action": "benchmark"}
+    )
+
+
+async def run_async(user_id: str, chat_id: str):
+    await Users.aget_user_by_id(user_id)
+    await Chats.aget_chat_by_id_and_user_id(chat_id, user_id)
+    await Chats.aadd_message_status_to_chat_by_id_and_message_id(
+        chat_id, "m", {"action": "benchmark"}
+    )
+
+
+async def benchmark(name, handler, user_id, chat_ids, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    max_stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_stall = max(max_stall, time.perf_counter() - start - 0.001)
+
+    async def request(i):
+        async with semaphore:
+            await handler(user_id, chat_ids[i % len(chat_ids)])
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*[request(i) for i in range(requests)])
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+
+    print(
+        f"{name:>6}: {requests / elapsed:8.1f} req/s, "
+        f"{elapsed:6.2f}s total, worst loop stall {max_stall * 1000:7.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--chats", type=int, default=64)
+    args = parser.parse_args()
+
+    user_id, chat_ids = seed(args.chats)
+    print(f"async engine: {async_engine.url if async_engine else 'unavailable'}")
+
+    for name, handler in (("sync", run_sync), ("async", run_async)):
+        await benchmark(
+            name, handler, user_id, chat_ids, args.requests, args.concurrency
+        )
+
+    await dispose_async_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Serialization cost of chat documents with each available JSON codec.
+
+Builds chats of a few megabytes (long assistant answers with code, unicode,
+sources and status histories, like the ones re-serialized on every update
+of a streamed response) and times `dumps` and `loads` of the stdlib codec
+against the fast codecs installed.
+
+Usage:
+
+    python benchmarks/json_codec.py --sizes 1 4 16 --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from open_webui.utils import json_codec  # noqa: E402
+
+CODECS = {"json": (json_codec._json_dumps, json_codec._json_loads)}
+if json_codec.orjson is not None:
+    CODECS["orjson"] = (json_codec._orjson_dumps, json_codec._orjson_loads)
+if json_codec.msgspec is not None:
+    CODECS["msgspec"] = (json_codec._msgspec_dumps, json_codec._msgspec_loads)
+
+ANSWER = (
+    "Here is how you could implement it — with a few caveats ✅:\n\n"
+    "```python\ndef fib(n: int) -> int:\n    a, b = 0, 1\n"
+    "    for _ in range(n):\n        a, b = b, a + b\n    return a\n```\n\n"
+    "Das Ergebnis wächst exponentiell, 結果は指数関数的に増加します。\n"
+) * 8
+
+
+def build_message(role: str, parent_id) -> dict:
+    message_id = str(uuid.uuid4())
+    return {
+        "id": message_id,
+        "parentId": parent_id,
+        "childrenIds": [],
+        "role": role,
+        "content": ANSWER if role == "assistant" else "Explain fib",
+        "timestamp": int(time.time()),
+        "models": ["llama3.1:8b"],
+        "statusHistory": [
+            {"action": "web_search", "done": True, "urls": ["https://a.b"]}
+        ]
+        * 3,
+        "sources": [
+            {
+                "source": {"name": "doc.pdf"},
+                "document": ["Lorem ipsum dolor sit amet " * 20],
+                "metadata": [{"page": 1, "score": 0.87}],
+            }
+        ],
+    }
+
+
+def build_chat(size: int) -> dict:
+    """
+    Build a chat whose serialized size is about `size` bytes. Messages are
+    stored twice, in the history tree and in the flat list, like the UI does.
+    """
+    # Average serialized size of a user and an assistant message
+    message_size = (
+        sum(
+            len(json_codec._json_dumps(build_message(role, None)))
+            for role in ("user", "assistant")
+        )
+        / 2
+    )
+
+    messages = {}
+    parent_id = None
+    while len(messages) * message_size * 2 < size:
+        message = build_message("assistant" if len(messages) % 2 else "user", parent_id)
+        messages[message["id"]] = message
+        if parent_id:
+            messages[parent_id]["childrenIds"].append(message["id"])
+        parent_id = message["id"]
+
+    return {
+        "title": "Benchmark",
+        "models": ["llama3.1:8b"],
+        "history": {"messages": messages, "currentId": parent_id},
+        "messages": list(messages.values()),
+    }
+
+
+def measure(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"default codec: {json_codec.CODEC}")
+    for size in args.sizes:
+        chat = build_chat(size * 1024 * 1024)
+        document = json_codec._json_dumps(chat)
+        print(f"\n{len(document) / 1024 / 1024:.1f} MB chat:")
+
+        for name, (dumps, loads) in CODECS.items():
+            # Each codec reads back what it wrote (the stdlib escapes non-ASCII)
+            document = dumps(chat)
+            assert loads(document) == chat
+
+            dumps_time = measure(lambda: dumps(chat), args.rounds)
+            loads_time = measure(lambda: loads(document), args.rounds)
+            print(
+                f"{name:>8}: dumps {dumps_time * 1000:7.1f}ms, "
+                f"loads {loads_time * 1000:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
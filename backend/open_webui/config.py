@@ -4,6 +4,8 @@ import os
 import shutil
 import base64
 import redis
+import threading
+import time
 
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +23,7 @@ from open_webui.env import (
     REDIS_URL,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
+    REDIS_CONFIG_SYNC_INTERVAL,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
@@ -30,6 +33,7 @@ from open_webui.env import (
     log,
 )
 from open_webui.internal.db import Base, get_db
+from open_webui.utils import json_codec
 from open_webui.utils.redis import get_redis_connection
 
 
@@ -208,9 +212,25 @@ class PersistentConfig(Generic[T]):
         self.config_value = self.value
 
 
+REDIS_CONFIG_PREFIX = "open-webui:config"
+REDIS_CONFIG_CHANNEL = f"{REDIS_CONFIG_PREFIX}:changes"
+REDIS_CONFIG_VERSION_KEY = f"{REDIS_CONFIG_PREFIX}:__version__"
+
+
 class AppConfig:
+    """
+    Application config backed by PersistentConfig entries.
+
+    Reads are plain in-memory lookups. When Redis is configured, writes are
+    published on a pub/sub channel and a background thread applies changes
+    made by other nodes to the local snapshot. A version counter is polled
+    every REDIS_CONFIG_SYNC_INTERVAL seconds to resync after missed messages,
+    which bounds how stale a node can be.
+    """
+
     _state: dict[str, PersistentConfig]
     _redis: Optional[redis.Redis] = None
+    _sync_thread: Optional[threading.Thread] = None
 
     def __init__(
         self, redis_url: Optional[str] = None, redis_sentinels: Optional[list] = []
@@ -225,36 +245,94 @@ class AppConfig:
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
+
+            # Entries registered after the snapshot was taken need their own sync
+            if self._sync_thread:
+                self._sync_key(key)
         else:
             self._state[key].value = value
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"open-webui:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                redis_key = f"{REDIS_CONFIG_PREFIX}:{key}"
+                with self._redis.pipeline() as pipe:
+                    pipe.set(redis_key, json_codec.dumps(self._state[key].value))
+                    pipe.incr(REDIS_CONFIG_VERSION_KEY)
+                    pipe.publish(REDIS_CONFIG_CHANNEL, key)
+                    pipe.execute()
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"open-webui:config:{key}"
-            redis_value = self._redis.get(redis_key)
+        if self._redis and not self._sync_thread:
+            self._start_sync()
 
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+        return self._state[key].value
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+    def _start_sync(self):
+        thread = threading.Thread(
+            target=self._sync_loop, name="config-redis-sync", daemon=True
+        )
+        super().__setattr__("_sync_thread", thread)
+        thread.start()
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+    def _apply(self, key: str, redis_value: Optional[str]):
+        if redis_value is None or key not in self._state:
+            return
 
-        return self._state[key].value
+        try:
+            decoded_value = json_codec.loads(redis_value)
+
+            # Update the in-memory value if different
+            if self._state[key].value != decoded_value:
+                self._state[key].value = decoded_value
+                log.info(f"Updated {key} from Redis: {decoded_value}")
+
+        except json_codec.JSONDecodeError:
+            log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+    def _sync_key(self, key: str):
+        try:
+            self._apply(key, self._redis.get(f"{REDIS_CONFIG_PREFIX}:{key}"))
+        except Exception as e:
+            log.warning(f"Failed to sync {key} from Redis: {e}")
+
+    def _sync_all(self):
+        keys = list(self._state.keys())
+        if not keys:
+            return
+
+        values = self._redis.mget([f"{REDIS_CONFIG_PREFIX}:{key}" for key in keys])
+        for key, redis_value in zip(keys, values):
+            self._apply(key, redis_value)
+
+    def _sync_loop(self):
+        while True:
+            try:
+                # Closing the pubsub returns its connection before a retry
+                with self._redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    pubsub.subscribe(REDIS_CONFIG_CHANNEL)
+
+                    # Take the snapshot only once subscribed so no change slips through
+                    version = self._redis.get(REDIS_CONFIG_VERSION_KEY)
+                    self._sync_all()
+                    next_poll = time.monotonic() + REDIS_CONFIG_SYNC_INTERVAL
+
+                    while True:
+                        message = pubsub.get_message(timeout=REDIS_CONFIG_SYNC_INTERVAL)
+                        if message and message.get("type") == "message":
+                            self._sync_key(message["data"])
+
+                        if time.monotonic() >= next_poll:
+                            current_version = self._redis.get(REDIS_CONFIG_VERSION_KEY)
+                            if current_version != version:
+                                version = current_version
+                                self._sync_all()
+                            next_poll = time.monotonic() + REDIS_CONFIG_SYNC_INTERVAL
+            except Exception as e:
+                log.warning(f"Config sync from Redis interrupted, retrying: {e}")
+                time.sleep(1)
 
 
 ####################################
@@ -2016,6 +2094,18 @@ RAG_FULL_CONTEXT = PersistentConfig(
     os.getenv("RAG_FULL_CONTEXT", "False").lower() == "true",
 )
 
+# Retrieval results cached per (collection versions, query, retrieval params).
+# Set RAG_RETRIEVAL_CACHE_SIZE to 0 to disable.
+RAG_RETRIEVAL_CACHE_SIZE = int(os.environ.get("RAG_RETRIEVAL_CACHE_SIZE", "256"))
+RAG_RETRIEVAL_CACHE_TTL = int(os.environ.get("RAG_RETRIEVAL_CACHE_TTL", "3600"))
+# Upper bound of the serialized size of all cached results of a worker
+RAG_RETRIEVAL_CACHE_MAX_BYTES = int(
+    os.environ.get("RAG_RETRIEVAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Maximum number of attached files/collections retrieved concurrently per request
+RAG_RETRIEVAL_CONCURRENCY = int(os.environ.get("RAG_RETRIEVAL_CONCURRENCY", "8"))
+
 RAG_FILE_MAX_COUNT = PersistentConfig(
     "RAG_FILE_MAX_COUNT",
     "rag.file.max_count",
@@ -310,6 +310,65 @@ else:
     except Exception:
         DATABASE_POOL_RECYCLE = 3600
 
+# Run SQLite in WAL mode, with a pool of read-only connections and writes
+# serialized through a single writer connection
+DATABASE_ENABLE_SQLITE_WAL = (
+    os.environ.get("DATABASE_ENABLE_SQLITE_WAL", "False").lower() == "true"
+)
+
+# Serve the `a*` table methods through an async driver (aiosqlite/asyncpg)
+# instead of running the synchronous methods in a thread. Both keep the event
+# loop free, but aiosqlite is slower than threads on SQLite (it hops through a
+# thread per connection anyway), so it's opt-in and mostly worth it for
+# PostgreSQL under high concurrency
+DATABASE_ENABLE_ASYNC_DRIVER = (
+    os.environ.get("DATABASE_ENABLE_ASYNC_DRIVER", "False").lower() == "true"
+)
+
+# Number of read-only connections kept open in WAL mode
+DATABASE_SQLITE_READ_POOL_SIZE = os.environ.get("DATABASE_SQLITE_READ_POOL_SIZE", 8)
+
+try:
+    DATABASE_SQLITE_READ_POOL_SIZE = max(int(DATABASE_SQLITE_READ_POOL_SIZE), 1)
+except ValueError:
+    DATABASE_SQLITE_READ_POOL_SIZE = 8
+
+# Bytes of the database file memory-mapped by each connection in WAL mode
+DATABASE_SQLITE_MMAP_SIZE = os.environ.get("DATABASE_SQLITE_MMAP_SIZE", 268435456)
+
+try:
+    DATABASE_SQLITE_MMAP_SIZE = int(DATABASE_SQLITE_MMAP_SIZE)
+except ValueError:
+    DATABASE_SQLITE_MMAP_SIZE = 268435456
+
+# JSON codec of database columns, Redis state and websocket payloads: "auto"
+# (orjson, then msgspec, when installed), "orjson", "msgspec" or "json"
+JSON_CODEC = os.environ.get("JSON_CODEC", "auto").lower()
+
+# Store chat documents of at least CHAT_COMPRESSION_THRESHOLD bytes of JSON
+# zstd compressed (needs the zstandard package)
+ENABLE_CHAT_COMPRESSION = (
+    os.environ.get("ENABLE_CHAT_COMPRESSION", "True").lower() == "true"
+)
+
+CHAT_COMPRESSION_THRESHOLD = os.environ.get("CHAT_COMPRESSION_THRESHOLD", 65536)
+
+try:
+    CHAT_COMPRESSION_THRESHOLD = max(int(CHAT_COMPRESSION_THRESHOLD), 0)
+except ValueError:
+    CHAT_COMPRESSION_THRESHOLD = 65536
+
+# Number of compressed chats whose messages a single search decompresses, past
+# it compressed chats are only matched by their title
+CHAT_SEARCH_COMPRESSED_SCAN_LIMIT = os.environ.get(
+    "CHAT_SEARCH_COMPRESSED_SCAN_LIMIT", 200
+)
+
+try:
+    CHAT_SEARCH_COMPRESSED_SCAN_LIMIT = max(int(CHAT_SEARCH_COMPRESSED_SCAN_LIMIT), 0)
+except ValueError:
+    CHAT_SEARCH_COMPRESSED_SCAN_LIMIT = 200
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -326,6 +385,14 @@ REDIS_URL = os.environ.get("REDIS_URL", "")
 REDIS_SENTINEL_HOSTS = os.environ.get("REDIS_SENTINEL_HOSTS", "")
 REDIS_SENTINEL_PORT = os.environ.get("REDIS_SENTINEL_PORT", "26379")
 
+# Upper bound (seconds) for config changes to reach other nodes if a pub/sub
+# notification is missed
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "5")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(REDIS_CONFIG_SYNC_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 5.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -358,6 +425,12 @@ BYPASS_MODEL_ACCESS_CONTROL = (
     os.environ.get("BYPASS_MODEL_ACCESS_CONTROL", "False").lower() == "true"
 )
 
+MODELS_CACHE_TTL = os.environ.get("MODELS_CACHE_TTL", "30")
+try:
+    MODELS_CACHE_TTL = int(MODELS_CACHE_TTL)
+except ValueError:
+    MODELS_CACHE_TTL = 30
+
 WEBUI_AUTH_SIGNOUT_REDIRECT_URL = os.environ.get(
     "WEBUI_AUTH_SIGNOUT_REDIRECT_URL", None
 )
@@ -403,6 +476,20 @@ WEBSOCKET_MANAGER = os.environ.get("WEBSOCKET_MANAGER", "")
 WEBSOCKET_REDIS_URL = os.environ.get("WEBSOCKET_REDIS_URL", REDIS_URL)
 WEBSOCKET_REDIS_LOCK_TIMEOUT = os.environ.get("WEBSOCKET_REDIS_LOCK_TIMEOUT", 60)
 
+# Seconds a websocket session stays registered without being refreshed by its worker
+WEBSOCKET_SESSION_TTL = os.environ.get("WEBSOCKET_SESSION_TTL", "60")
+try:
+    WEBSOCKET_SESSION_TTL = max(int(WEBSOCKET_SESSION_TTL), 3)
+except ValueError:
+    WEBSOCKET_SESSION_TTL = 60
+
+# Seconds presence changes are coalesced before being broadcast
+WEBSOCKET_PRESENCE_INTERVAL = os.environ.get("WEBSOCKET_PRESENCE_INTERVAL", "1")
+try:
+    WEBSOCKET_PRESENCE_INTERVAL = float(WEBSOCKET_PRESENCE_INTERVAL)
+except ValueError:
+    WEBSOCKET_PRESENCE_INTERVAL = 1.0
+
 WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
@@ -435,6 +522,20 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = 10
 
+# Seconds a fetched model list is served before it is refreshed in the background
+MODELS_REGISTRY_TTL = os.environ.get("MODELS_REGISTRY_TTL", "60")
+try:
+    MODELS_REGISTRY_TTL = int(MODELS_REGISTRY_TTL)
+except ValueError:
+    MODELS_REGISTRY_TTL = 60
+
+# Upper bound in seconds for the retry backoff of an unreachable connection
+MODELS_REGISTRY_MAX_BACKOFF = os.environ.get("MODELS_REGISTRY_MAX_BACKOFF", "300")
+try:
+    MODELS_REGISTRY_MAX_BACKOFF = int(MODELS_REGISTRY_MAX_BACKOFF)
+except ValueError:
+    MODELS_REGISTRY_MAX_BACKOFF = 300
+
 
 AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA", "10"
@@ -451,10 +552,74 @@ else:
         AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = 10
 
 
+# Seconds a manifold's `pipes()` may take before its last known sub-pipes are used
+FUNCTION_PIPES_TIMEOUT = os.environ.get("FUNCTION_PIPES_TIMEOUT", "10")
+
+if FUNCTION_PIPES_TIMEOUT == "":
+    FUNCTION_PIPES_TIMEOUT = None
+else:
+    try:
+        FUNCTION_PIPES_TIMEOUT = float(FUNCTION_PIPES_TIMEOUT)
+    except Exception:
+        FUNCTION_PIPES_TIMEOUT = 10.0
+
+
+# Seconds a function version read from Redis is reused before asking Redis again
+FUNCTION_VERSION_CACHE_TTL = os.environ.get("FUNCTION_VERSION_CACHE_TTL", "1")
+try:
+    FUNCTION_VERSION_CACHE_TTL = float(FUNCTION_VERSION_CACHE_TTL)
+except ValueError:
+    FUNCTION_VERSION_CACHE_TTL = 1.0
+
+
+# Number of worker processes running functions that opt into `isolation: process`
+PLUGIN_WORKER_POOL_SIZE = os.environ.get("PLUGIN_WORKER_POOL_SIZE", "")
+
+if PLUGIN_WORKER_POOL_SIZE == "":
+    PLUGIN_WORKER_POOL_SIZE = None
+else:
+    try:
+        PLUGIN_WORKER_POOL_SIZE = max(int(PLUGIN_WORKER_POOL_SIZE), 1)
+    except ValueError:
+        PLUGIN_WORKER_POOL_SIZE = None
+
+
+# Seconds a compiled tool server spec is used before it is revalidated in the background
+TOOL_SERVER_SPEC_CACHE_TTL = os.environ.get("TOOL_SERVER_SPEC_CACHE_TTL", "300")
+try:
+    TOOL_SERVER_SPEC_CACHE_TTL = int(TOOL_SERVER_SPEC_CACHE_TTL)
+except ValueError:
+    TOOL_SERVER_SPEC_CACHE_TTL = 300
+
 AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Maximum number of tool calls from one assistant turn that are executed at once
+TOOL_CALLS_CONCURRENCY = os.environ.get("TOOL_CALLS_CONCURRENCY", "4")
+try:
+    TOOL_CALLS_CONCURRENCY = max(int(TOOL_CALLS_CONCURRENCY), 1)
+except ValueError:
+    TOOL_CALLS_CONCURRENCY = 4
+
+TOOL_CALL_TIMEOUT = os.environ.get("TOOL_CALL_TIMEOUT", "300")
+
+if TOOL_CALL_TIMEOUT == "":
+    TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        TOOL_CALL_TIMEOUT = float(TOOL_CALL_TIMEOUT)
+    except Exception:
+        TOOL_CALL_TIMEOUT = 300.0
+
+# Threads running synchronous tools, kept apart from the default executor so
+# tools stuck past their timeout can't starve everything else using it
+SYNC_TOOL_THREAD_POOL_SIZE = os.environ.get("SYNC_TOOL_THREAD_POOL_SIZE", "8")
+try:
+    SYNC_TOOL_THREAD_POOL_SIZE = max(int(SYNC_TOOL_THREAD_POOL_SIZE), 1)
+except ValueError:
+    SYNC_TOOL_THREAD_POOL_SIZE = 8
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -3,6 +3,7 @@ import sys
 import inspect
 import json
 import asyncio
+import time
 
 from pydantic import BaseModel
 from typing import AsyncGenerator, Generator, Iterator
@@ -31,11 +32,13 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    get_function_valves_from_cache,
 )
 from open_webui.utils.tools import get_tools
+from open_webui.utils.resolver import get_metadata_resolver
 from open_webui.utils.access_control import has_access
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL, FUNCTION_PIPES_TIMEOUT
 
 from open_webui.utils.misc import (
     add_or_update_system_message,
@@ -59,35 +62,79 @@ def get_function_module_by_id(request: Request, pipe_id: str):
     function_module, _, _ = get_function_module_from_cache(request, pipe_id)
 
     if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(pipe_id)
-        function_module.valves = function_module.Valves(**(valves if valves else {}))
+        valves = get_function_valves_from_cache(request, pipe_id)
+        function_module.valves = function_module.Valves(**valves)
     return function_module
 
 
+async def get_function_pipes(request, function_id: str, function_module) -> list:
+    """
+    Get the sub-pipes of a manifold function.
+
+    Results are cached for `pipes_ttl` seconds when the function declares it,
+    and until the function (or its valves) change. A `pipes()` call that fails
+    or exceeds FUNCTION_PIPES_TIMEOUT falls back to the last known sub-pipes.
+    """
+    if not hasattr(request.app.state, "FUNCTION_PIPES"):
+        request.app.state.FUNCTION_PIPES = {}
+
+    version = (
+        id(function_module),
+        getattr(request.app.state, "FUNCTION_VERSIONS", {}).get(function_id),
+    )
+    cached = request.app.state.FUNCTION_PIPES.get(function_id)
+    if cached and cached["version"] == version and cached["expires_at"] > time.time():
+        return cached["pipes"]
+
+    # Handle pipes being a list, sync function, or async function
+    try:
+        if callable(function_module.pipes):
+            if asyncio.iscoroutinefunction(function_module.pipes):
+                sub_pipes = function_module.pipes()
+            else:
+                sub_pipes = asyncio.to_thread(function_module.pipes)
+
+            sub_pipes = await asyncio.wait_for(sub_pipes, FUNCTION_PIPES_TIMEOUT)
+        else:
+            sub_pipes = function_module.pipes
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            log.warning(f"get_function_pipes: function '{function_id}' timed out")
+        else:
+            log.exception(e)
+        return cached["pipes"] if cached else []
+
+    request.app.state.FUNCTION_PIPES[function_id] = {
+        "version": version,
+        "expires_at": time.time() + getattr(function_module, "pipes_ttl", 0),
+        "pipes": sub_pipes,
+    }
+    return sub_pipes
+
+
 async def get_function_models(request):
     pipes = Functions.get_functions_by_type("pipe", active_only=True)
     pipe_models = []
 
-    for pipe in pipes:
-        function_module = get_function_module_by_id(request, pipe.id)
+    function_modules = [get_function_module_by_id(request, pipe.id) for pipe in pipes]
 
+    # Query all manifolds at once so one slow `pipes()` doesn't hold up the others
+    manifold_pipes = await asyncio.gather(
+        *[
+            (
+                get_function_pipes(request, pipe.id, function_module)
+                if hasattr(function_module, "pipes")
+                else asyncio.sleep(0, result=None)
+            )
+            for pipe, function_module in zip(pipes, function_modules)
+        ]
+    )
+
+    for pipe, function_module, sub_pipes in zip(
+        pipes, function_modules, manifold_pipes
+    ):
         # Check if function is a manifold
         if hasattr(function_module, "pipes"):
-            sub_pipes = []
-
-            # Handle pipes being a list, sync function, or async function
-            try:
-                if callable(function_module.pipes):
-                    if asyncio.iscoroutinefunction(function_module.pipes):
-                        sub_pipes = await function_module.pipes()
-                    else:
-                        sub_pipes = function_module.pipes()
-                else:
-                    sub_pipes = function_module.pipes
-            except Exception as e:
-                log.exception(e)
-                sub_pipes = []
-
             log.debug(
                 f"get_function_models: function '{pipe.id}' is a manifold of {sub_pipes}"
             )
@@ -196,7 +243,7 @@ async def generate_function_chat_completion(
         return params
 
     model_id = form_data.get("model")
-    model_info = Models.get_model_by_id(model_id)
+    model_info = get_metadata_resolver(request).get_model(model_id)
 
     metadata = form_data.pop("metadata", {})
 
@@ -1,9 +1,10 @@
-import json
+import base64
 import logging
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, Optional
 
 from open_webui.internal.wrappers import register_connection
+from open_webui.utils import json_codec
 from open_webui.env import (
     OPEN_WEBUI_DIR,
     DATABASE_URL,
@@ -13,39 +14,130 @@ from open_webui.env import (
     DATABASE_POOL_RECYCLE,
     DATABASE_POOL_SIZE,
     DATABASE_POOL_TIMEOUT,
+    DATABASE_ENABLE_ASYNC_DRIVER,
+    DATABASE_ENABLE_SQLITE_WAL,
+    DATABASE_SQLITE_MMAP_SIZE,
+    DATABASE_SQLITE_READ_POOL_SIZE,
+    ENABLE_CHAT_COMPRESSION,
+    CHAT_COMPRESSION_THRESHOLD,
 )
 from peewee_migrate import Router
-from sqlalchemy import Dialect, create_engine, MetaData, types
+from sqlalchemy import Dialect, create_engine, event, MetaData, types
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import Session as BaseSession, scoped_session, sessionmaker
+from sqlalchemy.sql.expression import SelectBase, TextClause
 from sqlalchemy.pool import QueuePool, NullPool
 from sqlalchemy.sql.type_api import _T
 from typing_extensions import Self
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["DB"])
 
+# Serialize the JSON columns of every engine with the fast codec
+JSON_ENGINE_OPTIONS = {
+    "json_serializer": json_codec.dumps,
+    "json_deserializer": json_codec.loads,
+}
+
 
 class JSONField(types.TypeDecorator):
     impl = types.Text
     cache_ok = True
 
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
-        return json.dumps(value)
+        return json_codec.dumps(value)
 
     def process_result_value(self, value: Optional[_T], dialect: Dialect) -> Any:
         if value is not None:
-            return json.loads(value)
+            return json_codec.loads(value)
 
     def copy(self, **kw: Any) -> Self:
         return JSONField(self.impl.length)
 
     def db_value(self, value):
-        return json.dumps(value)
+        return json_codec.dumps(value)
 
     def python_value(self, value):
         if value is not None:
-            return json.loads(value)
+            return json_codec.loads(value)
+
+
+# Key of the object standing in for a compressed document
+ZSTD_KEY = "__zstd__"
+ZSTD_LEVEL = 3
+
+
+def compress_json_text(text: str) -> str:
+    """
+    Compress a serialized JSON document into the JSON object standing in for
+    it, which keeps the column valid JSON on every database.
+    """
+    data = base64.b64encode(zstandard.compress(text.encode(), ZSTD_LEVEL))
+    return f'{{"{ZSTD_KEY}":"{data.decode()}"}}'
+
+
+def is_compressed_json(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and ZSTD_KEY in value
+
+
+def decompress_json(value: Any) -> Any:
+    if not is_compressed_json(value):
+        return value
+
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to read compressed documents")
+    return json_codec.loads(zstandard.decompress(base64.b64decode(value[ZSTD_KEY])))
+
+
+class CompressedJSON(types.TypeDecorator):
+    """
+    JSON column whose documents of at least `threshold` serialized bytes are
+    stored zstd compressed. Reads decompress them as the column is loaded, so
+    queries that don't select the column never pay for it. Compression is
+    skipped (and nothing changes for the rows already stored) when
+    `ENABLE_CHAT_COMPRESSION` is off or zstandard isn't installed.
+    """
+
+    impl = types.JSON
+    cache_ok = True
+
+    def __init__(self, threshold: int = CHAT_COMPRESSION_THRESHOLD, **kwargs):
+        super().__init__(**kwargs)
+        self.threshold = threshold
+
+    def bind_processor(self, dialect: Dialect):
+        # Compress the document the JSON type serialized, rather than paying
+        # for a second serialization to measure it
+        process = self.impl_instance.dialect_impl(dialect).bind_processor(dialect)
+
+        def process_value(value):
+            compress = (
+                ENABLE_CHAT_COMPRESSION
+                and zstandard is not None
+                and not is_compressed_json(value)
+            )
+
+            if process is not None:
+                value = process(value)
+
+            if compress and isinstance(value, str) and len(value) >= self.threshold:
+                return compress_json_text(value)
+            return value
+
+        return process_value
+
+    def process_result_value(self, value: Optional[_T], dialect: Dialect) -> Any:
+        return decompress_json(value)
+
+    def copy(self, **kw: Any) -> Self:
+        return CompressedJSON(self.threshold)
 
 
 # Workaround to handle the peewee migration
@@ -75,15 +167,106 @@ def handle_peewee_migration(DATABASE_URL):
 handle_peewee_migration(DATABASE_URL)
 
 
+def set_sqlite_pragmas(engine: Engine, read_only: bool = False):
+    """
+    Tune every connection of a SQLite engine for WAL mode. `synchronous=NORMAL`
+    is durable across application crashes in WAL mode, only a power loss can
+    roll back the last commits.
+    """
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        else:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={DATABASE_SQLITE_MMAP_SIZE}")
+        cursor.close()
+
+
+def is_read_statement(clause) -> bool:
+    if isinstance(clause, SelectBase):
+        return True
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith("SELECT")
+    return False
+
+
+class RoutingSession(BaseSession):
+    """
+    Session sending plain reads to the pool of read-only connections and
+    writes to the single writer connection. Once a transaction has written,
+    everything else it runs stays on the writer so it reads its own changes.
+    """
+
+    writer: Engine
+    reader: Engine
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("writing") or self._flushing or not is_read_statement(clause):
+            self.info["writing"] = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def reset_routing_session(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def get_routing_session_class(writer: Engine, reader: Engine):
+    return type(
+        "RoutingSession", (RoutingSession,), {"writer": writer, "reader": reader}
+    )
+
+
 SQLALCHEMY_DATABASE_URL = DATABASE_URL
-if "sqlite" in SQLALCHEMY_DATABASE_URL:
+
+# Pool of read-only connections, only used for SQLite in WAL mode
+reader_engine = None
+
+if "sqlite" in SQLALCHEMY_DATABASE_URL and DATABASE_ENABLE_SQLITE_WAL:
+    # A single writer connection: writers queue up on the pool in turn rather
+    # than racing for the database lock and failing with `database is locked`
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+        SQLALCHEMY_DATABASE_URL,
+        **JSON_ENGINE_OPTIONS,
+        connect_args={"check_same_thread": False, "timeout": DATABASE_POOL_TIMEOUT},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+        poolclass=QueuePool,
+    )
+    set_sqlite_pragmas(engine)
+
+    # Switch the database to WAL before any read-only connection opens it
+    with engine.connect():
+        pass
+
+    reader_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        **JSON_ENGINE_OPTIONS,
+        connect_args={"check_same_thread": False},
+        pool_size=DATABASE_SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+        poolclass=QueuePool,
+    )
+    set_sqlite_pragmas(reader_engine, read_only=True)
+elif "sqlite" in SQLALCHEMY_DATABASE_URL:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        **JSON_ENGINE_OPTIONS,
+        connect_args={"check_same_thread": False},
     )
 else:
     if DATABASE_POOL_SIZE > 0:
         engine = create_engine(
             SQLALCHEMY_DATABASE_URL,
+            **JSON_ENGINE_OPTIONS,
             pool_size=DATABASE_POOL_SIZE,
             max_overflow=DATABASE_POOL_MAX_OVERFLOW,
             pool_timeout=DATABASE_POOL_TIMEOUT,
@@ -93,12 +276,97 @@ else:
         )
     else:
         engine = create_engine(
-            SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, poolclass=NullPool
+            SQLALCHEMY_DATABASE_URL,
+            **JSON_ENGINE_OPTIONS,
+            pool_pre_ping=True,
+            poolclass=NullPool,
         )
 
 
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """
+    Get the URL of the database for its async driver (aiosqlite or asyncpg),
+    or None if the database has no supported async driver.
+    """
+    url = make_url(database_url)
+
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+        if "sslmode" in url.query:
+            # asyncpg takes the libpq sslmode values through `ssl`
+            url = url.update_query_dict(
+                {"ssl": url.query["sslmode"]}
+            ).difference_update_query(["sslmode"])
+    else:
+        return None
+
+    return url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Async engine used by the `a*` variants of the table methods, they fall back to
+# running the synchronous methods in a thread when it isn't enabled or available
+async_engine = None
+async_reader_engine = None
+if ASYNC_DATABASE_URL and DATABASE_ENABLE_ASYNC_DRIVER:
+    try:
+        if "sqlite" in ASYNC_DATABASE_URL and DATABASE_ENABLE_SQLITE_WAL:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                **JSON_ENGINE_OPTIONS,
+                connect_args={"timeout": DATABASE_POOL_TIMEOUT},
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=DATABASE_POOL_TIMEOUT,
+            )
+            set_sqlite_pragmas(async_engine.sync_engine)
+
+            async_reader_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                **JSON_ENGINE_OPTIONS,
+                pool_size=DATABASE_SQLITE_READ_POOL_SIZE,
+                max_overflow=0,
+                pool_timeout=DATABASE_POOL_TIMEOUT,
+            )
+            set_sqlite_pragmas(async_reader_engine.sync_engine, read_only=True)
+        elif "sqlite" in ASYNC_DATABASE_URL:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL, **JSON_ENGINE_OPTIONS
+            )
+        elif DATABASE_POOL_SIZE > 0:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                **JSON_ENGINE_OPTIONS,
+                pool_size=DATABASE_POOL_SIZE,
+                max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+                pool_timeout=DATABASE_POOL_TIMEOUT,
+                pool_recycle=DATABASE_POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+        else:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                **JSON_ENGINE_OPTIONS,
+                pool_pre_ping=True,
+                poolclass=NullPool,
+            )
+    except ImportError as e:
+        log.warning(f"Async database driver not available, using threads: {e}")
+
+
 SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    class_=(
+        get_routing_session_class(engine, reader_engine)
+        if reader_engine is not None
+        else BaseSession
+    ),
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
 )
 metadata_obj = MetaData(schema=DATABASE_SCHEMA)
 Base = declarative_base(metadata=metadata_obj)
@@ -114,3 +382,30 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=(
+        get_routing_session_class(
+            async_engine.sync_engine, async_reader_engine.sync_engine
+        )
+        if async_reader_engine is not None
+        else BaseSession
+    ),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+@asynccontextmanager
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engines():
+    # Pooled aiosqlite connections keep a thread each, which blocks the exit
+    for async_db_engine in (async_engine, async_reader_engine):
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
@@ -54,6 +54,7 @@ from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     app as socket_app,
     periodic_usage_pool_cleanup,
+    periodic_session_pool_refresh,
 )
 from open_webui.routers import (
     audio,
@@ -88,7 +89,7 @@ from open_webui.routers.retrieval import (
     get_rf,
 )
 
-from open_webui.internal.db import Session, engine
+from open_webui.internal.db import Session, dispose_async_engines, engine
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
@@ -404,6 +405,8 @@ from open_webui.env import (
 from open_webui.utils.models import (
     get_all_models,
     get_all_base_models,
+    get_model_catalog,
+    get_filtered_models,
     check_model_access,
 )
 from open_webui.utils.chat import (
@@ -413,6 +416,7 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
+from open_webui.utils.resolver import get_metadata_resolver
 
 from open_webui.utils.auth import (
     get_license_data,
@@ -422,6 +426,8 @@ from open_webui.utils.auth import (
     get_verified_user,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin_worker import PLUGIN_WORKER_POOL
+from open_webui.utils.tools import SYNC_TOOL_EXECUTOR
 from open_webui.utils.oauth import OAuthManager
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 
@@ -494,9 +500,14 @@ async def lifespan(app: FastAPI):
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_session_pool_refresh())
 
     yield
 
+    PLUGIN_WORKER_POOL.shutdown()
+    SYNC_TOOL_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    await dispose_async_engines()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -652,9 +663,13 @@ app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
 app.state.TOOL_CONTENTS = {}
+app.state.TOOL_SPECS = {}
 
 app.state.FUNCTIONS = {}
 app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
+app.state.FUNCTION_VALVES = {}
+app.state.FUNCTION_PIPES = {}
 
 ########################################
 #
@@ -1143,64 +1158,12 @@ if audit_level != AuditLevel.NONE:
 
 @app.get("/api/models")
 async def get_models(request: Request, user=Depends(get_verified_user)):
-    def get_filtered_models(models, user):
-        filtered_models = []
-        for model in models:
-            if model.get("arena"):
-                if has_access(
-                    user.id,
-                    type="read",
-                    access_control=model.get("info", {})
-                    .get("meta", {})
-                    .get("access_control", {}),
-                ):
-                    filtered_models.append(model)
-                continue
-
-            model_info = Models.get_model_by_id(model["id"])
-            if model_info:
-                if user.id == model_info.user_id or has_access(
-                    user.id, type="read", access_control=model_info.access_control
-                ):
-                    filtered_models.append(model)
-
-        return filtered_models
-
-    all_models = await get_all_models(request, user=user)
-
-    models = []
-    for model in all_models:
-        # Filter out filter pipelines
-        if "pipeline" in model and model["pipeline"].get("type", None) == "filter":
-            continue
-
-        try:
-            model_tags = [
-                tag.get("name")
-                for tag in model.get("info", {}).get("meta", {}).get("tags", [])
-            ]
-            tags = [tag.get("name") for tag in model.get("tags", [])]
-
-            tags = list(set(model_tags + tags))
-            model["tags"] = [{"name": tag} for tag in tags]
-        except Exception as e:
-            log.debug(f"Error processing model tags: {e}")
-            model["tags"] = []
-            pass
-
-        models.append(model)
-
-    model_order_list = request.app.state.config.MODEL_ORDER_LIST
-    if model_order_list:
-        model_order_dict = {model_id: i for i, model_id in enumerate(model_order_list)}
-        # Sort models by order list priority, with fallback for those not in the list
-        models.sort(
-            key=lambda x: (model_order_dict.get(x["id"], float("inf")), x["name"])
-        )
+    catalog = await get_model_catalog(request, user=user)
+    models = catalog["models"]
 
     # Filter out models that the user does not have access to
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
-        models = get_filtered_models(models, user)
+        models = get_filtered_models(catalog, user)
 
     log.debug(
         f"/api/models returned filtered models accessible to the user: {json.dumps([model['id'] for model in models])}"
@@ -1234,12 +1197,16 @@ async def chat_completion(
                 raise Exception("Model not found")
 
             model = request.app.state.MODELS[model_id]
-            model_info = Models.get_model_by_id(model_id)
+
+            # Load the model, its base model, tools and functions in one batch
+            resolver = get_metadata_resolver(request)
+            resolver.resolve(model_id, form_data.get("tool_ids"))
+            model_info = resolver.get_model(model_id)
 
             # Check if user has access to the model
             if not BYPASS_MODEL_ACCESS_CONTROL and user.role == "user":
                 try:
-                    check_model_access(user, model)
+                    check_model_access(user, model, resolver)
                 except Exception as e:
                     raise e
         else:
@@ -1370,7 +1337,7 @@ async def list_tasks_endpoint(user=Depends(get_verified_user)):
 
 @app.get("/api/tasks/chat/{chat_id}")
 async def list_tasks_by_chat_id_endpoint(chat_id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id(chat_id)
+    chat = Chats.get_chat_meta_by_id(chat_id)
     if chat is None or chat.user_id != user.id:
         return {"task_ids": []}
 
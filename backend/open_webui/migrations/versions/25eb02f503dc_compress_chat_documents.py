@@ -0,0 +1,109 @@
+"""Compress chat documents
+
+Revision ID: 25eb02f503dc
+Revises: 9f0c9cd09105
+Create Date: 2026-10-19 09:00:00.000000
+
+Compresses the existing chat documents over CHAT_COMPRESSION_THRESHOLD. This
+only happens when ENABLE_CHAT_COMPRESSION is on while upgrading, otherwise the
+rows are left as they are; they're still compressed the next time each chat is
+saved. To compress them all after turning it on later, downgrade to
+9f0c9cd09105 and upgrade again (`alembic downgrade 9f0c9cd09105` then
+`alembic upgrade head`), both directions only rewrite the rows that need it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+from sqlalchemy import String, Text
+
+from open_webui.env import CHAT_COMPRESSION_THRESHOLD, ENABLE_CHAT_COMPRESSION
+from open_webui.internal.db import (
+    ZSTD_KEY,
+    compress_json_text,
+    decompress_json,
+    zstandard,
+)
+from open_webui.utils import json_codec
+
+revision = "25eb02f503dc"
+down_revision = "9f0c9cd09105"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# Compressed documents are written by `compress_json_text`, without spaces
+COMPRESSED_PREFIX = f'{{"{ZSTD_KEY}":'
+
+# Documents are read and written as text, so they're never parsed here
+chat_table = table("chat", column("id", String), column("chat", Text))
+chat_text = sa.cast(chat_table.c.chat, Text)
+
+
+def update_chats(connection, values: list[dict]):
+    if values:
+        connection.execute(
+            chat_table.update()
+            .where(chat_table.c.id == sa.bindparam("_id"))
+            .values(chat=sa.bindparam("_chat")),
+            values,
+        )
+
+
+def iterate_chats(connection, condition):
+    # Walk the table by id in batches so large histories never all sit in memory
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(chat_table.c.id, chat_text.label("chat"))
+            .where(chat_table.c.id > last_id, condition)
+            .order_by(chat_table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        yield rows
+        last_id = rows[-1].id
+
+
+def upgrade():
+    if not ENABLE_CHAT_COMPRESSION or zstandard is None:
+        print(
+            "Chat compression is disabled, leaving chat documents as they are "
+            "(they're compressed as they're saved once it's enabled)"
+        )
+        return
+
+    connection = op.get_bind()
+    condition = sa.func.length(chat_text) >= CHAT_COMPRESSION_THRESHOLD
+
+    for rows in iterate_chats(connection, condition):
+        update_chats(
+            connection,
+            [
+                {"_id": row.id, "_chat": compress_json_text(row.chat)}
+                for row in rows
+                if not row.chat.startswith(COMPRESSED_PREFIX)
+            ],
+        )
+
+
+def downgrade():
+    connection = op.get_bind()
+    condition = chat_text.like(f"{COMPRESSED_PREFIX}%")
+
+    for rows in iterate_chats(connection, condition):
+        update_chats(
+            connection,
+            [
+                {
+                    "_id": row.id,
+                    "_chat": json_codec.dumps(
+                        decompress_json(json_codec.loads(row.chat))
+                    ),
+                }
+                for row in rows
+            ],
+        )
@@ -0,0 +1,44 @@
+"""Add chat list index
+
+Revision ID: 9e0f3961e9a0
+Revises: 25eb02f503dc
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+
+revision = "9e0f3961e9a0"
+down_revision = "25eb02f503dc"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "chat_user_id_updated_at_id_idx"
+
+# Columns the chat lists filter on, so they're checked from the index without
+# loading the rows and their chat documents. Titles are left out, a long one
+# would exceed the size limit of an index entry and fail the write.
+COVERED_COLUMNS = ["archived", "pinned", "folder_id", "created_at"]
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        op.create_index(
+            INDEX_NAME,
+            "chat",
+            ["user_id", "updated_at", "id"],
+            postgresql_include=COVERED_COLUMNS,
+        )
+    elif dialect_name == "sqlite":
+        # SQLite has no INCLUDE clause, the covered columns go last in the key
+        op.create_index(
+            INDEX_NAME, "chat", ["user_id", "updated_at", "id", *COVERED_COLUMNS]
+        )
+    else:
+        op.create_index(INDEX_NAME, "chat", ["user_id", "updated_at", "id"])
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name="chat")
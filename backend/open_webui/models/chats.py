@@ -1,16 +1,26 @@
+import asyncio
+import itertools
 import logging
 import json
 import time
 import uuid
 from typing import Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import (
+    Base,
+    CompressedJSON,
+    ZSTD_KEY,
+    async_engine,
+    get_async_db,
+    get_db,
+)
 from open_webui.models.tags import TagModel, Tag, Tags
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import CHAT_SEARCH_COMPRESSED_SCAN_LIMIT, SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, tuple_
+from sqlalchemy.orm import defer
 from sqlalchemy.sql import exists
 
 ####################
@@ -27,7 +37,7 @@ class Chat(Base):
     id = Column(String, primary_key=True)
     user_id = Column(String)
     title = Column(Text)
-    chat = Column(JSON)
+    chat = Column(CompressedJSON)
 
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
@@ -59,6 +69,31 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatMetaModel(BaseModel):
+    """A chat without its `chat` document, for the metadata-only operations."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    title: str
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    share_id: Optional[str] = None
+    archived: bool = False
+    pinned: Optional[bool] = False
+
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
+# Leaves the chat document out of a query, raising if it's accessed anyway. The
+# documents reach megabytes, so loading one should never be an accident.
+DEFER_CHAT = defer(Chat.chat, raiseload=True)
+
+
 ####################
 # Forms
 ####################
@@ -104,7 +139,85 @@ class ChatTitleIdResponse(BaseModel):
     created_at: int
 
 
+# Columns of the chat lists, all in the `chat_user_id_updated_at_id_idx` index
+CHAT_TITLE_ID_COLUMNS = (Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
+
+
+def parse_chat_cursor(cursor: str) -> tuple[int, str]:
+    """
+    Split a chat list cursor, `<updated_at>:<id>` of the last chat of the
+    previous page, raising `ValueError` if it's malformed.
+    """
+    updated_at, _, id = cursor.partition(":")
+    if not id:
+        raise ValueError(f"Invalid chat cursor: {cursor}")
+    return int(updated_at), id
+
+
 class ChatTable:
+    @staticmethod
+    def _paginate(
+        query,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ):
+        """
+        Order a chat list by most recently updated and select a page of it.
+        A cursor continues right after the chat it points to with a range
+        scan of the `(user_id, updated_at, id)` index, while `skip` has the
+        database walk over every chat of the previous pages.
+        """
+        query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+
+        if cursor:
+            query = query.filter(
+                tuple_(Chat.updated_at, Chat.id) < tuple_(*parse_chat_cursor(cursor))
+            )
+        elif skip:
+            query = query.offset(skip)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def _filter_and_paginate(
+        self,
+        query,
+        filter: Optional[dict],
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+    ):
+        query_key = (filter or {}).get("query")
+        if query_key:
+            query = query.filter(Chat.title.ilike(f"%{query_key}%"))
+
+        order_by = (filter or {}).get("order_by")
+        direction = (filter or {}).get("direction")
+
+        if order_by and direction and getattr(Chat, order_by):
+            if cursor:
+                raise ValueError("Cursors can only page chats by most recent update")
+
+            if direction.lower() == "asc":
+                query = query.order_by(getattr(Chat, order_by).asc())
+            elif direction.lower() == "desc":
+                query = query.order_by(getattr(Chat, order_by).desc())
+            else:
+                raise ValueError("Invalid direction for ordering")
+
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+            return query
+
+        return self._paginate(query, cursor, skip, limit)
+
+    @staticmethod
+    def _to_title_id_list(rows) -> list[ChatTitleIdResponse]:
+        return [ChatTitleIdResponse.model_validate(row._asdict()) for row in rows]
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -172,6 +285,23 @@ class ChatTable:
         except Exception:
             return None
 
+    async def aupdate_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.update_chat_by_id, id, chat)
+
+        try:
+            async with get_async_db() as db:
+                chat_item = await db.get(Chat, id)
+                chat_item.chat = chat
+                chat_item.title = chat["title"] if "title" in chat else "New Chat"
+                chat_item.updated_at = int(time.time())
+                await db.commit()
+                await db.refresh(chat_item)
+
+                return ChatModel.model_validate(chat_item)
+        except Exception:
+            return None
+
     def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
         chat = self.get_chat_by_id(id)
         if chat is None:
@@ -184,8 +314,8 @@ class ChatTable:
 
     def update_chat_tags_by_id(
         self, id: str, tags: list[str], user
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
+    ) -> Optional[ChatMetaModel]:
+        chat = self.get_chat_meta_by_id(id)
         if chat is None:
             return None
 
@@ -200,14 +330,12 @@ class ChatTable:
                 continue
 
             self.add_chat_tag_by_id_and_user_id_and_tag_name(id, user.id, tag_name)
-        return self.get_chat_by_id(id)
+        return self.get_chat_meta_by_id(id)
 
     def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        return chat.chat.get("title", "New Chat")
+        # The title column mirrors the title of the document, see `update_chat_by_id`
+        with get_db() as db:
+            return db.query(Chat.title).filter_by(id=id).scalar()
 
     def get_messages_by_chat_id(self, id: str) -> Optional[dict]:
         chat = self.get_chat_by_id(id)
@@ -225,14 +353,16 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
-    def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
+    async def aget_message_by_id_and_message_id(
+        self, id: str, message_id: str
+    ) -> Optional[dict]:
+        chat = await self.aget_chat_by_id(id)
         if chat is None:
             return None
 
-        chat = chat.chat
+        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+
+    def _upsert_message(self, chat: dict, message_id: str, message: dict) -> dict:
         history = chat.get("history", {})
 
         if message_id in history.get("messages", {}):
@@ -246,8 +376,39 @@ class ChatTable:
         history["currentId"] = message_id
 
         chat["history"] = history
+        return chat
+
+    def _add_message_status(self, chat: dict, message_id: str, status: dict) -> dict:
+        history = chat.get("history", {})
+
+        if message_id in history.get("messages", {}):
+            status_history = history["messages"][message_id].get("statusHistory", [])
+            status_history.append(status)
+            history["messages"][message_id]["statusHistory"] = status_history
+
+        chat["history"] = history
+        return chat
+
+    def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatModel]:
+        chat = self.get_chat_by_id(id)
+        if chat is None:
+            return None
+
+        chat = self._upsert_message(chat.chat, message_id, message)
         return self.update_chat_by_id(id, chat)
 
+    async def aupsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatModel]:
+        chat = await self.aget_chat_by_id(id)
+        if chat is None:
+            return None
+
+        chat = self._upsert_message(chat.chat, message_id, message)
+        return await self.aupdate_chat_by_id(id, chat)
+
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
@@ -255,18 +416,26 @@ class ChatTable:
         if chat is None:
             return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        chat = self._add_message_status(chat.chat, message_id, status)
+        return self.update_chat_by_id(id, chat)
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+    async def aadd_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[ChatModel]:
+        chat = await self.aget_chat_by_id(id)
+        if chat is None:
+            return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        chat = self._add_message_status(chat.chat, message_id, status)
+        return await self.aupdate_chat_by_id(id, chat)
 
-    def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
+    def insert_shared_chat_by_chat_id(
+        self, chat_id: str, chat_document: Optional[dict] = None
+    ) -> Optional[ChatModel]:
+        """
+        Share a chat as a copy of it, with `chat_document` in place of its own
+        document if given (e.g. with its images inlined).
+        """
         with get_db() as db:
             # Get the existing chat to share
             chat = db.get(Chat, chat_id)
@@ -279,7 +448,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": chat_document if chat_document is not None else chat.chat,
                     "created_at": chat.created_at,
                     "updated_at": int(time.time()),
                 }
@@ -298,7 +467,9 @@ class ChatTable:
             db.commit()
             return shared_chat if (shared_result and result) else None
 
-    def update_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
+    def update_shared_chat_by_chat_id(
+        self, chat_id: str, chat_document: Optional[dict] = None
+    ) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat = db.get(Chat, chat_id)
@@ -307,10 +478,12 @@ class ChatTable:
                 )
 
                 if shared_chat is None:
-                    return self.insert_shared_chat_by_chat_id(chat_id)
+                    return self.insert_shared_chat_by_chat_id(chat_id, chat_document)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = (
+                    chat_document if chat_document is not None else chat.chat
+                )
 
                 shared_chat.updated_at = int(time.time())
                 db.commit()
@@ -332,21 +505,21 @@ class ChatTable:
 
     def update_chat_share_id_by_id(
         self, id: str, share_id: Optional[str]
-    ) -> Optional[ChatModel]:
+    ) -> Optional[ChatMetaModel]:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[DEFER_CHAT])
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return ChatMetaModel.model_validate(chat)
         except Exception:
             return None
 
     def toggle_chat_pinned_by_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[defer(Chat.chat)])
                 chat.pinned = not chat.pinned
                 chat.updated_at = int(time.time())
                 db.commit()
@@ -358,7 +531,7 @@ class ChatTable:
     def toggle_chat_archive_by_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[defer(Chat.chat)])
                 chat.archived = not chat.archived
                 chat.updated_at = int(time.time())
                 db.commit()
@@ -382,36 +555,17 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> list[ChatTitleIdResponse]:
 
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
-
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(Chat.title.ilike(f"%{query_key}%"))
-
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = (
+                db.query(Chat)
+                .filter_by(user_id=user_id, archived=True)
+                .with_entities(*CHAT_TITLE_ID_COLUMNS)
+            )
+            query = self._filter_and_paginate(query, filter, skip, limit, cursor)
+            return self._to_title_id_list(query.all())
 
     def get_chat_list_by_user_id(
         self,
@@ -420,37 +574,19 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = (
+                db.query(Chat)
+                .filter_by(user_id=user_id)
+                .with_entities(*CHAT_TITLE_ID_COLUMNS)
+            )
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(Chat.title.ilike(f"%{query_key}%"))
-
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = self._filter_and_paginate(query, filter, skip, limit, cursor)
+            return self._to_title_id_list(query.all())
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -458,6 +594,7 @@ class ChatTable:
         include_archived: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
@@ -466,29 +603,9 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
-            )
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
+            query = query.with_entities(*CHAT_TITLE_ID_COLUMNS)
+            query = self._paginate(query, cursor, skip, limit)
+            return self._to_title_id_list(query.all())
 
     def get_chat_list_by_chat_ids(
         self, chat_ids: list[str], skip: int = 0, limit: int = 50
@@ -511,12 +628,23 @@ class ChatTable:
         except Exception:
             return None
 
+    async def aget_chat_by_id(self, id: str) -> Optional[ChatModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_chat_by_id, id)
+
+        try:
+            async with get_async_db() as db:
+                chat = await db.get(Chat, id)
+                return ChatModel.model_validate(chat)
+        except Exception:
+            return None
+
     def get_chat_by_share_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 # it is possible that the shared link was deleted. hence,
                 # we check if the chat is still shared by checking if a chat with the share_id exists
-                chat = db.query(Chat).filter_by(share_id=id).first()
+                chat = db.query(Chat.id).filter_by(share_id=id).first()
 
                 if chat:
                     return self.get_chat_by_id(id)
@@ -525,6 +653,29 @@ class ChatTable:
         except Exception:
             return None
 
+    def get_chat_meta_by_id(self, id: str) -> Optional[ChatMetaModel]:
+        try:
+            with get_db() as db:
+                chat = db.get(Chat, id, options=[DEFER_CHAT])
+                return ChatMetaModel.model_validate(chat)
+        except Exception:
+            return None
+
+    def get_chat_meta_by_id_and_user_id(
+        self, id: str, user_id: str
+    ) -> Optional[ChatMetaModel]:
+        try:
+            with get_db() as db:
+                chat = (
+                    db.query(Chat)
+                    .options(DEFER_CHAT)
+                    .filter_by(id=id, user_id=user_id)
+                    .first()
+                )
+                return ChatMetaModel.model_validate(chat)
+        except Exception:
+            return None
+
     def get_chat_by_id_and_user_id(self, id: str, user_id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -533,6 +684,21 @@ class ChatTable:
         except Exception:
             return None
 
+    async def aget_chat_by_id_and_user_id(
+        self, id: str, user_id: str
+    ) -> Optional[ChatModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_chat_by_id_and_user_id, id, user_id)
+
+        try:
+            async with get_async_db() as db:
+                result = await db.execute(
+                    select(Chat).filter_by(id=id, user_id=user_id).limit(1)
+                )
+                return ChatModel.model_validate(result.scalars().first())
+        except Exception:
+            return None
+
     def get_chats(self, skip: int = 0, limit: int = 50) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -551,14 +717,17 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
+    def get_pinned_chats_by_user_id(
+        self, user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            all_chats = (
+            query = (
                 db.query(Chat)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
-                .order_by(Chat.updated_at.desc())
+                .with_entities(*CHAT_TITLE_ID_COLUMNS)
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = self._paginate(query, cursor, limit=limit)
+            return self._to_title_id_list(query.all())
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -569,6 +738,14 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    @staticmethod
+    def _match_messages(chat: Optional[dict], search_text: str) -> bool:
+        return any(
+            search_text in str(message.get("content", "")).lower()
+            for message in (chat or {}).get("messages", [])
+            if isinstance(message, dict)
+        )
+
     def get_chats_by_user_id_and_search_text(
         self,
         user_id: str,
@@ -576,7 +753,7 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         """
         Filters chats based on a search query using Python, allowing pagination using skip and limit.
         """
@@ -603,7 +780,11 @@ class ChatTable:
         search_text = " ".join(search_text_words)
 
         with get_db() as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            # The database can't look into compressed chats, so they always pass
+            # the filter below and their messages are searched afterwards
+            compressed = Chat.chat[ZSTD_KEY].as_string().is_not(None)
+
+            query = db.query(Chat, compressed).filter(Chat.user_id == user_id)
 
             if not include_archived:
                 query = query.filter(Chat.archived == False)
@@ -628,6 +809,7 @@ class ChatTable:
                             )
                             """
                         )
+                        | compressed
                     ).params(search_text=search_text)
                 )
 
@@ -677,6 +859,7 @@ class ChatTable:
                             )
                             """
                         )
+                        | compressed
                     ).params(search_text=search_text)
                 )
 
@@ -714,26 +897,44 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            # Perform pagination at the SQL level
-            all_chats = query.offset(skip).limit(limit).all()
+            # Only load the documents of the compressed chats whose title
+            # doesn't match, and at most CHAT_SEARCH_COMPRESSED_SCAN_LIMIT of them
+            query = query.with_entities(Chat.id, Chat.title, compressed)
+
+            def match_ids():
+                scanned = 0
+                for id, title, is_compressed in query.yield_per(100):
+                    if not is_compressed or search_text in (title or "").lower():
+                        yield id
+                    elif scanned < CHAT_SEARCH_COMPRESSED_SCAN_LIMIT:
+                        scanned += 1
+                        chat = db.query(Chat.chat).filter_by(id=id).scalar()
+                        if self._match_messages(chat, search_text):
+                            yield id
+
+            # Paginate after matching the messages of the compressed chats
+            ids = list(itertools.islice(match_ids(), skip, skip + limit))
+            rows = {
+                row.id: row
+                for row in db.query(*CHAT_TITLE_ID_COLUMNS).filter(Chat.id.in_(ids))
+            }
+            all_chats = [rows[id] for id in ids if id in rows]
 
             log.info(f"The number of chats: {len(all_chats)}")
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_list(all_chats)
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc())
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = query.with_entities(*CHAT_TITLE_ID_COLUMNS)
+            query = self._paginate(query)
+            return self._to_title_id_list(query.all())
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -755,7 +956,7 @@ class ChatTable:
     ) -> Optional[ChatModel]:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[defer(Chat.chat)])
                 chat.folder_id = folder_id
                 chat.updated_at = int(time.time())
                 chat.pinned = False
@@ -767,15 +968,19 @@ class ChatTable:
 
     def get_chat_tags_by_id_and_user_id(self, id: str, user_id: str) -> list[TagModel]:
         with get_db() as db:
-            chat = db.get(Chat, id)
+            chat = db.get(Chat, id, options=[DEFER_CHAT])
             tags = chat.meta.get("tags", [])
             return [Tags.get_tag_by_name_and_user_id(tag, user_id) for tag in tags]
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = (
+                db.query(Chat)
+                .filter_by(user_id=user_id)
+                .with_entities(*CHAT_TITLE_ID_COLUMNS)
+            )
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -800,17 +1005,17 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_list(all_chats)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
-    ) -> Optional[ChatModel]:
+    ) -> Optional[ChatMetaModel]:
         tag = Tags.get_tag_by_name_and_user_id(tag_name, user_id)
         if tag is None:
             tag = Tags.insert_new_tag(tag_name, user_id)
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[DEFER_CHAT])
 
                 tag_id = tag.id
                 if tag_id not in chat.meta.get("tags", []):
@@ -821,13 +1026,13 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return ChatMetaModel.model_validate(chat)
         except Exception:
             return None
 
     def count_chats_by_tag_name_and_user_id(self, tag_name: str, user_id: str) -> int:
         with get_db() as db:  # Assuming `get_db()` returns a session object
-            query = db.query(Chat).filter_by(user_id=user_id, archived=False)
+            query = db.query(Chat.id).filter_by(user_id=user_id, archived=False)
 
             # Normalize the tag_name for consistency
             tag_id = tag_name.replace(" ", "_").lower()
@@ -866,7 +1071,7 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[DEFER_CHAT])
                 tags = chat.meta.get("tags", [])
                 tag_id = tag_name.replace(" ", "_").lower()
 
@@ -883,7 +1088,7 @@ class ChatTable:
     def delete_all_tags_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
+                chat = db.get(Chat, id, options=[DEFER_CHAT])
                 chat.meta = {
                     **chat.meta,
                     "tags": [],
@@ -941,7 +1146,7 @@ class ChatTable:
     def delete_shared_chats_by_user_id(self, user_id: str) -> bool:
         try:
             with get_db() as db:
-                chats_by_user = db.query(Chat).filter_by(user_id=user_id).all()
+                chats_by_user = db.query(Chat.id).filter_by(user_id=user_id).all()
                 shared_chat_ids = [f"shared-{chat.id}" for chat in chats_by_user]
 
                 db.query(Chat).filter(Chat.user_id.in_(shared_chat_ids)).delete()
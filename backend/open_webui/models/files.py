@@ -1,11 +1,12 @@
+import asyncio
 import logging
 import time
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import Base, JSONField, async_engine, get_async_db, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, String, Text, JSON, select
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -130,6 +131,17 @@ class FilesTable:
             except Exception:
                 return None
 
+    async def aget_file_by_id(self, id: str) -> Optional[FileModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_file_by_id, id)
+
+        async with get_async_db() as db:
+            try:
+                file = await db.get(File, id)
+                return FileModel.model_validate(file)
+            except Exception:
+                return None
+
     def get_file_metadata_by_id(self, id: str) -> Optional[FileMetadataResponse]:
         with get_db() as db:
             try:
@@ -157,6 +169,16 @@ class FilesTable:
                 .all()
             ]
 
+    async def aget_files_by_ids(self, ids: list[str]) -> list[FileModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_files_by_ids, ids)
+
+        async with get_async_db() as db:
+            result = await db.execute(
+                select(File).filter(File.id.in_(ids)).order_by(File.updated_at.desc())
+            )
+            return [FileModel.model_validate(file) for file in result.scalars().all()]
+
     def get_file_metadatas_by_ids(self, ids: list[str]) -> list[FileMetadataResponse]:
         with get_db() as db:
             return [
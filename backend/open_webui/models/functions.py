@@ -1,12 +1,13 @@
+import asyncio
 import logging
 import time
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import Base, JSONField, async_engine, get_async_db, get_db
 from open_webui.models.users import Users
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, select
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -164,6 +165,17 @@ class FunctionsTable:
         except Exception:
             return None
 
+    async def aget_function_by_id(self, id: str) -> Optional[FunctionModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_function_by_id, id)
+
+        try:
+            async with get_async_db() as db:
+                function = await db.get(Function, id)
+                return FunctionModel.model_validate(function)
+        except Exception:
+            return None
+
     def get_functions(self, active_only=False) -> list[FunctionModel]:
         with get_db() as db:
             if active_only:
@@ -177,6 +189,21 @@ class FunctionsTable:
                     for function in db.query(Function).all()
                 ]
 
+    async def aget_functions(self, active_only=False) -> list[FunctionModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_functions, active_only)
+
+        async with get_async_db() as db:
+            query = select(Function)
+            if active_only:
+                query = query.filter_by(is_active=True)
+
+            result = await db.execute(query)
+            return [
+                FunctionModel.model_validate(function)
+                for function in result.scalars().all()
+            ]
+
     def get_functions_by_type(
         self, type: str, active_only=False
     ) -> list[FunctionModel]:
@@ -1,8 +1,9 @@
+import asyncio
 import logging
 import time
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import Base, JSONField, async_engine, get_async_db, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.models.users import Users, UserResponse
@@ -10,7 +11,7 @@ from open_webui.models.users import Users, UserResponse
 
 from pydantic import BaseModel, ConfigDict
 
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_, func, select
 from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
@@ -214,6 +215,34 @@ class ModelsTable:
         except Exception:
             return None
 
+    async def aget_model_by_id(self, id: str) -> Optional[ModelModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_model_by_id, id)
+
+        try:
+            async with get_async_db() as db:
+                model = await db.get(Model, id)
+                return ModelModel.model_validate(model)
+        except Exception:
+            return None
+
+    def get_models_by_ids(self, ids: list[str]) -> list[ModelModel]:
+        with get_db() as db:
+            return [
+                ModelModel.model_validate(model)
+                for model in db.query(Model).filter(Model.id.in_(ids)).all()
+            ]
+
+    async def aget_models_by_ids(self, ids: list[str]) -> list[ModelModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_models_by_ids, ids)
+
+        async with get_async_db() as db:
+            result = await db.execute(select(Model).filter(Model.id.in_(ids)))
+            return [
+                ModelModel.model_validate(model) for model in result.scalars().all()
+            ]
+
     def toggle_model_by_id(self, id: str) -> Optional[ModelModel]:
         with get_db() as db:
             try:
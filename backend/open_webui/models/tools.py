@@ -5,7 +5,7 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserResponse
 from open_webui.env import SRC_LOG_LEVELS
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
 from open_webui.utils.access_control import has_access
@@ -65,6 +65,9 @@ class ToolModel(BaseModel):
     meta: ToolMeta
     access_control: Optional[dict] = None
 
+    # Loaded along with the row for the tool spec cache, never serialized
+    valves: Optional[dict] = Field(default=None, exclude=True)
+
     updated_at: int  # timestamp in epoch
     created_at: int  # timestamp in epoch
 
@@ -142,6 +145,13 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tools_by_ids(self, ids: list[str]) -> list[ToolModel]:
+        with get_db() as db:
+            return [
+                ToolModel.model_validate(tool)
+                for tool in db.query(Tool).filter(Tool.id.in_(ids)).all()
+            ]
+
     def get_tools(self) -> list[ToolUserModel]:
         with get_db() as db:
             tools = []
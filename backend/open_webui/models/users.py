@@ -1,7 +1,8 @@
+import asyncio
 import time
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import Base, JSONField, async_engine, get_async_db, get_db
 
 
 from open_webui.models.chats import Chats
@@ -10,7 +11,7 @@ from open_webui.models.groups import Groups
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text
-from sqlalchemy import or_
+from sqlalchemy import or_, select, update
 
 
 ####################
@@ -142,6 +143,17 @@ class UsersTable:
         except Exception:
             return None
 
+    async def aget_user_by_id(self, id: str) -> Optional[UserModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_user_by_id, id)
+
+        try:
+            async with get_async_db() as db:
+                user = await db.get(User, id)
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
     def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -150,6 +162,19 @@ class UsersTable:
         except Exception:
             return None
 
+    async def aget_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.get_user_by_api_key, api_key)
+
+        try:
+            async with get_async_db() as db:
+                result = await db.execute(
+                    select(User).filter_by(api_key=api_key).limit(1)
+                )
+                return UserModel.model_validate(result.scalars().first())
+        except Exception:
+            return None
+
     def get_user_by_email(self, email: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -307,6 +332,24 @@ class UsersTable:
         except Exception:
             return None
 
+    async def aupdate_user_last_active_by_id(self, id: str) -> Optional[UserModel]:
+        if async_engine is None:
+            return await asyncio.to_thread(self.update_user_last_active_by_id, id)
+
+        try:
+            async with get_async_db() as db:
+                await db.execute(
+                    update(User)
+                    .filter_by(id=id)
+                    .values(last_active_at=int(time.time()))
+                )
+                await db.commit()
+
+                user = await db.get(User, id, populate_existing=True)
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
     ) -> Optional[UserModel]:
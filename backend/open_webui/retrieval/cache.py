@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from open_webui.config import (
+    RAG_RETRIEVAL_CACHE_MAX_BYTES,
+    RAG_RETRIEVAL_CACHE_SIZE,
+    RAG_RETRIEVAL_CACHE_TTL,
+)
+from open_webui.env import (
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    UVICORN_WORKERS,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils import json_codec
+from open_webui.utils.redis import (
+    get_async_redis_connection,
+    get_redis_connection,
+    get_sentinels_from_env,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Version bumped by `reset`, folded into every key so a reset invalidates all entries
+ALL_COLLECTIONS = "__all__"
+
+
+class RetrievalCache:
+    """
+    Cache for retrieval results keyed by the content version of the searched
+    collections, the normalized queries and the retrieval parameters.
+
+    Collection versions are bumped on every insert/delete (see `VectorDBBase`),
+    so a cached entry is never served once its collections changed. Versions
+    live in Redis when configured so every worker sees the same counters; the
+    results themselves are kept serialized in a per-process LRU bounded both
+    by entry count and by total size.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: int = 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._size = 0
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        self._aredis = None
+
+        if redis_url:
+            self._redis = get_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+            self._aredis = get_async_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+        elif UVICORN_WORKERS > 1:
+            # Local version counters can't see bumps made by other workers
+            log.info("Retrieval cache disabled: multiple workers without Redis")
+            self.maxsize = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _version_key(self, collection_name: str) -> str:
+        return f"open-webui:retrieval:version:{collection_name}"
+
+    def _bump_local_version(self, collection_name: str):
+        with self._lock:
+            self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+
+    # Version keys outlive every entry cached under them, so an expired key
+    # (read back as no version) never matches an entry from before its bumps
+    @property
+    def _version_ttl(self) -> int:
+        return 2 * self.ttl
+
+    def bump_collection_version(self, collection_name: Optional[str] = None):
+        collection_name = collection_name or ALL_COLLECTIONS
+        if self._redis:
+            try:
+                with self._redis.pipeline() as pipe:
+                    pipe.incr(self._version_key(collection_name))
+                    pipe.expire(self._version_key(collection_name), self._version_ttl)
+                    pipe.execute()
+                return
+            except Exception as e:
+                log.warning(f"Failed to bump collection version in Redis: {e}")
+
+        self._bump_local_version(collection_name)
+
+    async def abump_collection_version(self, collection_name: Optional[str] = None):
+        """Async variant of `bump_collection_version`."""
+        collection_name = collection_name or ALL_COLLECTIONS
+        if self._aredis:
+            try:
+                async with self._aredis.pipeline() as pipe:
+                    pipe.incr(self._version_key(collection_name))
+                    pipe.expire(self._version_key(collection_name), self._version_ttl)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                log.warning(f"Failed to bump collection version in Redis: {e}")
+
+        self._bump_local_version(collection_name)
+
+    def get_collection_versions(self, collection_names: list[str]) -> list:
+        collection_names = [ALL_COLLECTIONS, *collection_names]
+        if self._redis:
+            return self._redis.mget(
+                [
+                    self._version_key(collection_name)
+                    for collection_name in collection_names
+                ]
+            )
+
+        with self._lock:
+            return [
+                self._versions.get(collection_name, 0)
+                for collection_name in collection_names
+            ]
+
+    def get_key(
+        self, collection_names: Iterable[str], queries: list[str], **params
+    ) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        try:
+            collection_names = sorted(collection_names)
+            versions = self.get_collection_versions(collection_names)
+        except Exception as e:
+            log.warning(f"Failed to read collection versions: {e}")
+            return None
+
+        key = json.dumps(
+            {
+                "collections": list(
+                    zip([ALL_COLLECTIONS, *collection_names], versions)
+                ),
+                "queries": [" ".join(query.split()) for query in queries],
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._pop_entry(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Every hit gets its own copy, callers are free to modify it
+        return json_codec.loads(value)
+
+    def _pop_entry(self, key: str):
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def set(self, key: Optional[str], value: Any):
+        if key is None or value is None:
+            return
+
+        try:
+            value = json_codec.dumps(value)
+        except (TypeError, ValueError) as e:
+            log.debug(f"Not caching a retrieval result that can't be serialized: {e}")
+            return
+
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._pop_entry(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._size += len(value)
+            while len(self._entries) > self.maxsize or self._size > self.max_bytes:
+                self._pop_entry(next(iter(self._entries)))
+
+
+RETRIEVAL_CACHE = RetrievalCache(
+    maxsize=RAG_RETRIEVAL_CACHE_SIZE,
+    ttl=RAG_RETRIEVAL_CACHE_TTL,
+    max_bytes=RAG_RETRIEVAL_CACHE_MAX_BYTES,
+    redis_url=REDIS_URL,
+    redis_sentinels=get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+)
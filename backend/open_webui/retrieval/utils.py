@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import os
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
 import requests
 import hashlib
@@ -19,6 +20,7 @@ from open_webui.models.users import UserModel
 from open_webui.models.files import Files
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.cache import RETRIEVAL_CACHE
 
 
 from open_webui.env import (
@@ -27,6 +29,7 @@ from open_webui.env import (
     ENABLE_FORWARD_USER_INFO_HEADERS,
 )
 from open_webui.config import (
+    RAG_RETRIEVAL_CONCURRENCY,
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
@@ -77,7 +80,11 @@ class VectorSearchRetriever(BaseRetriever):
 
 
 def query_doc(
-    collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
+    collection_name: str,
+    query_embedding: list[float],
+    k: int,
+    user: UserModel = None,
+    filter: Optional[dict] = None,
 ):
     try:
         log.debug(f"query_doc:doc {collection_name}")
@@ -85,6 +92,7 @@ def query_doc(
             collection_name=collection_name,
             vectors=[query_embedding],
             limit=k,
+            filter=filter,
         )
 
         if result:
@@ -99,9 +107,13 @@ def query_doc(
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        # Stream the collection page by page rather than loading it in one call
+        result = merge_get_results([])
+        for batch in VECTOR_DB_CLIENT.iter_items(collection_name=collection_name):
+            extend_get_result(result, batch)
+        result = GetResult(**result)
 
-        if result:
+        if result.ids[0]:
             log.info(f"query_doc:result {result.ids} {result.metadatas}")
 
         return result
@@ -110,9 +122,64 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+async def aquery_doc(
+    collection_name: str,
+    query_embedding: list[float],
+    k: int,
+    user: UserModel = None,
+    filter: Optional[dict] = None,
+):
+    try:
+        log.debug(f"aquery_doc:doc {collection_name}")
+        result = await VECTOR_DB_CLIENT.asearch(
+            collection_name=collection_name,
+            vectors=[query_embedding],
+            limit=k,
+            filter=filter,
+        )
+
+        if result:
+            log.info(f"aquery_doc:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with limit {k}: {e}")
+        raise e
+
+
+async def aget_doc(collection_name: str, user: UserModel = None):
+    try:
+        log.debug(f"aget_doc:doc {collection_name}")
+        result = GetResult(**await aget_collection_items(collection_name))
+
+        if result.ids[0]:
+            log.info(f"aget_doc:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error getting doc {collection_name}: {e}")
+        raise e
+
+
+def get_bm25_retriever(collection_name: str, k: int) -> BM25Retriever:
+    """
+    Index a collection for BM25. Its pages are turned into documents as they
+    are read, instead of first being merged and validated into a `GetResult`.
+    """
+    documents = [
+        Document(page_content=document, metadata=metadata)
+        for batch in VECTOR_DB_CLIENT.iter_items(collection_name=collection_name)
+        for document, metadata in zip(batch.documents[0], batch.metadatas[0])
+    ]
+    if not documents:
+        raise ValueError(f"Collection {collection_name} is empty")
+
+    return BM25Retriever.from_documents(documents, k=k)
+
+
 def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    collection_result: Optional[GetResult],
     query: str,
     embedding_function,
     k: int,
@@ -120,14 +187,16 @@ def query_doc_with_hybrid_search(
     k_reranker: int,
     r: float,
     hybrid_bm25_weight: float,
+    bm25_retriever: Optional[BM25Retriever] = None,
 ) -> dict:
     try:
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+        if bm25_retriever is None:
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=collection_result.documents[0],
+                metadatas=collection_result.metadatas[0],
+            )
+            bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -190,7 +259,7 @@ def query_doc_with_hybrid_search(
         raise e
 
 
-def merge_get_results(get_results: list[dict]) -> dict:
+def merge_get_results(get_results: Iterable[dict]) -> dict:
     # Initialize lists to store combined data
     combined_documents = []
     combined_metadatas = []
@@ -211,6 +280,21 @@ def merge_get_results(get_results: list[dict]) -> dict:
     return result
 
 
+def extend_get_result(result: dict, batch: GetResult) -> dict:
+    # The page's documents and metadata are added by reference, not copied
+    result["documents"][0].extend(batch.documents[0])
+    result["metadatas"][0].extend(batch.metadatas[0])
+    result["ids"][0].extend(batch.ids[0])
+    return result
+
+
+async def aget_collection_items(collection_name: str) -> dict:
+    result = merge_get_results([])
+    async for batch in VECTOR_DB_CLIENT.aiter_items(collection_name=collection_name):
+        extend_get_result(result, batch)
+    return result
+
+
 def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     # Initialize lists to store combined data
     combined = dict()  # To store documents with unique document hashes
@@ -252,20 +336,40 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
 
 
 def get_all_items_from_collections(collection_names: list[str]) -> dict:
-    results = []
+    result = merge_get_results([])
 
     for collection_name in collection_names:
         if collection_name:
             try:
-                result = get_doc(collection_name=collection_name)
-                if result is not None:
-                    results.append(result.model_dump())
+                for batch in VECTOR_DB_CLIENT.iter_items(
+                    collection_name=collection_name
+                ):
+                    extend_get_result(result, batch)
             except Exception as e:
                 log.exception(f"Error when querying the collection: {e}")
         else:
             pass
 
-    return merge_get_results(results)
+    return result
+
+
+async def aget_all_items_from_collections(collection_names: list[str]) -> dict:
+    async def process_collection(collection_name):
+        try:
+            return await aget_collection_items(collection_name)
+        except Exception as e:
+            log.exception(f"Error when querying the collection: {e}")
+            return None
+
+    task_results = await asyncio.gather(
+        *[
+            process_collection(collection_name)
+            for collection_name in collection_names
+            if collection_name
+        ]
+    )
+
+    return merge_get_results(result for result in task_results if result is not None)
 
 
 def query_collection(
@@ -273,6 +377,7 @@ def query_collection(
     queries: list[str],
     embedding_function,
     k: int,
+    filter: Optional[dict] = None,
 ) -> dict:
     results = []
     error = False
@@ -284,6 +389,7 @@ def query_collection(
                     collection_name=collection_name,
                     k=k,
                     query_embedding=query_embedding,
+                    filter=filter,
                 )
                 if result is not None:
                     return result.model_dump(), None
@@ -320,6 +426,60 @@ def query_collection(
     return merge_and_sort_query_results(results, k=k)
 
 
+async def aquery_collection(
+    collection_names: list[str],
+    queries: list[str],
+    embedding_function,
+    k: int,
+    filter: Optional[dict] = None,
+) -> dict:
+    results = []
+    error = False
+
+    async def process_query_collection(collection_name, query_embedding):
+        try:
+            if collection_name:
+                result = await aquery_doc(
+                    collection_name=collection_name,
+                    k=k,
+                    query_embedding=query_embedding,
+                    filter=filter,
+                )
+                if result is not None:
+                    return result.model_dump(), None
+            return None, None
+        except Exception as e:
+            log.exception(f"Error when querying the collection: {e}")
+            return None, e
+
+    # Generate all query embeddings (in one call), off the event loop
+    query_embeddings = await asyncio.to_thread(
+        embedding_function, queries, prefix=RAG_EMBEDDING_QUERY_PREFIX
+    )
+    log.debug(
+        f"aquery_collection: processing {len(queries)} queries across {len(collection_names)} collections"
+    )
+
+    task_results = await asyncio.gather(
+        *[
+            process_query_collection(collection_name, query_embedding)
+            for query_embedding in query_embeddings
+            for collection_name in collection_names
+        ]
+    )
+
+    for result, err in task_results:
+        if err is not None:
+            error = True
+        elif result is not None:
+            results.append(result)
+
+    if error and not results:
+        log.warning("All collection queries failed. No results returned.")
+
+    return merge_and_sort_query_results(results, k=k)
+
+
 def query_collection_with_hybrid_search(
     collection_names: list[str],
     queries: list[str],
@@ -332,20 +492,19 @@ def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
-    collection_results = {}
+    # Index each collection for BM25 once, sequentially, and share the index
+    # between the queries instead of fetching the data multiple times later
+    bm25_retrievers = {}
     for collection_name in collection_names:
         try:
             log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+                f"query_collection_with_hybrid_search:get_doc:collection {collection_name}"
             )
+            bm25_retrievers[collection_name] = get_bm25_retriever(collection_name, k)
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
+            bm25_retrievers[collection_name] = None
+            error = True
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -355,7 +514,7 @@ def query_collection_with_hybrid_search(
         try:
             result = query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
+                collection_result=None,
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -363,6 +522,7 @@ def query_collection_with_hybrid_search(
                 k_reranker=k_reranker,
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
+                bm25_retriever=bm25_retrievers[collection_name],
             )
             return result, None
         except Exception as e:
@@ -374,7 +534,7 @@ def query_collection_with_hybrid_search(
     tasks = [
         (cn, q)
         for cn in collection_names
-        if collection_results[cn] is not None
+        if bm25_retrievers[cn] is not None
         for q in queries
     ]
 
@@ -443,7 +603,106 @@ def get_embedding_function(
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
 
-def get_sources_from_files(
+async def query_files_in_shared_collections(
+    files: list[dict],
+    queries: list[str],
+    embedding_function,
+    k: int,
+    cache_params: Optional[dict] = None,
+) -> dict[str, dict]:
+    """
+    Search files that belong to the same knowledge base as one collection
+    restricted to those files, instead of fanning out over `file-{id}`
+    collections. Returns the per-file contexts keyed by file id.
+    """
+    file_ids = [
+        file["id"]
+        for file in files
+        if file.get("type") == "file"
+        and file.get("id")
+        and not file.get("legacy")
+        and not file.get("docs")
+        and file.get("context") != "full"
+        and file.get("collection_name", f"file-{file['id']}") == f"file-{file['id']}"
+    ]
+    if len(file_ids) < 2:
+        return {}
+
+    file_metadatas = await asyncio.to_thread(Files.get_file_metadatas_by_ids, file_ids)
+
+    file_ids_by_collection = {}
+    for file_metadata in file_metadatas:
+        collection_name = (file_metadata.meta or {}).get("collection_name")
+        if collection_name and collection_name != f"file-{file_metadata.id}":
+            file_ids_by_collection.setdefault(collection_name, []).append(
+                file_metadata.id
+            )
+
+    async def search(collection_name: str, filter: dict, limit: int):
+        cache_key = await asyncio.to_thread(
+            RETRIEVAL_CACHE.get_key,
+            [collection_name],
+            queries,
+            **{**(cache_params or {}), "k": limit, "filter": filter},
+        )
+
+        result = RETRIEVAL_CACHE.get(cache_key)
+        if result is None:
+            result = await aquery_collection(
+                collection_names=[collection_name],
+                queries=queries,
+                embedding_function=embedding_function,
+                k=limit,
+                filter=filter,
+            )
+            RETRIEVAL_CACHE.set(cache_key, result)
+        return result
+
+    contexts = {}
+    for collection_name, collection_file_ids in file_ids_by_collection.items():
+        if len(collection_file_ids) < 2:
+            continue
+
+        limit = k * len(collection_file_ids)
+        try:
+            result = await search(
+                collection_name, {"file_id": sorted(collection_file_ids)}, limit
+            )
+        except Exception as e:
+            log.exception(e)
+            continue
+
+        # Split the shared result back into per-file contexts, keeping top k each
+        for file_id in collection_file_ids:
+            indices = [
+                idx
+                for idx, metadata in enumerate(result["metadatas"][0])
+                if (metadata or {}).get("file_id") == file_id
+            ][:k]
+            contexts[file_id] = {
+                key: [[result[key][0][idx] for idx in indices]]
+                for key in ("distances", "documents", "metadatas")
+            }
+
+        # The other files can take most of the shared hits. Unless the shared
+        # search already returned everything, top up the files left short of k
+        # with a search of their own.
+        if len(result["metadatas"][0]) < limit:
+            continue
+
+        for file_id in collection_file_ids:
+            if len(contexts[file_id]["metadatas"][0]) < k:
+                try:
+                    contexts[file_id] = await search(
+                        collection_name, {"file_id": file_id}, k
+                    )
+                except Exception as e:
+                    log.exception(e)
+
+    return contexts
+
+
+async def get_sources_from_files(
     request,
     files,
     queries,
@@ -461,8 +720,124 @@ def get_sources_from_files(
     )
 
     extracted_collections = []
-    relevant_contexts = []
 
+    # Everything besides the collections and queries that shapes the result
+    cache_params = {
+        "k": k,
+        "k_reranker": k_reranker,
+        "r": r,
+        "hybrid_bm25_weight": hybrid_bm25_weight,
+        "hybrid_search": hybrid_search,
+        "full_context": full_context,
+        "embedding_engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "embedding_model": request.app.state.config.RAG_EMBEDDING_MODEL,
+        "reranking_model": (
+            request.app.state.config.RAG_RERANKING_MODEL if reranking_function else None
+        ),
+    }
+
+    bypass_embedding_and_retrieval = (
+        request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+    )
+
+    # Resolve every file object needed in bypass mode with a single query
+    file_objects = {}
+    if bypass_embedding_and_retrieval:
+        file_ids = []
+        for file in files:
+            if file.get("docs") or file.get("context") == "full":
+                continue
+            if file.get("type") == "web_search":
+                continue
+            if file.get("type") == "collection":
+                file_ids.extend(file.get("data", {}).get("file_ids", []))
+            elif file.get("id"):
+                file_ids.append(file.get("id"))
+
+        if file_ids:
+            file_objects = {
+                file_object.id: file_object
+                for file_object in await asyncio.to_thread(
+                    Files.get_files_by_ids, list(set(file_ids))
+                )
+            }
+
+    # Hybrid search needs the whole collection for BM25, so only plain vector
+    # search is pushed down to a filtered knowledge base collection.
+    shared_collection_contexts = {}
+    if not full_context and not hybrid_search and not bypass_embedding_and_retrieval:
+        shared_collection_contexts = await query_files_in_shared_collections(
+            files, queries, embedding_function, k, cache_params=cache_params
+        )
+
+    # Bound how many files are retrieved at the same time for one request
+    semaphore = asyncio.Semaphore(RAG_RETRIEVAL_CONCURRENCY)
+
+    async def get_collection_context(file, collection_names):
+        async with semaphore:
+            # Regenerations and follow-up turns repeat the same retrieval, reuse
+            # it as long as none of the collections changed since. Full context
+            # is the whole collections, too big to keep and cheap to read again.
+            cache_key = None
+            if not full_context:
+                cache_key = await asyncio.to_thread(
+                    RETRIEVAL_CACHE.get_key,
+                    collection_names,
+                    queries,
+                    **cache_params,
+                )
+            context = RETRIEVAL_CACHE.get(cache_key)
+
+            if context is not None:
+                log.debug(f"retrieval cache hit for {collection_names}")
+            elif full_context:
+                try:
+                    context = await aget_all_items_from_collections(
+                        list(collection_names)
+                    )
+                except Exception as e:
+                    log.exception(e)
+            else:
+                try:
+                    if hybrid_search:
+                        try:
+                            # BM25 and reranking are CPU bound, keep them off the event loop
+                            context = await asyncio.to_thread(
+                                query_collection_with_hybrid_search,
+                                collection_names=collection_names,
+                                queries=queries,
+                                embedding_function=embedding_function,
+                                k=k,
+                                reranking_function=reranking_function,
+                                k_reranker=k_reranker,
+                                r=r,
+                                hybrid_bm25_weight=hybrid_bm25_weight,
+                            )
+                        except Exception as e:
+                            log.debug(
+                                "Error when using hybrid search, using"
+                                " non hybrid search as fallback."
+                            )
+
+                    if (not hybrid_search) or (context is None):
+                        context = await aquery_collection(
+                            collection_names=collection_names,
+                            queries=queries,
+                            embedding_function=embedding_function,
+                            k=k,
+                        )
+                except Exception as e:
+                    log.exception(e)
+
+            RETRIEVAL_CACHE.set(cache_key, context)
+            return context
+
+    async def get_context(context):
+        return context
+
+    # Plan every file in order first (collection de-duplication depends on it),
+    # then retrieve the independent files concurrently.
+    planned = []
     for file in files:
 
         context = None
@@ -478,10 +853,7 @@ def get_sources_from_files(
                 "documents": [[file.get("file").get("data", {}).get("content")]],
                 "metadatas": [[{"file_id": file.get("id"), "name": file.get("name")}]],
             }
-        elif (
-            file.get("type") != "web_search"
-            and request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-        ):
+        elif file.get("type") != "web_search" and bypass_embedding_and_retrieval:
             # BYPASS_EMBEDDING_AND_RETRIEVAL
             if file.get("type") == "collection":
                 file_ids = file.get("data", {}).get("file_ids", [])
@@ -489,7 +861,7 @@ def get_sources_from_files(
                 documents = []
                 metadatas = []
                 for file_id in file_ids:
-                    file_object = Files.get_file_by_id(file_id)
+                    file_object = file_objects.get(file_id)
 
                     if file_object:
                         documents.append(file_object.data.get("content", ""))
@@ -507,7 +879,7 @@ def get_sources_from_files(
                 }
 
             elif file.get("id"):
-                file_object = Files.get_file_by_id(file.get("id"))
+                file_object = file_objects.get(file.get("id"))
                 if file_object:
                     context = {
                         "documents": [[file_object.data.get("content", "")]],
@@ -528,6 +900,8 @@ def get_sources_from_files(
                         [file.get("file").get("data", {}).get("metadata", {})]
                     ],
                 }
+        elif file.get("id") in shared_collection_contexts:
+            context = shared_collection_contexts[file["id"]]
         else:
             collection_names = []
             if file.get("type") == "collection":
@@ -548,48 +922,20 @@ def get_sources_from_files(
                 log.debug(f"skipping {file} as it has already been extracted")
                 continue
 
-            if full_context:
-                try:
-                    context = get_all_items_from_collections(collection_names)
-                except Exception as e:
-                    log.exception(e)
+            extracted_collections.extend(collection_names)
 
+            if file.get("type") == "text" and not full_context:
+                context = file["content"]
             else:
-                try:
-                    context = None
-                    if file.get("type") == "text":
-                        context = file["content"]
-                    else:
-                        if hybrid_search:
-                            try:
-                                context = query_collection_with_hybrid_search(
-                                    collection_names=collection_names,
-                                    queries=queries,
-                                    embedding_function=embedding_function,
-                                    k=k,
-                                    reranking_function=reranking_function,
-                                    k_reranker=k_reranker,
-                                    r=r,
-                                    hybrid_bm25_weight=hybrid_bm25_weight,
-                                )
-                            except Exception as e:
-                                log.debug(
-                                    "Error when using hybrid search, using"
-                                    " non hybrid search as fallback."
-                                )
-
-                        if (not hybrid_search) or (context is None):
-                            context = query_collection(
-                                collection_names=collection_names,
-                                queries=queries,
-                                embedding_function=embedding_function,
-                                k=k,
-                            )
-                except Exception as e:
-                    log.exception(e)
+                planned.append((file, get_collection_context(file, collection_names)))
+                continue
 
-            extracted_collections.extend(collection_names)
+        planned.append((file, get_context(context)))
 
+    contexts = await asyncio.gather(*[coroutine for _, coroutine in planned])
+
+    relevant_contexts = []
+    for (file, _), context in zip(planned, contexts):
         if context:
             if "data" in file:
                 del file["data"]
@@ -3,9 +3,10 @@ import logging
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -41,6 +42,10 @@ class ChromaClient(VectorDBBase):
                 CHROMA_CLIENT_AUTH_CREDENTIALS
             )
 
+        self.settings_dict = settings_dict
+        # Native async client, created lazily on first use (HTTP mode only)
+        self.aclient = None
+
         if CHROMA_HTTP_HOST != "":
             self.client = chromadb.HttpClient(
                 host=CHROMA_HTTP_HOST,
@@ -59,6 +64,51 @@ class ChromaClient(VectorDBBase):
                 database=CHROMA_DATABASE,
             )
 
+    async def _get_async_client(self):
+        # The embedded PersistentClient has no async counterpart; callers fall
+        # back to the thread-offload implementation of the base class.
+        if CHROMA_HTTP_HOST == "":
+            return None
+
+        if self.aclient is None:
+            self.aclient = await chromadb.AsyncHttpClient(
+                host=CHROMA_HTTP_HOST,
+                port=CHROMA_HTTP_PORT,
+                headers=CHROMA_HTTP_HEADERS,
+                ssl=CHROMA_HTTP_SSL,
+                tenant=CHROMA_TENANT,
+                database=CHROMA_DATABASE,
+                settings=Settings(**self.settings_dict),
+            )
+        return self.aclient
+
+    def _build_where(self, filter: Optional[dict]) -> Optional[dict]:
+        # Translate the search filter into chroma's `where` syntax
+        if not filter:
+            return None
+
+        conditions = [
+            {key: {"$in": value} if isinstance(value, list) else {"$eq": value}}
+            for key, value in filter.items()
+        ]
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def _query_result_to_search_result(self, result) -> SearchResult:
+        # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
+        # https://docs.trychroma.com/docs/collections/configure cosine equation
+        distances: list = result["distances"][0]
+        distances = [2 - dist for dist in distances]
+        distances = [[dist / 2 for dist in distances]]
+
+        return SearchResult(
+            **{
+                "ids": result["ids"],
+                "distances": distances,
+                "documents": result["documents"],
+                "metadatas": result["metadatas"],
+            }
+        )
+
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
         collection_names = self.client.list_collections()
@@ -69,7 +119,11 @@ class ChromaClient(VectorDBBase):
         return self.client.delete_collection(name=collection_name)
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         try:
@@ -78,22 +132,9 @@ class ChromaClient(VectorDBBase):
                 result = collection.query(
                     query_embeddings=vectors,
                     n_results=limit,
+                    where=self._build_where(filter),
                 )
-
-                # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
-                # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
-
-                return SearchResult(
-                    **{
-                        "ids": result["ids"],
-                        "distances": distances,
-                        "documents": result["documents"],
-                        "metadatas": result["metadatas"],
-                    }
-                )
+                return self._query_result_to_search_result(result)
             return None
         except Exception as e:
             return None
@@ -135,6 +176,36 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        # Page through the collection instead of loading it all with a single get().
+        collection = self.client.get_collection(name=collection_name)
+        if not collection:
+            return
+
+        offset = 0
+        while True:
+            result = collection.get(
+                limit=batch_size,
+                offset=offset,
+                include=["documents", "metadatas"],
+            )
+            if not result["ids"]:
+                break
+
+            yield GetResult(
+                **{
+                    "ids": [result["ids"]],
+                    "documents": [result["documents"]],
+                    "metadatas": [result["metadatas"]],
+                }
+            )
+
+            if len(result["ids"]) < batch_size:
+                break
+            offset += len(result["ids"])
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
@@ -191,6 +262,139 @@ class ChromaClient(VectorDBBase):
             )
             pass
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        aclient = await self._get_async_client()
+        if aclient is None:
+            return await super().ahas_collection(collection_name)
+
+        collection_names = await aclient.list_collections()
+        return collection_name in collection_names
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
+        aclient = await self._get_async_client()
+        if aclient is None:
+            return await super().asearch(collection_name, vectors, limit, filter)
+
+        try:
+            collection = await aclient.get_collection(name=collection_name)
+            if collection:
+                result = await collection.query(
+                    query_embeddings=vectors,
+                    n_results=limit,
+                    where=self._build_where(filter),
+                )
+                return self._query_result_to_search_result(result)
+            return None
+        except Exception as e:
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        aclient = await self._get_async_client()
+        if aclient is None:
+            return await super().aquery(collection_name, filter, limit)
+
+        try:
+            collection = await aclient.get_collection(name=collection_name)
+            if collection:
+                result = await collection.get(
+                    where=filter,
+                    limit=limit,
+                )
+
+                return GetResult(
+                    **{
+                        "ids": [result["ids"]],
+                        "documents": [result["documents"]],
+                        "metadatas": [result["metadatas"]],
+                    }
+                )
+            return None
+        except:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        aclient = await self._get_async_client()
+        if aclient is None:
+            return await super().aget(collection_name)
+
+        collection = await aclient.get_collection(name=collection_name)
+        if collection:
+            result = await collection.get()
+            return GetResult(
+                **{
+                    "ids": [result["ids"]],
+                    "documents": [result["documents"]],
+                    "metadatas": [result["metadatas"]],
+                }
+            )
+        return None
+
+    async def aiter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> AsyncIterator[GetResult]:
+        aclient = await self._get_async_client()
+        if aclient is None:
+            async for batch in super().aiter_items(collection_name, batch_size):
+                yield batch
+            return
+
+        collection = await aclient.get_collection(name=collection_name)
+        if not collection:
+            return
+
+        offset = 0
+        while True:
+            result = await collection.get(
+                limit=batch_size,
+                offset=offset,
+                include=["documents", "metadatas"],
+            )
+            if not result["ids"]:
+                break
+
+            yield GetResult(
+                **{
+                    "ids": [result["ids"]],
+                    "documents": [result["documents"]],
+                    "metadatas": [result["metadatas"]],
+                }
+            )
+
+            if len(result["ids"]) < batch_size:
+                break
+            offset += len(result["ids"])
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        aclient = await self._get_async_client()
+        if aclient is None:
+            return await super().ainsert(collection_name, items)
+
+        collection = await aclient.get_or_create_collection(
+            name=collection_name, metadata={"hnsw:space": "cosine"}
+        )
+
+        ids = [item["id"] for item in items]
+        documents = [item["text"] for item in items]
+        embeddings = [item["vector"] for item in items]
+        metadatas = [item["metadata"] for item in items]
+
+        max_batch_size = await aclient.get_max_batch_size()
+        for i in range(0, len(ids), max_batch_size):
+            await collection.add(
+                ids=ids[i : i + max_batch_size],
+                documents=documents[i : i + max_batch_size],
+                embeddings=embeddings[i : i + max_batch_size],
+                metadatas=metadatas[i : i + max_batch_size],
+            )
+
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
         return self.client.reset()
@@ -1,8 +1,9 @@
 from elasticsearch import Elasticsearch, BadRequestError
-from typing import Optional
+from typing import Iterator, Optional
 import ssl
 from elasticsearch.helpers import bulk, scan
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -151,16 +152,25 @@ class ElasticsearchClient(VectorDBBase):
 
     # Status: works
     def search(
-        self, collection_name: str, vectors: list[list[float]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
+        filters = [{"term": {"collection": collection_name}}]
+        for field, value in (filter or {}).items():
+            if isinstance(value, list):
+                filters.append({"terms": {f"metadata.{field}": value}})
+            else:
+                filters.append({"term": {f"metadata.{field}": value}})
+
         query = {
             "size": limit,
             "_source": ["text", "metadata"],
             "query": {
                 "script_score": {
-                    "query": {
-                        "bool": {"filter": [{"term": {"collection": collection_name}}]}
-                    },
+                    "query": {"bool": {"filter": filters}},
                     "script": {
                         "source": "cosineSimilarity(params.vector, 'vector') + 1.0",
                         "params": {
@@ -229,6 +239,25 @@ class ElasticsearchClient(VectorDBBase):
 
         return self._scan_result_to_get_result(results)
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        # scan() already streams with the scroll API, group the hits into pages.
+        query = {
+            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}},
+            "_source": ["text", "metadata"],
+        }
+        batch = []
+        for hit in scan(
+            self.client, index=f"{self.index_prefix}*", query=query, size=batch_size
+        ):
+            batch.append(hit)
+            if len(batch) >= batch_size:
+                yield self._scan_result_to_get_result(batch)
+                batch = []
+        if batch:
+            yield self._scan_result_to_get_result(batch)
+
     # Status: works
     def insert(self, collection_name: str, items: list[VectorItem]):
         if not self._has_index(dimension=len(items[0]["vector"])):
@@ -2,8 +2,9 @@ from pymilvus import MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 import json
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -169,7 +170,11 @@ class MilvusClient(VectorDBBase):
         )
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         collection_name = collection_name.replace("-", "_")
@@ -180,6 +185,16 @@ class MilvusClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}",
             data=vectors,
             limit=limit,
+            filter=" && ".join(
+                [
+                    (
+                        f'metadata["{key}"] in {json.dumps(value)}'
+                        if isinstance(value, list)
+                        else f'metadata["{key}"] == {json.dumps(value)}'
+                    )
+                    for key, value in (filter or {}).items()
+                ]
+            ),
             output_fields=["data", "metadata"],
             # search_params=search_params # Potentially add later if needed
         )
@@ -281,6 +296,29 @@ class MilvusClient(VectorDBBase):
         # This will use the paginated query logic.
         return self.query(collection_name=collection_name, filter={}, limit=None)
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        # Stream the collection with Milvus' query iterator instead of offset paging.
+        collection_name = collection_name.replace("-", "_")
+        if not self.has_collection(collection_name):
+            return
+
+        iterator = self.client.query_iterator(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            batch_size=batch_size,
+            filter="",
+            output_fields=["id", "data", "metadata"],
+        )
+        try:
+            while True:
+                results = iterator.next()
+                if not results:
+                    break
+                yield self._result_to_get_result([results])
+        finally:
+            iterator.close()
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection_name = collection_name.replace("-", "_")
@@ -1,8 +1,9 @@
 from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
-from typing import Optional
+from opensearchpy.helpers import bulk, scan
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -111,19 +112,43 @@ class OpenSearchClient(VectorDBBase):
         # We are simply adapting to the norms of the other DBs.
         self.client.indices.delete(index=self._get_index_name(collection_name))
 
+    def _metadata_filter(self, field: str, value) -> dict:
+        # Metadata is mapped dynamically, so strings are analyzed `text` fields
+        # and exact matches have to go through their `keyword` sub-field
+        values = value if isinstance(value, list) else [value]
+        if all(isinstance(v, str) for v in values):
+            field = f"{field}.keyword"
+
+        if isinstance(value, list):
+            return {"terms": {f"metadata.{field}": value}}
+        return {"term": {f"metadata.{field}": value}}
+
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         try:
             if not self.has_collection(collection_name):
                 return None
 
+            filters = [
+                self._metadata_filter(field, value)
+                for field, value in (filter or {}).items()
+            ]
+
             query = {
                 "size": limit,
                 "_source": ["text", "metadata"],
                 "query": {
                     "script_score": {
-                        "query": {"match_all": {}},
+                        "query": (
+                            {"bool": {"filter": filters}}
+                            if filters
+                            else {"match_all": {}}
+                        ),
                         "script": {
                             "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
                             "params": {
@@ -186,6 +211,25 @@ class OpenSearchClient(VectorDBBase):
         )
         return self._result_to_get_result(result)
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        query = {"query": {"match_all": {}}, "_source": ["text", "metadata"]}
+
+        batch = []
+        for hit in scan(
+            self.client,
+            index=self._get_index_name(collection_name),
+            query=query,
+            size=batch_size,
+        ):
+            batch.append(hit)
+            if len(batch) >= batch_size:
+                yield self._result_to_get_result({"hits": {"hits": batch}})
+                batch = []
+        if batch:
+            yield self._result_to_get_result({"hits": {"hits": batch}})
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         self._create_index_if_not_exists(
             collection_name=collection_name, dimension=len(items[0]["vector"])
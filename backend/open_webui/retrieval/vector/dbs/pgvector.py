@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import logging
 from sqlalchemy import (
     cast,
@@ -23,6 +23,7 @@ from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -207,6 +208,7 @@ class PgvectorClient(VectorDBBase):
         collection_name: str,
         vectors: List[List[float]],
         limit: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
     ) -> Optional[SearchResult]:
         try:
             if not vectors:
@@ -245,6 +247,13 @@ class PgvectorClient(VectorDBBase):
                     (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
                 )
             )
+            for key, value in (filter or {}).items():
+                if isinstance(value, list):
+                    subq = subq.where(
+                        DocumentChunk.vmetadata[key].astext.in_([str(v) for v in value])
+                    )
+                else:
+                    subq = subq.where(DocumentChunk.vmetadata[key].astext == str(value))
             if limit is not None:
                 subq = subq.limit(limit)
             subq = subq.lateral("result")
@@ -351,6 +360,37 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        # Keyset pagination on the primary key, only loading the columns we return.
+        last_id = None
+        while True:
+            try:
+                query = self.session.query(
+                    DocumentChunk.id, DocumentChunk.text, DocumentChunk.vmetadata
+                ).filter(DocumentChunk.collection_name == collection_name)
+                if last_id is not None:
+                    query = query.filter(DocumentChunk.id > last_id)
+                results = query.order_by(DocumentChunk.id).limit(batch_size).all()
+            except Exception as e:
+                self.session.rollback()
+                log.exception(f"Error during iter_items: {e}")
+                return
+
+            if not results:
+                break
+
+            yield GetResult(
+                ids=[[result.id for result in results]],
+                documents=[[result.text for result in results]],
+                metadatas=[[result.vmetadata for result in results]],
+            )
+
+            if len(results) < batch_size:
+                break
+            last_id = results[-1].id
+
     def delete(
         self,
         collection_name: str,
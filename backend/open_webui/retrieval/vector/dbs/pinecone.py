@@ -320,7 +320,11 @@ class PineconeClient(VectorDBBase):
         )
 
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
         """Search for similar vectors in a collection."""
         if not vectors or not vectors[0]:
@@ -343,7 +347,13 @@ class PineconeClient(VectorDBBase):
                 vector=query_vector,
                 top_k=limit,
                 include_metadata=True,
-                filter={"collection_name": collection_name_with_prefix},
+                filter={
+                    "collection_name": collection_name_with_prefix,
+                    **{
+                        key: {"$in": value} if isinstance(value, list) else value
+                        for key, value in (filter or {}).items()
+                    },
+                },
             )
 
             matches = getattr(query_response, "matches", []) or []
@@ -1,12 +1,14 @@
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 import logging
 from urllib.parse import urlparse
 
 from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -38,6 +40,7 @@ class QdrantClient(VectorDBBase):
 
         if not self.QDRANT_URI:
             self.client = None
+            self.aclient = None
             return
 
         # Unified handling for either scheme
@@ -46,15 +49,19 @@ class QdrantClient(VectorDBBase):
         http_port = parsed.port or 6333  # default REST port
 
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-            )
+            client_kwargs = {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+            }
         else:
-            self.client = Qclient(url=self.QDRANT_URI, api_key=self.QDRANT_API_KEY)
+            client_kwargs = {"url": self.QDRANT_URI, "api_key": self.QDRANT_API_KEY}
+
+        self.client = Qclient(**client_kwargs)
+        # Native async client used by the a* methods so chat retrieval never blocks the event loop
+        self.aclient = AsyncQdrantClient(**client_kwargs)
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -94,6 +101,58 @@ class QdrantClient(VectorDBBase):
                 collection_name=collection_name, dimension=dimension
             )
 
+    async def _acreate_collection_if_not_exists(self, collection_name, dimension):
+        if not await self.ahas_collection(collection_name=collection_name):
+            collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+            await self.aclient.create_collection(
+                collection_name=collection_name_with_prefix,
+                vectors_config=models.VectorParams(
+                    size=dimension,
+                    distance=models.Distance.COSINE,
+                    on_disk=self.QDRANT_ON_DISK,
+                ),
+            )
+            log.info(f"collection {collection_name_with_prefix} successfully created!")
+
+    def _query_response_to_search_result(self, query_response) -> SearchResult:
+        get_result = self._result_to_get_result(query_response.points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+        )
+
+    def _build_filter(self, filter: dict) -> models.Filter:
+        field_conditions = []
+        for key, value in filter.items():
+            field_conditions.append(
+                models.FieldCondition(
+                    key=f"metadata.{key}", match=models.MatchValue(value=value)
+                )
+            )
+        return models.Filter(should=field_conditions)
+
+    def _build_search_filter(self, filter: Optional[dict]) -> Optional[models.Filter]:
+        # Unlike query(), search filters require every condition to match
+        if not filter:
+            return None
+
+        field_conditions = []
+        for key, value in filter.items():
+            field_conditions.append(
+                models.FieldCondition(
+                    key=f"metadata.{key}",
+                    match=(
+                        models.MatchAny(any=value)
+                        if isinstance(value, list)
+                        else models.MatchValue(value=value)
+                    ),
+                )
+            )
+        return models.Filter(must=field_conditions)
+
     def _create_points(self, items: list[VectorItem]):
         return [
             PointStruct(
@@ -115,7 +174,11 @@ class QdrantClient(VectorDBBase):
         )
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         if limit is None:
@@ -124,16 +187,10 @@ class QdrantClient(VectorDBBase):
         query_response = self.client.query_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
             query=vectors[0],
+            query_filter=self._build_search_filter(filter),
             limit=limit,
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._query_response_to_search_result(query_response)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
@@ -143,17 +200,9 @@ class QdrantClient(VectorDBBase):
             if limit is None:
                 limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}", match=models.MatchValue(value=value)
-                    )
-                )
-
             points = self.client.query_points(
                 collection_name=f"{self.collection_prefix}_{collection_name}",
-                query_filter=models.Filter(should=field_conditions),
+                query_filter=self._build_filter(filter),
                 limit=limit,
             )
             return self._result_to_get_result(points.points)
@@ -169,6 +218,24 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points.points)
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        # Scroll through the collection page by page using qdrant's offset cursor.
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            if points:
+                yield self._result_to_get_result(points)
+            if offset is None:
+                break
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -214,6 +281,88 @@ class QdrantClient(VectorDBBase):
             ),
         )
 
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.aclient.collection_exists(
+            f"{self.collection_prefix}_{collection_name}"
+        )
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        query_response = await self.aclient.query_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            query=vectors[0],
+            query_filter=self._build_search_filter(filter),
+            limit=limit,
+        )
+        return self._query_response_to_search_result(query_response)
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            if limit is None:
+                limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+            points = await self.aclient.query_points(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                query_filter=self._build_filter(filter),
+                limit=limit,
+            )
+            return self._result_to_get_result(points.points)
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        points = await self.aclient.query_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+        )
+        return self._result_to_get_result(points.points)
+
+    async def aiter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> AsyncIterator[GetResult]:
+        offset = None
+        while True:
+            points, offset = await self.aclient.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            if points:
+                yield self._result_to_get_result(points)
+            if offset is None:
+                break
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_collection_if_not_exists(
+            collection_name, len(items[0]["vector"])
+        )
+        points = self._create_points(items)
+        await self.aclient.upsert(f"{self.collection_prefix}_{collection_name}", points)
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_collection_if_not_exists(
+            collection_name, len(items[0]["vector"])
+        )
+        points = self._create_points(items)
+        return await self.aclient.upsert(
+            f"{self.collection_prefix}_{collection_name}", points
+        )
+
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
         collection_names = self.client.get_collections().collections
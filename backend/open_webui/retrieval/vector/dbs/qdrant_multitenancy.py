@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
 import grpc
@@ -12,6 +12,7 @@ from open_webui.config import (
 )
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.main import (
+    DEFAULT_ITER_BATCH_SIZE,
     GetResult,
     SearchResult,
     VectorDBBase,
@@ -371,7 +372,11 @@ class QdrantClient(VectorDBBase):
             raise
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         """
         Search for the nearest neighbor items based on the vectors with tenant isolation.
@@ -407,9 +412,22 @@ class QdrantClient(VectorDBBase):
                         for vector in vectors
                     ]
 
+            # Push the metadata filter down alongside the tenant filter
+            metadata_conditions = [
+                models.FieldCondition(
+                    key=f"metadata.{key}",
+                    match=(
+                        models.MatchAny(any=value)
+                        if isinstance(value, list)
+                        else models.MatchValue(value=value)
+                    ),
+                )
+                for key, value in (filter or {}).items()
+            ]
+
             # Search with tenant filter
             prefetch_query = models.Prefetch(
-                filter=models.Filter(must=[tenant_filter]),
+                filter=models.Filter(must=[tenant_filter, *metadata_conditions]),
                 limit=NO_LIMIT,
             )
             query_response = self.client.query_points(
@@ -539,6 +557,49 @@ class QdrantClient(VectorDBBase):
             log.exception(f"Error getting collection '{collection_name}': {e}")
             return None
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        """
+        Iterate over a collection page by page with tenant isolation.
+        """
+        if not self.client:
+            return
+
+        # Map to multi-tenant collection and tenant ID
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+
+        # Create tenant filter
+        tenant_filter = models.FieldCondition(
+            key="tenant_id", match=models.MatchValue(value=tenant_id)
+        )
+
+        offset = None
+        while True:
+            try:
+                points, offset = self.client.scroll(
+                    collection_name=mt_collection,
+                    scroll_filter=models.Filter(must=[tenant_filter]),
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            except (UnexpectedResponse, grpc.RpcError) as e:
+                if self._is_collection_not_found_error(e):
+                    log.debug(
+                        f"Collection {mt_collection} doesn't exist, iter_items yields nothing"
+                    )
+                    return
+                _, error_msg = self._extract_error_message(e)
+                log.warning(f"Unexpected Qdrant error during iter_items: {error_msg}")
+                raise
+
+            if points:
+                yield self._result_to_get_result(points)
+            if offset is None:
+                break
+
     def _handle_operation_with_error_retry(
         self, operation_name, mt_collection, points, dimension
     ):
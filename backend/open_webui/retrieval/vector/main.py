@@ -1,6 +1,59 @@
+import asyncio
+import functools
+import inspect
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+# Default page size used when streaming a collection with `iter_items`
+DEFAULT_ITER_BATCH_SIZE = 1000
+
+# Methods that change a collection's content and therefore its cache version
+MUTATING_METHODS = (
+    "insert",
+    "upsert",
+    "delete",
+    "delete_collection",
+    "reset",
+    "ainsert",
+    "aupsert",
+    "adelete",
+)
+
+
+def _bump_version_after(method):
+    def get_collection_name(args, kwargs):
+        return kwargs.get("collection_name", args[0] if args else None)
+
+    def bump(args, kwargs):
+        from open_webui.retrieval.cache import RETRIEVAL_CACHE
+
+        RETRIEVAL_CACHE.bump_collection_version(get_collection_name(args, kwargs))
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            from open_webui.retrieval.cache import RETRIEVAL_CACHE
+
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                await RETRIEVAL_CACHE.abump_collection_version(
+                    get_collection_name(args, kwargs)
+                )
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            bump(args, kwargs)
+
+    return wrapper
 
 
 class VectorItem(BaseModel):
@@ -28,9 +81,20 @@ class VectorDBBase(ABC):
     vector insertion, deletion, similarity search, and metadata filtering.
 
     Any custom vector database integration must inherit from this class and
-    implement all abstract methods.
+    implement all abstract methods. Mutating methods are wrapped automatically
+    so every write bumps the collection's version in the retrieval cache.
+
+    The async variants (`asearch`, `aquery`, `aget`, `ainsert`, ...) offload the
+    synchronous implementation to a worker thread by default. Backends that
+    ship a native async client override them so no thread is consumed.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in MUTATING_METHODS:
+            if name in cls.__dict__:
+                setattr(cls, name, _bump_version_after(cls.__dict__[name]))
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -53,9 +117,20 @@ class VectorDBBase(ABC):
 
     @abstractmethod
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
-        """Search for similar vectors in a collection."""
+        """
+        Search for similar vectors in a collection.
+
+        `filter` restricts the candidates by metadata and is pushed down to the
+        backend's native filtering. It maps a metadata key (e.g. `file_id`,
+        `hash`, `source`) to either a single value (equality) or a list of
+        values (IN). All keys must match.
+        """
         pass
 
     @abstractmethod
@@ -70,6 +145,31 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def iter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        """
+        Iterate over all vectors of a collection in pages of at most `batch_size`.
+
+        The default implementation slices the result of `get`; backends with
+        native pagination override it so memory stays bounded per page.
+        """
+        result = self.get(collection_name)
+        if not result or not result.ids:
+            return
+
+        ids, documents, metadatas = (
+            result.ids[0],
+            (result.documents or [[]])[0],
+            (result.metadatas or [[]])[0],
+        )
+        for i in range(0, len(ids), batch_size):
+            yield GetResult(
+                ids=[ids[i : i + batch_size]],
+                documents=[documents[i : i + batch_size]],
+                metadatas=[metadatas[i : i + batch_size]],
+            )
+
     @abstractmethod
     def delete(
         self,
@@ -84,3 +184,57 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        """Async variant of `has_collection`."""
+        return await asyncio.to_thread(self.has_collection, collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Async variant of `insert`."""
+        return await asyncio.to_thread(self.insert, collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Async variant of `upsert`."""
+        return await asyncio.to_thread(self.upsert, collection_name, items)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
+    ) -> Optional[SearchResult]:
+        """Async variant of `search`."""
+        return await asyncio.to_thread(
+            self.search, collection_name, vectors, limit, filter
+        )
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        """Async variant of `query`."""
+        return await asyncio.to_thread(self.query, collection_name, filter, limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        """Async variant of `get`."""
+        return await asyncio.to_thread(self.get, collection_name)
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        """Async variant of `delete`."""
+        return await asyncio.to_thread(self.delete, collection_name, ids, filter)
+
+    async def aiter_items(
+        self, collection_name: str, batch_size: int = DEFAULT_ITER_BATCH_SIZE
+    ) -> AsyncIterator[GetResult]:
+        """Async variant of `iter_items`, fetching each page in a worker thread."""
+        iterator = self.iter_items(collection_name, batch_size)
+        sentinel = object()
+        while (
+            batch := await asyncio.to_thread(next, iterator, sentinel)
+        ) is not sentinel:
+            yield batch
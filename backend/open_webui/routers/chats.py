@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import Optional
@@ -23,6 +24,13 @@ from pydantic import BaseModel
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.files import (
+    copy_file_images,
+    delete_unused_chat_images,
+    extract_inline_images,
+    get_file_ids,
+    inline_file_images,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -37,15 +45,30 @@ router = APIRouter()
 @router.get("/", response_model=list[ChatTitleIdResponse])
 @router.get("/list", response_model=list[ChatTitleIdResponse])
 async def get_session_user_chat_list(
-    user=Depends(get_verified_user), page: Optional[int] = None
+    user=Depends(get_verified_user),
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
-    if page is not None:
-        limit = 60
-        skip = (page - 1) * limit
+    # `cursor` is `<updated_at>:<id>` of the last chat of the previous page
+    try:
+        if cursor is not None:
+            return Chats.get_chat_title_id_list_by_user_id(
+                user.id, cursor=cursor, limit=60
+            )
+        elif page is not None:
+            limit = 60
+            skip = (page - 1) * limit
 
-        return Chats.get_chat_title_id_list_by_user_id(user.id, skip=skip, limit=limit)
-    else:
-        return Chats.get_chat_title_id_list_by_user_id(user.id)
+            return Chats.get_chat_title_id_list_by_user_id(
+                user.id, skip=skip, limit=limit
+            )
+        else:
+            return Chats.get_chat_title_id_list_by_user_id(user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
 
 
 ############################
@@ -65,6 +88,8 @@ async def delete_all_user_chats(request: Request, user=Depends(get_verified_user
         )
 
     result = Chats.delete_chats_by_user_id(user.id)
+    if result:
+        await asyncio.to_thread(delete_unused_chat_images, user.id)
     return result
 
 
@@ -80,6 +105,7 @@ async def get_user_chat_list_by_user_id(
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_admin_user),
 ):
     if not ENABLE_ADMIN_CHAT_ACCESS:
@@ -102,9 +128,20 @@ async def get_user_chat_list_by_user_id(
     if direction:
         filter["direction"] = direction
 
-    return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit
-    )
+    try:
+        return Chats.get_chat_list_by_user_id(
+            user_id,
+            include_archived=True,
+            filter=filter,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
 
 
 ############################
@@ -113,8 +150,11 @@ async def get_user_chat_list_by_user_id(
 
 
 @router.post("/new", response_model=Optional[ChatResponse])
-async def create_new_chat(form_data: ChatForm, user=Depends(get_verified_user)):
+async def create_new_chat(
+    request: Request, form_data: ChatForm, user=Depends(get_verified_user)
+):
     try:
+        await asyncio.to_thread(extract_inline_images, request, form_data.chat, user)
         chat = Chats.insert_new_chat(user.id, form_data)
         return ChatResponse(**chat.model_dump())
     except Exception as e:
@@ -130,8 +170,11 @@ async def create_new_chat(form_data: ChatForm, user=Depends(get_verified_user)):
 
 
 @router.post("/import", response_model=Optional[ChatResponse])
-async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)):
+async def import_chat(
+    request: Request, form_data: ChatImportForm, user=Depends(get_verified_user)
+):
     try:
+        await asyncio.to_thread(extract_inline_images, request, form_data.chat, user)
         chat = Chats.import_chat(user.id, form_data)
         if chat:
             tags = chat.meta.get("tags", [])
@@ -167,12 +210,9 @@ async def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit
-        )
-    ]
+    chat_list = Chats.get_chats_by_user_id_and_search_text(
+        user.id, text, skip=skip, limit=limit
+    )
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -212,11 +252,19 @@ async def get_chats_by_folder_id(folder_id: str, user=Depends(get_verified_user)
 
 
 @router.get("/pinned", response_model=list[ChatTitleIdResponse])
-async def get_user_pinned_chats(user=Depends(get_verified_user)):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id)
-    ]
+async def get_user_pinned_chats(
+    cursor: Optional[str] = None, user=Depends(get_verified_user)
+):
+    # `cursor` is `<updated_at>:<id>` of the last chat of the previous page
+    try:
+        if cursor is not None:
+            return Chats.get_pinned_chats_by_user_id(user.id, cursor=cursor, limit=60)
+        return Chats.get_pinned_chats_by_user_id(user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
 
 
 ############################
@@ -226,10 +274,10 @@ async def get_user_pinned_chats(user=Depends(get_verified_user)):
 
 @router.get("/all", response_model=list[ChatResponse])
 async def get_user_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id(user.id)
-    ]
+    chats = Chats.get_chats_by_user_id(user.id)
+    # Exports carry their images, the files may be gone when they're imported
+    await asyncio.to_thread(inline_file_images, [chat.chat for chat in chats], user.id)
+    return [ChatResponse(**chat.model_dump()) for chat in chats]
 
 
 ############################
@@ -288,6 +336,7 @@ async def get_archived_session_user_chat_list(
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
     if page is None:
@@ -304,17 +353,19 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
+    try:
+        return Chats.get_archived_chat_list_by_user_id(
             user.id,
             filter=filter,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
         )
-    ]
-
-    return chat_list
 
 
 ############################
@@ -405,10 +456,11 @@ async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}", response_model=Optional[ChatResponse])
 async def update_chat_by_id(
-    id: str, form_data: ChatForm, user=Depends(get_verified_user)
+    request: Request, id: str, form_data: ChatForm, user=Depends(get_verified_user)
 ):
     chat = Chats.get_chat_by_id_and_user_id(id, user.id)
     if chat:
+        await asyncio.to_thread(extract_inline_images, request, form_data.chat, user)
         updated_chat = {**chat.chat, **form_data.chat}
         chat = Chats.update_chat_by_id(id, updated_chat)
         return ChatResponse(**chat.model_dump())
@@ -428,7 +480,11 @@ class MessageForm(BaseModel):
 
 @router.post("/{id}/messages/{message_id}", response_model=Optional[ChatResponse])
 async def update_chat_message_by_id(
-    id: str, message_id: str, form_data: MessageForm, user=Depends(get_verified_user)
+    request: Request,
+    id: str,
+    message_id: str,
+    form_data: MessageForm,
+    user=Depends(get_verified_user),
 ):
     chat = Chats.get_chat_by_id(id)
 
@@ -444,11 +500,14 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
+    content = await asyncio.to_thread(
+        extract_inline_images, request, form_data.content, user
+    )
     chat = Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
-            "content": form_data.content,
+            "content": content,
         },
     )
 
@@ -468,7 +527,7 @@ async def update_chat_message_by_id(
                 "data": {
                     "chat_id": id,
                     "message_id": message_id,
-                    "content": form_data.content,
+                    "content": content,
                 },
             }
         )
@@ -534,6 +593,10 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
         result = Chats.delete_chat_by_id(id)
+        if result:
+            await asyncio.to_thread(
+                delete_unused_chat_images, chat.user_id, get_file_ids(chat.chat)
+            )
 
         return result
     else:
@@ -551,6 +614,10 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
         result = Chats.delete_chat_by_id_and_user_id(id, user.id)
+        if result:
+            await asyncio.to_thread(
+                delete_unused_chat_images, user.id, get_file_ids(chat.chat)
+            )
         return result
 
 
@@ -561,7 +628,7 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
 
 @router.get("/{id}/pinned", response_model=Optional[bool])
 async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         return chat.pinned
     else:
@@ -577,7 +644,7 @@ async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/pin", response_model=Optional[ChatResponse])
 async def pin_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         chat = Chats.toggle_chat_pinned_by_id(id)
         return chat
@@ -623,7 +690,9 @@ async def clone_chat_by_id(
 
 
 @router.post("/{id}/clone/shared", response_model=Optional[ChatResponse])
-async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
+async def clone_shared_chat_by_id(
+    request: Request, id: str, user=Depends(get_verified_user)
+):
 
     if user.role == "admin":
         chat = Chats.get_chat_by_id(id)
@@ -631,6 +700,12 @@ async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
         chat = Chats.get_chat_by_share_id(id)
 
     if chat:
+        # Shared copies belong to `shared-<chat id>`, their images to its owner
+        owner_id = chat.user_id
+        if owner_id.startswith("shared-"):
+            original_chat = Chats.get_chat_meta_by_id(owner_id.removeprefix("shared-"))
+            owner_id = original_chat.user_id if original_chat else None
+
         updated_chat = {
             **chat.chat,
             "originalChatId": chat.id,
@@ -638,6 +713,9 @@ async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
             "title": f"Clone of {chat.title}",
         }
 
+        # The user can't read the owner's files, the clone gets its own copies
+        await asyncio.to_thread(copy_file_images, request, updated_chat, owner_id, user)
+
         chat = Chats.insert_new_chat(user.id, ChatForm(**{"chat": updated_chat}))
         return ChatResponse(**chat.model_dump())
     else:
@@ -653,7 +731,7 @@ async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/archive", response_model=Optional[ChatResponse])
 async def archive_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         chat = Chats.toggle_chat_archive_by_id(id)
 
@@ -695,11 +773,15 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
     chat = Chats.get_chat_by_id_and_user_id(id, user.id)
 
     if chat:
+        # Whoever opens the link can't read the user's files, so the shared copy
+        # keeps its images inline
+        chat_document = await asyncio.to_thread(inline_file_images, chat.chat, user.id)
+
         if chat.share_id:
-            shared_chat = Chats.update_shared_chat_by_chat_id(chat.id)
+            shared_chat = Chats.update_shared_chat_by_chat_id(chat.id, chat_document)
             return ChatResponse(**shared_chat.model_dump())
 
-        shared_chat = Chats.insert_shared_chat_by_chat_id(chat.id)
+        shared_chat = Chats.insert_shared_chat_by_chat_id(chat.id, chat_document)
         if not shared_chat:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -721,7 +803,7 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
 
 @router.delete("/{id}/share", response_model=Optional[bool])
 async def delete_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         if not chat.share_id:
             return False
@@ -750,7 +832,7 @@ class ChatFolderIdForm(BaseModel):
 async def update_chat_folder_id_by_id(
     id: str, form_data: ChatFolderIdForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         chat = Chats.update_chat_folder_id_by_id_and_user_id(
             id, user.id, form_data.folder_id
@@ -769,7 +851,7 @@ async def update_chat_folder_id_by_id(
 
 @router.get("/{id}/tags", response_model=list[TagModel])
 async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
@@ -788,7 +870,7 @@ async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
 async def add_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         tag_id = form_data.name.replace(" ", "_").lower()
@@ -804,7 +886,7 @@ async def add_tag_by_id_and_tag_name(
                 id, user.id, form_data.name
             )
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -822,14 +904,14 @@ async def add_tag_by_id_and_tag_name(
 async def delete_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         Chats.delete_tag_by_id_and_user_id_and_tag_name(id, user.id, form_data.name)
 
         if Chats.count_chats_by_tag_name_and_user_id(form_data.name, user.id) == 0:
             Tags.delete_tag_by_name_and_user_id(form_data.name, user.id)
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -845,7 +927,7 @@ async def delete_tag_by_id_and_tag_name(
 
 @router.delete("/{id}/tags/all", response_model=Optional[bool])
 async def delete_all_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = Chats.get_chat_meta_by_id_and_user_id(id, user.id)
     if chat:
         Chats.delete_all_tags_by_id_and_user_id(id, user.id)
 
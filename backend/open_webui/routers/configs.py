@@ -105,7 +105,7 @@ async def set_tool_servers_config(
     ]
 
     request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
+        request.app.state.config.TOOL_SERVER_CONNECTIONS, refresh=True
     )
 
     return {
@@ -36,6 +36,7 @@ from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.files import is_chat_image
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -215,6 +216,9 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
     else:
         files = Files.get_files_by_user_id(user.id)
 
+    # Images extracted from chats belong to the chats, not the file list
+    files = [file for file in files if not is_chat_image(file)]
+
     if not content:
         for file in files:
             if "content" in file.data:
@@ -246,6 +250,9 @@ async def search_files(
     else:
         files = Files.get_files_by_user_id(user.id)
 
+    # Images extracted from chats belong to the chats, not the file list
+    files = [file for file in files if not is_chat_image(file)]
+
     # Get matching files
     matching_files = [
         file for file in files if fnmatch(file.filename.lower(), filename.lower())
@@ -298,7 +305,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
 
 @router.get("/{id}", response_model=Optional[FileModel])
 async def get_file_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -326,7 +333,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.get("/{id}/data/content")
 async def get_file_data_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -360,7 +367,7 @@ class ContentForm(BaseModel):
 async def update_file_data_content_by_id(
     request: Request, id: str, form_data: ContentForm, user=Depends(get_verified_user)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -401,7 +408,7 @@ async def update_file_data_content_by_id(
 async def get_file_content_by_id(
     id: str, user=Depends(get_verified_user), attachment: bool = Query(False)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -469,7 +476,7 @@ async def get_file_content_by_id(
 
 @router.get("/{id}/content/html")
 async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -518,7 +525,7 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.get("/{id}/content/{file_name}")
 async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
@@ -580,7 +587,7 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.delete("/{id}")
 async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.aget_file_by_id(id)
 
     if not file:
         raise HTTPException(
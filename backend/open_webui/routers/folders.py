@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import shutil
@@ -26,6 +27,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.files import delete_unused_chat_images
 
 
 log = logging.getLogger(__name__)
@@ -248,6 +250,8 @@ async def delete_folder_by_id(
         try:
             result = Folders.delete_folder_by_id_and_user_id(id, user.id)
             if result:
+                # Drop the images of the chats deleted with the folder
+                await asyncio.to_thread(delete_unused_chat_images, user.id)
                 return result
             else:
                 raise Exception("Error deleting folder")
@@ -16,7 +16,9 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
     get_function_module_from_cache,
+    bump_function_version,
 )
+from open_webui.utils.models import bump_models_version
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -139,7 +141,10 @@ class SyncFunctionsForm(FunctionForm):
 async def sync_functions(
     request: Request, form_data: SyncFunctionsForm, user=Depends(get_admin_user)
 ):
-    return Functions.sync_functions(user.id, form_data.functions)
+    functions = Functions.sync_functions(user.id, form_data.functions)
+    bump_function_version()
+    bump_models_version()
+    return functions
 
 
 ############################
@@ -173,6 +178,8 @@ async def create_new_function(
             FUNCTIONS[form_data.id] = function_module
 
             function = Functions.insert_new_function(user.id, function_type, form_data)
+            bump_function_version(form_data.id)
+            bump_models_version()
 
             function_cache_dir = CACHE_DIR / "functions" / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -227,6 +234,8 @@ async def toggle_function_by_id(id: str, user=Depends(get_admin_user)):
         function = Functions.update_function_by_id(
             id, {"is_active": not function.is_active}
         )
+        bump_function_version(id)
+        bump_models_version()
 
         if function:
             return function
@@ -254,6 +263,8 @@ async def toggle_global_by_id(id: str, user=Depends(get_admin_user)):
         function = Functions.update_function_by_id(
             id, {"is_global": not function.is_global}
         )
+        bump_function_version(id)
+        bump_models_version()
 
         if function:
             return function
@@ -292,6 +303,8 @@ async def update_function_by_id(
         log.debug(updated)
 
         function = Functions.update_function_by_id(id, updated)
+        bump_function_version(id)
+        bump_models_version()
 
         if function:
             return function
@@ -320,6 +333,8 @@ async def delete_function_by_id(
     result = Functions.delete_function_by_id(id)
 
     if result:
+        bump_function_version(id)
+        bump_models_version()
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
@@ -399,6 +414,8 @@ async def update_function_valves_by_id(
                 form_data = {k: v for k, v in form_data.items() if v is not None}
                 valves = Valves(**form_data)
                 Functions.update_function_valves_by_id(id, valves.model_dump())
+                bump_function_version(id)
+                bump_models_version()
                 return valves.model_dump()
             except Exception as e:
                 log.exception(f"Error updating function values by id {id}: {e}")
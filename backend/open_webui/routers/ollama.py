@@ -48,6 +48,8 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_registry import MODEL_REGISTRY
+from open_webui.utils.resolver import get_metadata_resolver
 
 
 from open_webui.config import (
@@ -103,6 +105,13 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
+async def send_get_models_request(url, key=None, user: UserModel = None):
+    # Served from the model registry, refreshed in the background once stale
+    return await MODEL_REGISTRY.get(
+        lambda: send_get_request(url, key, user=user), url, key=key, user=user
+    )
+
+
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
@@ -327,7 +336,9 @@ async def get_all_models(request: Request, user: UserModel = None):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(
+                    send_get_models_request(f"{url}/api/tags", user=user)
+                )
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -341,7 +352,7 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        send_get_models_request(f"{url}/api/tags", key, user=user)
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
@@ -392,7 +403,12 @@ async def get_all_models(request: Request, user: UserModel = None):
         }
 
         try:
-            loaded_models = await get_ollama_loaded_models(request, user=user)
+            loaded_models = await MODEL_REGISTRY.get(
+                lambda: get_ollama_loaded_models(request, user=user),
+                "ollama:/api/ps",
+                key=json.dumps(request.app.state.config.OLLAMA_BASE_URLS),
+                user=user,
+            )
             expires_map = {
                 m["name"]: m["expires_at"]
                 for m in loaded_models["models"]
@@ -826,6 +842,8 @@ async def copy_model(
         )
         r.raise_for_status()
 
+        await MODEL_REGISTRY.invalidate(f"{url}/api/tags", key, user=user)
+
         log.debug(f"r.text: {r.text}")
         return True
     except Exception as e:
@@ -891,6 +909,8 @@ async def delete_model(
         )
         r.raise_for_status()
 
+        await MODEL_REGISTRY.invalidate(f"{url}/api/tags", key, user=user)
+
         log.debug(f"r.text: {r.text}")
         return True
     except Exception as e:
@@ -1274,7 +1294,7 @@ async def generate_chat_completion(
         del payload["metadata"]
 
     model_id = payload["model"]
-    model_info = Models.get_model_by_id(model_id)
+    model_info = get_metadata_resolver(request).get_model(model_id)
 
     if model_info:
         if model_info.base_model_id:
@@ -1386,7 +1406,7 @@ async def generate_openai_completion(
     if ":" not in model_id:
         model_id = f"{model_id}:latest"
 
-    model_info = Models.get_model_by_id(model_id)
+    model_info = get_metadata_resolver(request).get_model(model_id)
     if model_info:
         if model_info.base_model_id:
             payload["model"] = model_info.base_model_id
@@ -1464,7 +1484,7 @@ async def generate_openai_chat_completion(
     if ":" not in model_id:
         model_id = f"{model_id}:latest"
 
-    model_info = Models.get_model_by_id(model_id)
+    model_info = get_metadata_resolver(request).get_model(model_id)
     if model_info:
         if model_info.base_model_id:
             payload["model"] = model_info.base_model_id
@@ -43,6 +43,8 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_registry import MODEL_REGISTRY
+from open_webui.utils.resolver import get_metadata_resolver
 
 
 log = logging.getLogger(__name__)
@@ -85,6 +87,13 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
+async def send_get_models_request(url, key=None, user: UserModel = None):
+    # Served from the model registry, refreshed in the background once stale
+    return await MODEL_REGISTRY.get(
+        lambda: send_get_request(url, key, user=user), url, key=key, user=user
+    )
+
+
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
@@ -295,7 +304,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
+                send_get_models_request(
                     f"{url}/models",
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
@@ -315,7 +324,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
+                        send_get_models_request(
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
@@ -708,7 +717,7 @@ async def generate_chat_completion(
     metadata = payload.pop("metadata", None)
 
     model_id = form_data.get("model")
-    model_info = Models.get_model_by_id(model_id)
+    model_info = get_metadata_resolver(request).get_model(model_id)
 
     # Check model info and override the payload
     if model_info:
@@ -73,6 +73,7 @@ from open_webui.retrieval.utils import (
     query_collection,
     query_collection_with_hybrid_search,
     query_doc,
+    get_doc,
     query_doc_with_hybrid_search,
 )
 from open_webui.utils.misc import (
@@ -1924,7 +1925,7 @@ def query_doc_handler(
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[form_data.collection_name] = get_doc(
                 collection_name=form_data.collection_name
             )
             return query_doc_with_hybrid_search(
@@ -39,14 +39,11 @@ router = APIRouter()
 @router.get("/", response_model=list[ToolUserResponse])
 async def get_tools(request: Request, user=Depends(get_verified_user)):
 
-    if not request.app.state.TOOL_SERVERS:
-        # If the tool servers are not set, we need to set them
-        # This is done only once when the server starts
-        # This is done to avoid loading the tool servers every time
-
-        request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-            request.app.state.config.TOOL_SERVER_CONNECTIONS
-        )
+    # Compiled specs are cached per server and revalidated in the background,
+    # so this only waits on servers that have never been fetched
+    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
+        request.app.state.config.TOOL_SERVER_CONNECTIONS
+    )
 
     tools = Tools.get_tools()
     for server in request.app.state.TOOL_SERVERS:
@@ -223,6 +220,7 @@ async def create_new_tools(
 
             TOOLS = request.app.state.TOOLS
             TOOLS[form_data.id] = tool_module
+            request.app.state.TOOL_CONTENTS[form_data.id] = form_data.content
 
             specs = get_tool_specs(TOOLS[form_data.id])
             tools = Tools.insert_new_tool(user.id, form_data, specs)
@@ -310,6 +308,7 @@ async def update_tools_by_id(
 
         TOOLS = request.app.state.TOOLS
         TOOLS[id] = tool_module
+        request.app.state.TOOL_CONTENTS[id] = form_data.content
 
         specs = get_tool_specs(TOOLS[id])
 
@@ -367,6 +366,8 @@ async def delete_tools_by_id(
         TOOLS = request.app.state.TOOLS
         if id in TOOLS:
             del TOOLS[id]
+        request.app.state.TOOL_CONTENTS.pop(id, None)
+        request.app.state.TOOL_SPECS.pop(id, None)
 
     return result
 
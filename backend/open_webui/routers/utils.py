@@ -14,7 +14,7 @@ from open_webui.utils.misc import get_gravatar_url
 from open_webui.utils.pdf_generator import PDFGenerator
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.code_interpreter import execute_code_jupyter
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import DATABASE_ENABLE_SQLITE_WAL, SRC_LOG_LEVELS
 
 
 log = logging.getLogger(__name__)
@@ -119,6 +119,12 @@ async def download_db(user=Depends(get_admin_user)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ERROR_MESSAGES.DB_NOT_SQLITE,
         )
+
+    if DATABASE_ENABLE_SQLITE_WAL:
+        # Move the committed pages out of the WAL file into the database file
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(FULL)")
+
     return FileResponse(
         engine.url.database,
         media_type="application/octet-stream",
@@ -2,12 +2,12 @@ import asyncio
 import socketio
 import logging
 import sys
-import time
 from redis import asyncio as aioredis
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
+from open_webui.utils import json_codec
 from open_webui.utils.redis import (
     get_sentinels_from_env,
     get_sentinel_url_from_env,
@@ -20,9 +20,17 @@ from open_webui.env import (
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_SESSION_TTL,
+    WEBSOCKET_PRESENCE_INTERVAL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock
+from open_webui.socket.utils import (
+    Presence,
+    RedisLock,
+    RedisPresence,
+    RedisUsagePool,
+    UsagePool,
+)
 
 from open_webui.env import (
     GLOBAL_LOG_LEVEL,
@@ -50,6 +58,7 @@ if WEBSOCKET_MANAGER == "redis":
         transports=(["websocket"] if ENABLE_WEBSOCKET_SUPPORT else ["polling"]),
         allow_upgrades=ENABLE_WEBSOCKET_SUPPORT,
         always_connect=True,
+        json=json_codec,
         client_manager=mgr,
     )
 else:
@@ -59,6 +68,7 @@ else:
         transports=(["websocket"] if ENABLE_WEBSOCKET_SUPPORT else ["polling"]),
         allow_upgrades=ENABLE_WEBSOCKET_SUPPORT,
         always_connect=True,
+        json=json_codec,
     )
 
 
@@ -72,17 +82,13 @@ if WEBSOCKET_MANAGER == "redis":
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
-    SESSION_POOL = RedisDict(
-        "open-webui:session_pool",
+    SESSION_POOL = RedisPresence(
+        "open-webui:presence",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
+        session_ttl=WEBSOCKET_SESSION_TTL,
     )
-    USER_POOL = RedisDict(
-        "open-webui:user_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-    )
-    USAGE_POOL = RedisDict(
+    USAGE_POOL = RedisUsagePool(
         "open-webui:usage_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
@@ -98,9 +104,8 @@ if WEBSOCKET_MANAGER == "redis":
     renew_func = clean_up_lock.renew_lock
     release_func = clean_up_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = Presence()
+    USAGE_POOL = UsagePool()
     aquire_func = release_func = renew_func = lambda: True
 
 
@@ -115,34 +120,75 @@ async def periodic_usage_pool_cleanup():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
+            # Drop the sessions that stopped sending heartbeats
+            if await USAGE_POOL.expire(TIMEOUT_DURATION):
+                # Emit updated usage information only when it changed
+                await sio.emit("usage", {"models": await get_models_in_use()})
 
-                for sid in expired_sids:
-                    del connections[sid]
+            await asyncio.sleep(TIMEOUT_DURATION)
+    finally:
+        release_func()
 
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
 
-                send_usage = True
+async def periodic_session_pool_refresh():
+    # Keep the sessions of this worker alive, others expire once their worker is gone
+    while True:
+        await asyncio.sleep(WEBSOCKET_SESSION_TTL / 3)
+        try:
+            for user_id in await SESSION_POOL.refresh():
+                queue_presence_change(user_id)
+        except Exception as e:
+            log.warning(f"Failed to refresh the session pool: {e}")
 
-            if send_usage:
-                # Emit updated usage information after cleaning
-                await sio.emit("usage", {"models": get_models_in_use()})
 
-            await asyncio.sleep(TIMEOUT_DURATION)
+# Users whose presence changed, waiting to be broadcast by this worker
+PRESENCE_CHANGES: set[str] = set()
+presence_broadcast_task = None
+
+
+def queue_presence_change(user_id: str):
+    """
+    Queue a user coming online or going offline. Changes are coalesced and
+    broadcast as a single delta every WEBSOCKET_PRESENCE_INTERVAL seconds,
+    so connection churn doesn't fan the whole user list out to every client.
+    """
+    global presence_broadcast_task
+
+    PRESENCE_CHANGES.add(user_id)
+
+    if presence_broadcast_task is None:
+        presence_broadcast_task = asyncio.create_task(broadcast_presence_changes())
+
+
+async def broadcast_presence_changes():
+    global presence_broadcast_task
+
+    try:
+        await asyncio.sleep(WEBSOCKET_PRESENCE_INTERVAL)
     finally:
-        release_func()
+        presence_broadcast_task = None
+
+    user_ids = list(PRESENCE_CHANGES)
+    PRESENCE_CHANGES.clear()
+
+    if user_ids:
+        # Workers broadcast on their own schedule, so a change queued here may
+        # already be outdated by another worker. Send the current state instead.
+        online = await asyncio.gather(
+            *(SESSION_POOL.is_online(user_id) for user_id in user_ids)
+        )
+        await sio.emit(
+            "user-presence",
+            {
+                "joined": [user_id for user_id, on in zip(user_ids, online) if on],
+                "left": [user_id for user_id, on in zip(user_ids, online) if not on],
+            },
+        )
+
+
+async def emit_user_list(sid):
+    # Snapshot of the online users, sent to a single session only
+    await sio.emit("user-list", {"user_ids": await SESSION_POOL.get_user_ids()}, to=sid)
 
 
 app = socketio.ASGIApp(
@@ -151,27 +197,21 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.get_models_in_use()
     return models_in_use
 
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
+    if await SESSION_POOL.get_session(sid):
         model_id = data["model"]
-        # Record the timestamp for the last update
-        current_time = int(time.time())
 
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
-
-        # Broadcast the usage data to all clients
-        await sio.emit("usage", {"models": get_models_in_use()})
+        # Record the timestamp for the last update
+        if await USAGE_POOL.heartbeat(model_id, sid):
+            # Broadcast the usage data to all clients, only when it changed
+            await sio.emit("usage", {"models": await get_models_in_use()})
 
 
 @sio.event
@@ -181,18 +221,15 @@ async def connect(sid, environ, auth):
         data = decode_token(auth["token"])
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await Users.aget_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            if await SESSION_POOL.add_session(sid, user.model_dump()):
+                queue_presence_change(user.id)
 
             # print(f"user {user.name}({user.id}) connected with session ID {sid}")
-            await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
-            await sio.emit("usage", {"models": get_models_in_use()})
+            await emit_user_list(sid)
+            await sio.emit("usage", {"models": await get_models_in_use()}, to=sid)
 
 
 @sio.on("user-join")
@@ -206,15 +243,12 @@ async def user_join(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await Users.aget_user_by_id(data["id"])
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump()
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    if await SESSION_POOL.add_session(sid, user.model_dump()):
+        queue_presence_change(user.id)
 
     # Join all the channels
     channels = Channels.get_channels_by_user_id(user.id)
@@ -224,7 +258,7 @@ async def user_join(sid, data):
 
     # print(f"user {user.name}({user.id}) connected with session ID {sid}")
 
-    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    await emit_user_list(sid)
     return {"id": user.id, "name": user.name}
 
 
@@ -238,7 +272,7 @@ async def join_channel(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await Users.aget_user_by_id(data["id"])
     if not user:
         return
 
@@ -265,13 +299,14 @@ async def channel_events(sid, data):
     event_type = event_data["type"]
 
     if event_type == "typing":
+        user = await SESSION_POOL.get_session(sid)
         await sio.emit(
             "channel-events",
             {
                 "channel_id": data["channel_id"],
                 "message_id": data.get("message_id", None),
                 "data": event_data,
-                "user": UserNameResponse(**SESSION_POOL[sid]).model_dump(),
+                "user": UserNameResponse(**user).model_dump(),
             },
             room=room,
         )
@@ -279,23 +314,19 @@ async def channel_events(sid, data):
 
 @sio.on("user-list")
 async def user_list(sid):
-    if sid in SESSION_POOL:
-        await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    if await SESSION_POOL.get_session(sid):
+        # Also returned as the acknowledgement for clients asking for a snapshot
+        user_ids = await SESSION_POOL.get_user_ids()
+        await sio.emit("user-list", {"user_ids": user_ids}, to=sid)
+        return {"user_ids": user_ids}
 
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
-
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
-
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
-
-        await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    user, offline = await SESSION_POOL.remove_session(sid)
+    if user:
+        if offline:
+            queue_presence_change(user["id"])
     else:
         pass
         # print(f"Unknown session ID {sid} disconnected")
@@ -307,7 +338,7 @@ def get_event_emitter(request_info, update_db=True):
 
         session_ids = list(
             set(
-                USER_POOL.get(user_id, [])
+                await SESSION_POOL.get_session_ids(user_id)
                 + (
                     [request_info.get("session_id")]
                     if request_info.get("session_id")
@@ -333,14 +364,14 @@ def get_event_emitter(request_info, update_db=True):
 
         if update_db:
             if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
+                await Chats.aadd_message_status_to_chat_by_id_and_message_id(
                     request_info["chat_id"],
                     request_info["message_id"],
                     event_data.get("data", {}),
                 )
 
             if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
+                message = await Chats.aget_message_by_id_and_message_id(
                     request_info["chat_id"],
                     request_info["message_id"],
                 )
@@ -349,7 +380,7 @@ def get_event_emitter(request_info, update_db=True):
                     content = message.get("content", "")
                     content += event_data.get("data", {}).get("content", "")
 
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.aupsert_message_to_chat_by_id_and_message_id(
                         request_info["chat_id"],
                         request_info["message_id"],
                         {
@@ -360,7 +391,7 @@ def get_event_emitter(request_info, update_db=True):
             if "type" in event_data and event_data["type"] == "replace":
                 content = event_data.get("data", {}).get("content", "")
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await Chats.aupsert_message_to_chat_by_id_and_message_id(
                     request_info["chat_id"],
                     request_info["message_id"],
                     {
@@ -390,28 +421,27 @@ def get_event_call(request_info):
 get_event_caller = get_event_call
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get_session(sid)
     if user:
         return user["id"]
     return None
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = sio.manager.get_participants(
         namespace="/",
         room=room,
     )
 
+    active_sessions = await SESSION_POOL.get_sessions(
+        [session_id[0] for session_id in active_session_ids]
+    )
     active_user_ids = list(
-        set(
-            [SESSION_POOL.get(session_id[0])["id"] for session_id in active_session_ids]
-        )
+        set([session["id"] for session in active_sessions if session is not None])
     )
     return active_user_ids
 
 
-def get_active_status_by_user_id(user_id):
-    if user_id in USER_POOL:
-        return True
-    return False
+async def get_active_status_by_user_id(user_id):
+    return await SESSION_POOL.is_online(user_id)
@@ -1,6 +1,10 @@
-import json
+import heapq
+import time
 import uuid
-from open_webui.utils.redis import get_redis_connection
+from typing import Optional
+
+from open_webui.utils import json_codec
+from open_webui.utils.redis import get_redis_connection, get_async_redis_connection
 
 
 class RedisLock:
@@ -40,14 +44,14 @@ class RedisDict:
         )
 
     def __setitem__(self, key, value):
-        serialized_value = json.dumps(value)
+        serialized_value = json_codec.dumps(value)
         self.redis.hset(self.name, key, serialized_value)
 
     def __getitem__(self, key):
         value = self.redis.hget(self.name, key)
         if value is None:
             raise KeyError(key)
-        return json.loads(value)
+        return json_codec.loads(value)
 
     def __delitem__(self, key):
         result = self.redis.hdel(self.name, key)
@@ -64,10 +68,12 @@ class RedisDict:
         return self.redis.hkeys(self.name)
 
     def values(self):
-        return [json.loads(v) for v in self.redis.hvals(self.name)]
+        return [json_codec.loads(v) for v in self.redis.hvals(self.name)]
 
     def items(self):
-        return [(k, json.loads(v)) for k, v in self.redis.hgetall(self.name).items()]
+        return [
+            (k, json_codec.loads(v)) for k, v in self.redis.hgetall(self.name).items()
+        ]
 
     def get(self, key, default=None):
         try:
@@ -89,3 +95,350 @@ class RedisDict:
         if key not in self:
             self[key] = default
         return self[key]
+
+
+class Presence:
+    """
+    In-memory store of the connected websocket sessions and the users they
+    belong to, used when websockets aren't managed through Redis.
+    """
+
+    def __init__(self):
+        self.sessions: dict[str, dict] = {}
+        self.users: dict[str, set[str]] = {}
+
+    async def add_session(self, sid: str, user: dict) -> bool:
+        """
+        Register a session, returns True if its user just came online.
+        """
+        self.sessions[sid] = user
+        session_ids = self.users.setdefault(user["id"], set())
+        online = not session_ids
+        session_ids.add(sid)
+        return online
+
+    async def remove_session(self, sid: str) -> tuple[Optional[dict], bool]:
+        """
+        Unregister a session, returns its user and whether the user went offline.
+        """
+        user = self.sessions.pop(sid, None)
+        if user is None:
+            return None, False
+
+        session_ids = self.users.get(user["id"], set())
+        session_ids.discard(sid)
+        if session_ids:
+            return user, False
+
+        self.users.pop(user["id"], None)
+        return user, True
+
+    async def get_session(self, sid: str) -> Optional[dict]:
+        return self.sessions.get(sid)
+
+    async def get_sessions(self, sids: list[str]) -> list[Optional[dict]]:
+        return [self.sessions.get(sid) for sid in sids]
+
+    async def get_session_ids(self, user_id: str) -> list[str]:
+        return list(self.users.get(user_id, []))
+
+    async def get_user_ids(self) -> list[str]:
+        return list(self.users.keys())
+
+    async def is_online(self, user_id: str) -> bool:
+        return user_id in self.users
+
+    async def refresh(self) -> list[str]:
+        return []
+
+
+# KEYS: session, user sessions, online users
+# ARGV: sid, user (json), user id, ttl, now
+ADD_SESSION_SCRIPT = """
+local expires_at = redis.call('ZSCORE', KEYS[3], ARGV[3])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('ZADD', KEYS[3], tonumber(ARGV[5]) + tonumber(ARGV[4]), ARGV[3])
+if expires_at and tonumber(expires_at) > tonumber(ARGV[5]) then
+    return 0
+end
+return 1
+"""
+
+# KEYS: session, user sessions, online users
+# ARGV: sid, user id, now, session key prefix
+REMOVE_SESSION_SCRIPT = """
+local user = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[1])
+
+-- Drop sessions that expired without disconnecting (e.g. their worker died)
+for _, sid in ipairs(redis.call('SMEMBERS', KEYS[2])) do
+    if redis.call('EXISTS', ARGV[4] .. sid) == 0 then
+        redis.call('SREM', KEYS[2], sid)
+    end
+end
+
+local offline = 0
+if redis.call('SCARD', KEYS[2]) == 0 then
+    local expires_at = redis.call('ZSCORE', KEYS[3], ARGV[2])
+    redis.call('ZREM', KEYS[3], ARGV[2])
+    if expires_at and tonumber(expires_at) > tonumber(ARGV[3]) then
+        offline = 1
+    end
+end
+return {user or '', offline}
+"""
+
+
+class RedisPresence:
+    """
+    Presence store shared by every worker through Redis, using the asyncio
+    client so socket handlers never block the event loop.
+
+    Each session is a key expiring after `session_ttl`, each user has a set
+    of its session ids and online users are kept in a sorted set scored by
+    their expiry. Membership changes run as Lua scripts so concurrent
+    connects and disconnects across workers can't corrupt them. Workers
+    keep their own sessions alive with `refresh`, so sessions of a worker
+    that died expire on their own.
+    """
+
+    def __init__(self, name, redis_url, redis_sentinels=[], session_ttl: int = 60):
+        self.name = name
+        self.session_ttl = session_ttl
+        self.redis = get_async_redis_connection(
+            redis_url, redis_sentinels, decode_responses=True
+        )
+
+        # Sessions connected to this worker (sid -> user id)
+        self.local_sessions: dict[str, str] = {}
+
+        self._add_session = self.redis.register_script(ADD_SESSION_SCRIPT)
+        self._remove_session = self.redis.register_script(REMOVE_SESSION_SCRIPT)
+
+    def _session_key(self, sid: str) -> str:
+        return f"{self.name}:session:{sid}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.name}:user:{user_id}"
+
+    @property
+    def _users_key(self) -> str:
+        return f"{self.name}:users"
+
+    async def add_session(self, sid: str, user: dict) -> bool:
+        """
+        Register a session, returns True if its user just came online.
+        """
+        self.local_sessions[sid] = user["id"]
+        return bool(
+            await self._add_session(
+                keys=[
+                    self._session_key(sid),
+                    self._user_key(user["id"]),
+                    self._users_key,
+                ],
+                args=[
+                    sid,
+                    json_codec.dumps(user),
+                    user["id"],
+                    self.session_ttl,
+                    time.time(),
+                ],
+            )
+        )
+
+    async def remove_session(self, sid: str) -> tuple[Optional[dict], bool]:
+        """
+        Unregister a session, returns its user and whether the user went offline.
+        """
+        user_id = self.local_sessions.pop(sid, None)
+        if user_id is None:
+            user = await self.get_session(sid)
+            if user is None:
+                return None, False
+            user_id = user["id"]
+
+        user, offline = await self._remove_session(
+            keys=[
+                self._session_key(sid),
+                self._user_key(user_id),
+                self._users_key,
+            ],
+            args=[sid, user_id, time.time(), self._session_key("")],
+        )
+        return (json_codec.loads(user) if user else None), bool(offline)
+
+    async def get_session(self, sid: str) -> Optional[dict]:
+        user = await self.redis.get(self._session_key(sid))
+        return json_codec.loads(user) if user else None
+
+    async def get_sessions(self, sids: list[str]) -> list[Optional[dict]]:
+        if not sids:
+            return []
+
+        users = await self.redis.mget([self._session_key(sid) for sid in sids])
+        return [json_codec.loads(user) if user else None for user in users]
+
+    async def get_session_ids(self, user_id: str) -> list[str]:
+        return list(await self.redis.smembers(self._user_key(user_id)))
+
+    async def get_user_ids(self) -> list[str]:
+        return await self.redis.zrangebyscore(self._users_key, time.time(), "+inf")
+
+    async def is_online(self, user_id: str) -> bool:
+        expires_at = await self.redis.zscore(self._users_key, user_id)
+        return expires_at is not None and expires_at > time.time()
+
+    async def refresh(self) -> list[str]:
+        """
+        Extend the expiry of the sessions connected to this worker and drop
+        users whose sessions all expired. Returns the ids of those users.
+        """
+        now = time.time()
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for sid, user_id in list(self.local_sessions.items()):
+                pipe.expire(self._session_key(sid), self.session_ttl)
+                pipe.expire(self._user_key(user_id), self.session_ttl)
+                pipe.zadd(self._users_key, {user_id: now + self.session_ttl})
+            pipe.zrangebyscore(self._users_key, "-inf", now)
+            pipe.zremrangebyscore(self._users_key, "-inf", now)
+            results = await pipe.execute()
+
+        return results[-2]
+
+
+class UsagePool:
+    """
+    In-memory record of the models in use, fed by the heartbeats each
+    session sends while it generates. Heartbeats are kept in a heap ordered
+    by time so expiring them only looks at the expired ones.
+    """
+
+    def __init__(self):
+        self.heartbeats: dict[tuple[str, str], float] = {}
+        self.models: dict[str, int] = {}
+        self._heap: list[tuple[float, str, str]] = []
+
+    async def heartbeat(self, model_id: str, sid: str) -> bool:
+        """
+        Record a heartbeat, returns True if the model just started being used.
+        """
+        now = time.time()
+        new = (model_id, sid) not in self.heartbeats
+        self.heartbeats[(model_id, sid)] = now
+        heapq.heappush(self._heap, (now, model_id, sid))
+
+        if not new:
+            return False
+
+        self.models[model_id] = self.models.get(model_id, 0) + 1
+        return self.models[model_id] == 1
+
+    async def expire(self, timeout: float) -> bool:
+        """
+        Drop heartbeats older than `timeout` seconds, returns True if the
+        models in use changed.
+        """
+        cutoff = time.time() - timeout
+        changed = False
+
+        while self._heap and self._heap[0][0] < cutoff:
+            updated_at, model_id, sid = heapq.heappop(self._heap)
+            # Skip entries superseded by a later heartbeat
+            if self.heartbeats.get((model_id, sid)) != updated_at:
+                continue
+
+            del self.heartbeats[(model_id, sid)]
+            self.models[model_id] -= 1
+            if self.models[model_id] <= 0:
+                del self.models[model_id]
+                changed = True
+
+        return changed
+
+    async def get_models_in_use(self) -> list[str]:
+        return list(self.models.keys())
+
+
+# KEYS: heartbeats, models in use
+# ARGV: member (sid:model id), now, model id
+USAGE_HEARTBEAT_SCRIPT = """
+if redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1]) == 1 then
+    if redis.call('HINCRBY', KEYS[2], ARGV[3], 1) == 1 then
+        return 1
+    end
+end
+return 0
+"""
+
+# KEYS: heartbeats, models in use
+# ARGV: cutoff
+USAGE_EXPIRE_SCRIPT = """
+local changed = 0
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])) do
+    redis.call('ZREM', KEYS[1], member)
+    local model_id = string.match(member, '^[^:]*:(.*)$')
+    if redis.call('HINCRBY', KEYS[2], model_id, -1) <= 0 then
+        redis.call('HDEL', KEYS[2], model_id)
+        changed = 1
+    end
+end
+return changed
+"""
+
+
+class RedisUsagePool:
+    """
+    Models in use shared by every worker through Redis. Heartbeats live in
+    a sorted set scored by their time, so expiring them is a range query
+    whose cost depends on the number of expirations only, and the number of
+    sessions using each model is kept in a hash updated by the same scripts.
+    """
+
+    def __init__(self, name, redis_url, redis_sentinels=[]):
+        self.name = name
+        self.redis = get_async_redis_connection(
+            redis_url, redis_sentinels, decode_responses=True
+        )
+
+        self._heartbeat = self.redis.register_script(USAGE_HEARTBEAT_SCRIPT)
+        self._expire = self.redis.register_script(USAGE_EXPIRE_SCRIPT)
+
+    @property
+    def _heartbeats_key(self) -> str:
+        return f"{self.name}:heartbeats"
+
+    @property
+    def _models_key(self) -> str:
+        return f"{self.name}:models"
+
+    async def heartbeat(self, model_id: str, sid: str) -> bool:
+        """
+        Record a heartbeat, returns True if the model just started being used.
+        """
+        return bool(
+            await self._heartbeat(
+                keys=[self._heartbeats_key, self._models_key],
+                # Session ids never contain ":", model ids might
+                args=[f"{sid}:{model_id}", time.time(), model_id],
+            )
+        )
+
+    async def expire(self, timeout: float) -> bool:
+        """
+        Drop heartbeats older than `timeout` seconds, returns True if the
+        models in use changed.
+        """
+        return bool(
+            await self._expire(
+                keys=[self._heartbeats_key, self._models_key],
+                args=[time.time() - timeout],
+            )
+        )
+
+    async def get_models_in_use(self) -> list[str]:
+        return await self.redis.hkeys(self._models_key)
@@ -0,0 +1,112 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from open_webui.internal import db
+from open_webui.internal.db import ZSTD_KEY, CompressedJSON
+
+pytestmark = pytest.mark.skipif(
+    db.zstandard is None or not db.ENABLE_CHAT_COMPRESSION,
+    reason="chat compression is disabled",
+)
+
+THRESHOLD = 1024
+
+SMALL_CHAT = {"title": "small", "messages": [{"content": "hi"}]}
+LARGE_CHAT = {
+    "title": "large",
+    "messages": [{"content": f"message {i} " * 20} for i in range(100)],
+}
+
+
+def load_migration():
+    path = next(
+        (Path(db.__file__).parent.parent / "migrations" / "versions").glob(
+            "25eb02f503dc_*.py"
+        )
+    )
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_compressed_json_round_trip(engine):
+    table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("chat", CompressedJSON(THRESHOLD)),
+    )
+    table.create(engine)
+
+    with engine.begin() as connection:
+        connection.execute(
+            table.insert(),
+            [
+                {"id": "small", "chat": SMALL_CHAT},
+                {"id": "large", "chat": LARGE_CHAT},
+                {"id": "empty", "chat": None},
+            ],
+        )
+
+    with engine.connect() as connection:
+        raw = dict(connection.execute(sa.text("SELECT id, chat FROM chat")).all())
+        rows = dict(connection.execute(sa.select(table.c.id, table.c.chat)).all())
+
+    assert json.loads(raw["small"]) == SMALL_CHAT
+    assert list(json.loads(raw["large"])) == [ZSTD_KEY]
+    assert len(raw["large"]) < len(json.dumps(LARGE_CHAT))
+    assert rows == {"small": SMALL_CHAT, "large": LARGE_CHAT, "empty": None}
+
+
+def test_compress_migration(engine, monkeypatch):
+    migration = load_migration()
+    monkeypatch.setattr(migration, "CHAT_COMPRESSION_THRESHOLD", THRESHOLD)
+    monkeypatch.setattr(migration, "BATCH_SIZE", 2)
+
+    chats = {f"small-{i}": SMALL_CHAT for i in range(3)}
+    chats.update({f"large-{i}": LARGE_CHAT for i in range(3)})
+
+    with engine.begin() as connection:
+        connection.execute(
+            sa.text("CREATE TABLE chat (id TEXT PRIMARY KEY, chat JSON)")
+        )
+        connection.execute(
+            sa.text("INSERT INTO chat (id, chat) VALUES (:id, :chat)"),
+            [{"id": id, "chat": json.dumps(chat)} for id, chat in chats.items()],
+        )
+
+    def run(step):
+        with engine.begin() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                step()
+            return {
+                id: json.loads(chat)
+                for id, chat in connection.execute(sa.text("SELECT id, chat FROM chat"))
+            }
+
+    rows = run(migration.upgrade)
+    for id, chat in rows.items():
+        if id.startswith("large"):
+            assert list(chat) == [ZSTD_KEY]
+            assert db.decompress_json(chat) == LARGE_CHAT
+        else:
+            assert chat == SMALL_CHAT
+
+    # Upgrading again leaves the compressed rows alone
+    assert run(migration.upgrade) == rows
+
+    assert run(migration.downgrade) == chats
@@ -0,0 +1,115 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy.orm import Session
+
+from open_webui.internal import db
+from open_webui.models.chats import Chat, ChatTable, parse_chat_cursor
+
+# (id, updated_at), several chats share the same update time
+CHATS = [("a", 100), ("b", 200), ("c", 200), ("d", 200), ("e", 300), ("f", 50)]
+
+
+def load_migration():
+    path = next(
+        (Path(db.__file__).parent.parent / "migrations" / "versions").glob(
+            "9e0f3961e9a0_*.py"
+        )
+    )
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite://")
+    Chat.__table__.create(engine)
+    with Session(engine) as session:
+        for id, updated_at in CHATS:
+            session.add(
+                Chat(
+                    id=id,
+                    user_id="1",
+                    title=id,
+                    chat={},
+                    created_at=updated_at,
+                    updated_at=updated_at,
+                    archived=False,
+                    pinned=False,
+                )
+            )
+        # Another user's chats are never listed
+        session.add(Chat(id="z", user_id="2", title="z", chat={}, updated_at=250))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def list_page(session, cursor=None, limit=2) -> list[tuple[int, str]]:
+    query = session.query(Chat.updated_at, Chat.id).filter_by(user_id="1")
+    return [tuple(row) for row in ChatTable._paginate(query, cursor, limit=limit)]
+
+
+def test_paginate_by_cursor_with_ties(session):
+    pages = []
+    cursor = None
+    while page := list_page(session, cursor):
+        pages.append([id for _, id in page])
+        updated_at, id = page[-1]
+        cursor = f"{updated_at}:{id}"
+
+    # Chats updated at the same time are ordered by id, none is skipped or repeated
+    assert pages == [["e", "d"], ["c", "b"], ["a", "f"]]
+
+
+def test_paginate_by_cursor_matches_offsets(session):
+    query = session.query(Chat.updated_at, Chat.id).filter_by(user_id="1")
+    by_offset = [tuple(row) for row in ChatTable._paginate(query, skip=2, limit=3)]
+
+    assert list_page(session, "200:d", limit=3) == by_offset
+    assert by_offset == [(200, "c"), (200, "b"), (100, "a")]
+
+
+@pytest.mark.parametrize("cursor", ["200", "abc:d", ":d", "200:"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        parse_chat_cursor(cursor)
+
+
+def test_chat_list_index_migration():
+    migration = load_migration()
+    engine = sa.create_engine("sqlite://")
+    Chat.__table__.create(engine)
+
+    def index_columns():
+        return {
+            index["name"]: index["column_names"]
+            for index in sa.inspect(engine).get_indexes("chat")
+        }
+
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+    assert index_columns()[migration.INDEX_NAME] == [
+        "user_id",
+        "updated_at",
+        "id",
+        "archived",
+        "pinned",
+        "folder_id",
+        "created_at",
+    ]
+
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.downgrade()
+
+    assert migration.INDEX_NAME not in index_columns()
+    engine.dispose()
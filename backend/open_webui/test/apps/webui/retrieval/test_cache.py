@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from open_webui.retrieval import cache as retrieval_cache
+from open_webui.retrieval.cache import RetrievalCache
+from open_webui.retrieval.vector.main import VectorDBBase
+
+
+class MemoryVectorDB(VectorDBBase):
+    def __init__(self):
+        self.collections = {}
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        self.collections.setdefault(collection_name, []).extend(items)
+
+    def upsert(self, collection_name, items):
+        self.insert(collection_name, items)
+
+    def search(self, collection_name, vectors, limit, filter=None):
+        return None
+
+    def query(self, collection_name, filter, limit=None):
+        return None
+
+    def get(self, collection_name):
+        return None
+
+    def delete(self, collection_name, ids=None, filter=None):
+        self.collections.pop(collection_name, None)
+
+    def reset(self):
+        self.collections = {}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RetrievalCache(maxsize=4, ttl=60, max_bytes=1024)
+    # The vector DB wrapper bumps the versions of the module's cache
+    monkeypatch.setattr(retrieval_cache, "RETRIEVAL_CACHE", cache)
+    return cache
+
+
+def test_get_returns_a_copy(cache):
+    key = cache.get_key(["a"], ["query"], k=3)
+    cache.set(key, {"documents": [["doc"]]})
+
+    result = cache.get(key)
+    result["documents"].append(["changed"])
+    assert cache.get(key) == {"documents": [["doc"]]}
+
+
+def test_key_normalizes_queries_and_sorts_collections(cache):
+    assert cache.get_key(["a", "b"], ["a  query"], k=3) == cache.get_key(
+        ["b", "a"], [" a query "], k=3
+    )
+    assert cache.get_key(["a"], ["query"], k=3) != cache.get_key(["a"], ["query"], k=4)
+
+
+def test_evicts_least_recently_used_by_count(cache):
+    keys = [cache.get_key(["a"], [f"query {i}"]) for i in range(5)]
+    for key in keys[:4]:
+        cache.set(key, "x")
+
+    cache.get(keys[0])
+    cache.set(keys[4], "x")
+
+    assert cache.get(keys[0]) == "x"
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) == "x" for key in keys[2:])
+
+
+def test_evicts_least_recently_used_by_bytes(cache):
+    keys = [cache.get_key(["a"], [f"query {i}"]) for i in range(3)]
+    cache.set(keys[0], "x" * 400)
+    cache.set(keys[1], "x" * 400)
+    cache.set(keys[2], "x" * 400)
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache._size <= cache.max_bytes
+
+
+def test_skips_values_over_max_bytes(cache):
+    key = cache.get_key(["a"], ["query"])
+    cache.set(key, "x" * 2048)
+    assert cache.get(key) is None
+    assert cache._size == 0
+
+
+def test_expires_after_ttl(cache, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(retrieval_cache.time, "monotonic", lambda: now)
+
+    key = cache.get_key(["a"], ["query"])
+    cache.set(key, "x")
+    assert cache.get(key) == "x"
+
+    now += cache.ttl + 1
+    assert cache.get(key) is None
+    assert cache._size == 0
+
+
+def test_disabled_cache_has_no_keys():
+    cache = RetrievalCache(maxsize=0)
+    assert cache.get_key(["a"], ["query"]) is None
+    assert cache.get(None) is None
+
+
+def test_vector_db_writes_invalidate_cached_results(cache):
+    vector_db = MemoryVectorDB()
+
+    key = cache.get_key(["a"], ["query"])
+    other_key = cache.get_key(["b"], ["query"])
+    cache.set(key, "x")
+    cache.set(other_key, "y")
+
+    vector_db.insert("a", [])
+    assert cache.get_key(["a"], ["query"]) != key
+    # Other collections keep their cached results
+    assert cache.get_key(["b"], ["query"]) == other_key
+
+    key = cache.get_key(["a"], ["query"])
+    asyncio.run(vector_db.ainsert(collection_name="a", items=[]))
+    assert cache.get_key(["a"], ["query"]) != key
+
+    # A reset invalidates every collection
+    vector_db.reset()
+    assert cache.get_key(["b"], ["query"]) != other_key
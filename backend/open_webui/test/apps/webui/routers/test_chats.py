@@ -1,3 +1,5 @@
+import asyncio
+import base64
 import uuid
 
 from test.util.abstract_integration_test import AbstractPostgresTest
@@ -234,3 +236,167 @@ class TestChats(AbstractPostgresTest):
 
         chat = self.chats.get_chat_by_id(chat_id)
         assert chat.share_id is None
+
+    def test_aget_chat_by_id_and_user_id(self):
+        chat_id = self.chats.get_chats()[0].id
+
+        chat = asyncio.run(self.chats.aget_chat_by_id(chat_id))
+        assert chat == self.chats.get_chat_by_id(chat_id)
+
+        chat = asyncio.run(self.chats.aget_chat_by_id_and_user_id(chat_id, "2"))
+        assert chat.id == chat_id
+        assert asyncio.run(self.chats.aget_chat_by_id_and_user_id(chat_id, "3")) is None
+        assert asyncio.run(self.chats.aget_chat_by_id(str(uuid.uuid4()))) is None
+
+    def test_aupsert_message_and_status(self):
+        from open_webui.models.chats import ChatForm
+
+        chat_id = self.chats.insert_new_chat(
+            "2",
+            ChatForm(
+                chat={"title": "chat2", "history": {"currentId": None, "messages": {}}}
+            ),
+        ).id
+
+        chat = asyncio.run(
+            self.chats.aupsert_message_to_chat_by_id_and_message_id(
+                chat_id, "m1", {"role": "user", "content": "hello"}
+            )
+        )
+        assert chat.title == "chat2"
+        assert chat.chat["history"]["currentId"] == "m1"
+
+        asyncio.run(
+            self.chats.aadd_message_status_to_chat_by_id_and_message_id(
+                chat_id, "m1", {"action": "web_search"}
+            )
+        )
+        message = asyncio.run(
+            self.chats.aget_message_by_id_and_message_id(chat_id, "m1")
+        )
+        assert message == {
+            "role": "user",
+            "content": "hello",
+            "statusHistory": [{"action": "web_search"}],
+        }
+        assert message == self.chats.get_message_by_id_and_message_id(chat_id, "m1")
+
+    def test_share_and_clone_shared_chat_with_image(self):
+        from open_webui.models.files import Files
+
+        image = f"data:image/png;base64,{base64.b64encode(b'image').decode()}"
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(
+                self.create_url("/new"),
+                json={
+                    "chat": {
+                        "title": "chat with image",
+                        "history": {
+                            "currentId": "1",
+                            "messages": {"1": {"content": f"![image]({image})"}},
+                        },
+                    }
+                },
+            )
+        assert response.status_code == 200
+        chat = response.json()
+        content = chat["chat"]["history"]["messages"]["1"]["content"]
+        assert content.startswith("![image](/api/v1/files/")
+
+        # The shared copy keeps the image inline, the owner's file isn't readable
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(
+                self.create_url(f"/{chat['id']}/share")
+            )
+        assert response.status_code == 200
+        shared_chat = response.json()
+        messages = shared_chat["chat"]["history"]["messages"]
+        assert messages["1"]["content"] == f"![image]({image})"
+
+        # The clone gets a copy of the image as a file of its user
+        with mock_webui_user(id="3"):
+            response = self.fast_api_client.post(
+                self.create_url(f"/{shared_chat['id']}/clone/shared")
+            )
+            assert response.status_code == 200
+            content = response.json()["chat"]["history"]["messages"]["1"]["content"]
+            url = content.removeprefix("![image](").removesuffix(")")
+            file_id = url.split("/")[-2]
+            assert Files.get_file_by_id(file_id).user_id == "3"
+
+            response = self.fast_api_client.get(url)
+        assert response.status_code == 200
+        assert response.content == b"image"
+
+    def test_get_session_user_chat_list_with_malformed_cursor(self):
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.get(
+                self.create_url("/list?cursor=not-a-cursor")
+            )
+        assert response.status_code == 400
+
+    def test_delete_chats_with_images(self):
+        from open_webui.models.files import Files
+
+        def create_chat(image: bytes) -> dict:
+            data_url = f"data:image/png;base64,{base64.b64encode(image).decode()}"
+            response = self.fast_api_client.post(
+                self.create_url("/new"),
+                json={
+                    "chat": {
+                        "title": "chat with image",
+                        "history": {
+                            "currentId": "1",
+                            "messages": {"1": {"content": f"![image]({data_url})"}},
+                        },
+                    }
+                },
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        def get_file_id(chat: dict) -> str:
+            content = chat["chat"]["history"]["messages"]["1"]["content"]
+            return content.removeprefix("![image](").split("/")[-2]
+
+        with mock_webui_user(id="2"):
+            first_chat = create_chat(b"image")
+            second_chat = create_chat(b"image")
+            other_chat = create_chat(b"other image")
+            file_id = get_file_id(first_chat)
+            other_file_id = get_file_id(other_chat)
+            assert get_file_id(second_chat) == file_id
+
+            # Chat images aren't listed with the user's files
+            response = self.fast_api_client.get("/api/v1/files/")
+            assert response.status_code == 200
+            assert response.json() == []
+
+            # Exports keep the images inline
+            response = self.fast_api_client.get(self.create_url("/all"))
+            assert response.status_code == 200
+            contents = [
+                chat["chat"]["history"]["messages"]["1"]["content"]
+                for chat in response.json()
+                if chat["id"] == other_chat["id"]
+            ]
+            image = base64.b64encode(b"other image").decode()
+            assert contents == [f"![image](data:image/png;base64,{image})"]
+
+            # The image is kept as long as a chat uses it
+            response = self.fast_api_client.delete(
+                self.create_url(f"/{first_chat['id']}")
+            )
+            assert response.status_code == 200
+            assert Files.get_file_by_id(file_id) is not None
+
+            response = self.fast_api_client.delete(
+                self.create_url(f"/{second_chat['id']}")
+            )
+            assert response.status_code == 200
+            assert Files.get_file_by_id(file_id) is None
+            assert Files.get_file_by_id(other_file_id) is not None
+
+            response = self.fast_api_client.delete(self.create_url("/"))
+            assert response.status_code == 200
+            assert Files.get_file_by_id(other_file_id) is None
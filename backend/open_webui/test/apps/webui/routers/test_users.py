@@ -1,3 +1,5 @@
+import asyncio
+
 from test.util.abstract_integration_test import AbstractPostgresTest
 from test.util.mock_user import mock_webui_user
 
@@ -165,3 +167,17 @@ class TestUsers(AbstractPostgresTest):
         assert len(response.json()) == 1
         data = response.json()
         _assert_user(data, "1")
+
+    def test_aget_user_and_update_last_active(self):
+        user = asyncio.run(self.users.aget_user_by_id("1"))
+        assert user == self.users.get_user_by_id("1")
+        assert asyncio.run(self.users.aget_user_by_id("unknown")) is None
+
+        self.users.update_user_api_key_by_id("1", "sk-test")
+        user = asyncio.run(self.users.aget_user_by_api_key("sk-test"))
+        assert user.id == "1"
+
+        last_active_at = user.last_active_at
+        user = asyncio.run(self.users.aupdate_user_last_active_by_id("1"))
+        assert user.last_active_at >= last_active_at
+        assert user == self.users.get_user_by_id("1")
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+from open_webui.socket import utils as socket_utils
+from open_webui.socket.utils import Presence, RedisPresence
+
+USER = {"id": "u1", "name": "User 1"}
+OTHER_USER = {"id": "u2", "name": "User 2"}
+
+
+@pytest.fixture
+def redis_presence(monkeypatch):
+    """
+    Builds RedisPresence instances sharing one fake Redis server, each one
+    standing for a worker.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    # Lua scripts need lupa
+    pytest.importorskip("lupa")
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        socket_utils,
+        "get_async_redis_connection",
+        lambda redis_url, redis_sentinels, decode_responses=True: (
+            fakeredis.FakeAsyncRedis(server=server, decode_responses=decode_responses)
+        ),
+    )
+
+    def create(session_ttl: int = 60) -> RedisPresence:
+        return RedisPresence("test:presence", "redis://", session_ttl=session_ttl)
+
+    return create
+
+
+def test_presence_first_and_last_session():
+    async def run():
+        presence = Presence()
+        assert await presence.add_session("s1", USER) is True
+        assert await presence.add_session("s2", USER) is False
+        assert await presence.get_session_ids("u1") in (["s1", "s2"], ["s2", "s1"])
+
+        assert await presence.remove_session("s1") == (USER, False)
+        assert await presence.is_online("u1") is True
+        assert await presence.remove_session("s2") == (USER, True)
+        assert await presence.is_online("u1") is False
+        assert await presence.get_user_ids() == []
+
+    asyncio.run(run())
+
+
+def test_presence_same_session_added_twice():
+    async def run():
+        presence = Presence()
+        assert await presence.add_session("s1", USER) is True
+        assert await presence.add_session("s1", USER) is False
+        assert await presence.is_online("u1") is True
+
+        assert await presence.remove_session("s1") == (USER, True)
+        # Unknown sessions are ignored
+        assert await presence.remove_session("s1") == (None, False)
+
+    asyncio.run(run())
+
+
+def test_redis_presence_first_and_last_session(redis_presence):
+    async def run():
+        presence = redis_presence()
+        assert await presence.add_session("s1", USER) is True
+        assert await presence.add_session("s2", USER) is False
+        assert await presence.add_session("s3", OTHER_USER) is True
+        assert sorted(await presence.get_user_ids()) == ["u1", "u2"]
+        assert await presence.get_sessions(["s1", "s4"]) == [USER, None]
+
+        assert await presence.remove_session("s1") == (USER, False)
+        assert await presence.is_online("u1") is True
+        assert await presence.remove_session("s2") == (USER, True)
+        assert await presence.is_online("u1") is False
+        assert await presence.get_user_ids() == ["u2"]
+
+    asyncio.run(run())
+
+
+def test_redis_presence_same_session_added_twice(redis_presence):
+    async def run():
+        presence = redis_presence()
+        assert await presence.add_session("s1", USER) is True
+        assert await presence.add_session("s1", USER) is False
+        assert await presence.is_online("u1") is True
+
+        assert await presence.remove_session("s1") == (USER, True)
+        assert await presence.remove_session("s1") == (None, False)
+
+    asyncio.run(run())
+
+
+def test_redis_presence_session_on_another_worker(redis_presence):
+    async def run():
+        worker_a = redis_presence()
+        worker_b = redis_presence()
+        assert await worker_a.add_session("s1", USER) is True
+        assert await worker_b.add_session("s2", USER) is False
+
+        # Any worker can remove a session, e.g. after a reconnect
+        assert await worker_b.remove_session("s1") == (USER, False)
+        assert await worker_a.remove_session("s2") == (USER, True)
+
+    asyncio.run(run())
+
+
+def test_redis_presence_refresh_reports_dead_worker_users(redis_presence):
+    async def run():
+        dead_worker = redis_presence(session_ttl=1)
+        worker = redis_presence()
+        await dead_worker.add_session("s1", USER)
+        await dead_worker.add_session("s2", OTHER_USER)
+        await worker.add_session("s3", OTHER_USER)
+
+        # The dead worker stops refreshing its sessions
+        time.sleep(1.5)
+
+        assert await worker.refresh() == ["u1"]
+        assert await worker.is_online("u1") is False
+        assert await worker.is_online("u2") is True
+        assert await worker.refresh() == []
+
+        # The expired session doesn't keep its user online
+        assert await worker.remove_session("s3") == (OTHER_USER, True)
+        assert await worker.get_user_ids() == []
+
+    asyncio.run(run())
@@ -0,0 +1,32 @@
+import asyncio
+
+from open_webui.socket import main as socket_main
+from open_webui.socket.utils import Presence
+
+
+def test_broadcast_sends_current_presence(monkeypatch):
+    emitted = []
+
+    async def emit(event, data, **kwargs):
+        emitted.append((event, data))
+
+    monkeypatch.setattr(socket_main, "SESSION_POOL", Presence())
+    monkeypatch.setattr(socket_main, "WEBSOCKET_PRESENCE_INTERVAL", 0)
+    monkeypatch.setattr(socket_main.sio, "emit", emit)
+
+    async def run():
+        pool = socket_main.SESSION_POOL
+        await pool.add_session("s1", {"id": "u1"})
+        socket_main.queue_presence_change("u1")
+
+        # Queued when joining, but gone by the time the change is broadcast
+        await pool.add_session("s2", {"id": "u2"})
+        socket_main.queue_presence_change("u2")
+        await pool.remove_session("s2")
+
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+
+    assert emitted == [("user-presence", {"joined": ["u1"], "left": ["u2"]})]
+    assert socket_main.PRESENCE_CHANGES == set()
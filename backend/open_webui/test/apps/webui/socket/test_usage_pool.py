@@ -0,0 +1,96 @@
+import asyncio
+import types
+
+import pytest
+from open_webui.socket import utils as socket_utils
+from open_webui.socket.utils import RedisUsagePool, UsagePool
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        socket_utils, "time", types.SimpleNamespace(time=lambda: clock.now)
+    )
+    return clock
+
+
+@pytest.fixture(params=["memory", "redis"])
+def usage_pool(request, monkeypatch):
+    if request.param == "memory":
+        return UsagePool()
+
+    fakeredis = pytest.importorskip("fakeredis")
+    # Lua scripts need lupa
+    pytest.importorskip("lupa")
+
+    monkeypatch.setattr(
+        socket_utils,
+        "get_async_redis_connection",
+        lambda redis_url, redis_sentinels, decode_responses=True: (
+            fakeredis.FakeAsyncRedis(decode_responses=decode_responses)
+        ),
+    )
+    return RedisUsagePool("test:usage", "redis://")
+
+
+def test_usage_pool_counts_sessions_per_model(usage_pool, clock):
+    async def run():
+        assert await usage_pool.heartbeat("llama3", "s1") is True
+        assert await usage_pool.heartbeat("llama3", "s2") is False
+        assert await usage_pool.heartbeat("llama3", "s1") is False
+        assert await usage_pool.heartbeat("mistral", "s1") is True
+        assert sorted(await usage_pool.get_models_in_use()) == ["llama3", "mistral"]
+
+        # s2 and mistral stop sending heartbeats
+        clock.now += 5
+        await usage_pool.heartbeat("llama3", "s1")
+        clock.now += 10
+        assert await usage_pool.expire(12) is True
+        assert await usage_pool.get_models_in_use() == ["llama3"]
+
+        # llama3 is still used by s1
+        assert await usage_pool.expire(12) is False
+
+        clock.now += 10
+        assert await usage_pool.expire(12) is True
+        assert await usage_pool.get_models_in_use() == []
+
+    asyncio.run(run())
+
+
+def test_usage_pool_model_ids_with_colons(usage_pool, clock):
+    async def run():
+        assert await usage_pool.heartbeat("llama3:8b", "s1") is True
+        assert await usage_pool.heartbeat("ollama:llama3:8b", "s1") is True
+        assert await usage_pool.heartbeat("llama3:8b", "s2") is False
+
+        clock.now += 10
+        await usage_pool.heartbeat("llama3:8b", "s2")
+        assert await usage_pool.expire(5) is True
+        assert await usage_pool.get_models_in_use() == ["llama3:8b"]
+
+    asyncio.run(run())
+
+
+def test_usage_pool_skips_superseded_heartbeats(clock):
+    async def run():
+        usage_pool = UsagePool()
+        await usage_pool.heartbeat("llama3", "s1")
+        clock.now += 10
+        await usage_pool.heartbeat("llama3", "s1")
+
+        # The first heartbeat is left in the heap, the second one counts
+        assert len(usage_pool._heap) == 2
+        assert await usage_pool.expire(5) is False
+        assert usage_pool._heap == [(1010.0, "llama3", "s1")]
+        assert usage_pool.heartbeats == {("llama3", "s1"): 1010.0}
+        assert usage_pool.models == {"llama3": 1}
+
+        clock.now += 10
+        assert await usage_pool.expire(5) is True
+        assert usage_pool._heap == []
+        assert usage_pool.heartbeats == {}
+        assert usage_pool.models == {}
+
+    asyncio.run(run())
@@ -0,0 +1,62 @@
+import pytest
+from open_webui.utils.files import (
+    FILE_CONTENT_PATH_PATTERN,
+    get_file_id_from_url,
+    get_file_ids,
+    map_strings,
+)
+
+FILE_ID = "0b6c5f0e-1c2d-5e6f-8a9b-0c1d2e3f4a5b"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"/api/v1/files/{FILE_ID}/content",
+        f"/api/v1/files/{FILE_ID}/content?attachment=true",
+        f"http://localhost:8080/api/v1/files/{FILE_ID}/content",
+    ],
+)
+def test_get_file_id_from_url(url):
+    assert get_file_id_from_url(url, "http://localhost:8080/") == FILE_ID
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"https://example.com/api/v1/files/{FILE_ID}/content",
+        f"http://localhost:8080.example.com/api/v1/files/{FILE_ID}/content",
+        f"https://example.com/?next=/api/v1/files/{FILE_ID}/content",
+        f"/api/v1/files/{FILE_ID}/content/html",
+        f"data:image/png;base64,/api/v1/files/{FILE_ID}/content",
+    ],
+)
+def test_get_file_id_from_url_ignores_other_urls(url):
+    assert get_file_id_from_url(url, "http://localhost:8080/") is None
+
+
+def test_file_content_path_pattern():
+    text = (
+        f"![a](/api/v1/files/{FILE_ID}/content) "
+        f"![b](https://example.com/api/v1/files/{FILE_ID}/content)"
+    )
+    assert FILE_CONTENT_PATH_PATTERN.findall(text) == [FILE_ID]
+
+
+def test_map_strings():
+    document = {"title": "a", "messages": [{"content": "b", "n": 1}, "c"]}
+    assert map_strings(document, str.upper) == {
+        "title": "A",
+        "messages": [{"content": "B", "n": 1}, "C"],
+    }
+
+
+def test_get_file_ids():
+    document = {
+        "messages": [
+            {"content": f"![a](/api/v1/files/{FILE_ID}/content)"},
+            {"files": [{"url": f"/api/v1/files/{FILE_ID}/content"}]},
+            {"content": "![b](https://example.com/api/v1/files/other/content)"},
+        ]
+    }
+    assert get_file_ids(document) == {FILE_ID}
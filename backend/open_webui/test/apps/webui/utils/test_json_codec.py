@@ -0,0 +1,56 @@
+import json
+import math
+
+import pytest
+from open_webui.utils import json_codec
+
+CODECS = [("json", json_codec._json_dumps, json_codec._json_loads)]
+if json_codec.orjson is not None:
+    CODECS.append(("orjson", json_codec._orjson_dumps, json_codec._orjson_loads))
+if json_codec.msgspec is not None:
+    CODECS.append(("msgspec", json_codec._msgspec_dumps, json_codec._msgspec_loads))
+
+FAST_CODECS = [codec for codec in CODECS if codec[0] != "json"]
+
+
+@pytest.mark.parametrize("name,dumps,loads", CODECS)
+def test_round_trip(name, dumps, loads):
+    value = {
+        "title": "New Chat",
+        "history": {"currentId": "1", "messages": {"1": {"content": "héllo"}}},
+        "tags": ["a", "b"],
+        "archived": False,
+        "parentId": None,
+        "score": 0.5,
+    }
+    s = dumps(value)
+    assert isinstance(s, str)
+    assert loads(s) == value
+    assert json.loads(s) == value
+
+
+@pytest.mark.parametrize("name,dumps,loads", CODECS)
+def test_falls_back_for_big_integers(name, dumps, loads):
+    value = {"id": 2**70}
+    assert loads(dumps(value)) == value
+
+
+@pytest.mark.parametrize("name,dumps,loads", CODECS)
+def test_reads_stdlib_non_finite_floats(name, dumps, loads):
+    value = loads(json.dumps([float("nan"), float("inf")]))
+    assert math.isnan(value[0])
+    assert value[1] == float("inf")
+
+
+@pytest.mark.parametrize("name,dumps,loads", FAST_CODECS)
+def test_writes_non_finite_floats_as_null(name, dumps, loads):
+    assert loads(dumps({"a": float("nan"), "b": float("-inf")})) == {
+        "a": None,
+        "b": None,
+    }
+
+
+@pytest.mark.parametrize("name,dumps,loads", CODECS)
+def test_invalid_document_raises_json_decode_error(name, dumps, loads):
+    with pytest.raises(json_codec.JSONDecodeError):
+        loads("{not json")
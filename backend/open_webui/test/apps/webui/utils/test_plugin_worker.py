@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from open_webui.utils.plugin_worker import PluginWorkerPool
+
+SYNC_PIPE = """
+class Pipe:
+    def pipe(self, body):
+        return body["prompt"].upper()
+"""
+
+ASYNC_GENERATOR_PIPE = """
+class Pipe:
+    async def pipe(self, body, __event_emitter__=None):
+        await __event_emitter__({"type": "status"})
+        for word in body["prompt"].split():
+            yield word
+"""
+
+ENDLESS_PIPE = """
+import time
+
+class Pipe:
+    def pipe(self, body):
+        i = 0
+        while True:
+            time.sleep(0.05)
+            i += 1
+            yield i
+"""
+
+FAILING_PIPE = """
+class Pipe:
+    def pipe(self, body):
+        raise ValueError("boom")
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = PluginWorkerPool(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_sync_pipe_returns_result(pool):
+    async def run():
+        return await pool.call("sync", SYNC_PIPE, "pipe", {"body": {"prompt": "hi"}})
+
+    assert asyncio.run(run()) == "HI"
+    assert pool._calls == {}
+
+
+def test_async_generator_pipe_streams_chunks_and_events(pool):
+    events = []
+
+    async def event_emitter(event):
+        events.append(event)
+
+    async def run():
+        params = {"body": {"prompt": "a b c"}, "__event_emitter__": event_emitter}
+        stream = await pool.call("stream", ASYNC_GENERATOR_PIPE, "pipe", params)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert events == [{"type": "status"}]
+    assert pool._calls == {}
+
+
+def test_abandoned_stream_frees_the_worker(pool):
+    async def run():
+        stream = await pool.call("endless", ENDLESS_PIPE, "pipe", {"body": {}})
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            if len(chunks) == 2:
+                break
+        await stream.aclose()
+
+        # The only worker has to stop the endless pipe to take this call
+        result = await asyncio.wait_for(
+            pool.call("sync", SYNC_PIPE, "pipe", {"body": {"prompt": "ok"}}), 30
+        )
+        return chunks, result
+
+    assert asyncio.run(run()) == ([1, 2], "OK")
+    assert pool._calls == {}
+
+
+def test_pipe_error_is_raised(pool):
+    async def run():
+        await pool.call("failing", FAILING_PIPE, "pipe", {"body": {}})
+
+    with pytest.raises(Exception, match="ValueError: boom"):
+        asyncio.run(run())
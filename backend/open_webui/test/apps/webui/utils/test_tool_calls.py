@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from open_webui.utils import middleware
+from open_webui.utils.middleware import execute_tool_calls, wait_for_tool_result
+from open_webui.utils.tools import get_async_tool_function_and_apply_extra_params
+
+
+def test_execute_tool_calls_keeps_order_and_bounds_concurrency(monkeypatch):
+    monkeypatch.setattr(middleware, "TOOL_CALLS_CONCURRENCY", 2)
+    running = 0
+    max_running = 0
+
+    async def handler(tool_call):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later calls finish first
+        await asyncio.sleep(0.01 * (5 - tool_call))
+        running -= 1
+        return tool_call * 10
+
+    results = asyncio.run(execute_tool_calls(list(range(5)), handler))
+    assert results == [0, 10, 20, 30, 40]
+    assert max_running == 2
+
+
+def test_wait_for_tool_result_times_out(monkeypatch):
+    monkeypatch.setattr(middleware, "TOOL_CALL_TIMEOUT", 0.05)
+
+    with pytest.raises(Exception, match="timed out after 0.05s"):
+        asyncio.run(wait_for_tool_result(asyncio.sleep(1), "slow_tool"))
+
+    result = asyncio.run(wait_for_tool_result(asyncio.sleep(0, "done"), "tool"))
+    assert result == "done"
+
+
+def test_sync_tools_run_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(middleware, "TOOL_CALL_TIMEOUT", 0.05)
+    finished = threading.Event()
+
+    def slow_tool(value: str, __user__: dict) -> str:
+        time.sleep(0.2)
+        finished.set()
+        return f"{value} {__user__['id']}"
+
+    tool = get_async_tool_function_and_apply_extra_params(
+        slow_tool, {"__user__": {"id": "1"}, "__request__": None}
+    )
+
+    async def main():
+        # The loop keeps running while the tool blocks its thread
+        start = time.perf_counter()
+        with pytest.raises(Exception, match="may still complete"):
+            await wait_for_tool_result(tool(value="hello"), "slow_tool")
+        assert time.perf_counter() - start < 0.15
+
+        return await tool(value="hello")
+
+    assert asyncio.run(main()) == "hello 1"
+    assert finished.is_set()
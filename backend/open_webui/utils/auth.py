@@ -155,7 +155,7 @@ def get_http_authorization_cred(auth_header: Optional[str]):
         return None
 
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     background_tasks: BackgroundTasks,
     auth_token: HTTPAuthorizationCredentials = Depends(bearer_security),
@@ -196,7 +196,7 @@ def get_current_user(
                     status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.API_KEY_NOT_ALLOWED
                 )
 
-        user = get_current_user_by_api_key(token)
+        user = await get_current_user_by_api_key(token)
 
         # Add user info to current span
         current_span = trace.get_current_span()
@@ -218,7 +218,7 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = await Users.aget_user_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -236,7 +236,7 @@ def get_current_user(
             # Refresh the user's last active timestamp asynchronously
             # to prevent blocking the request
             if background_tasks:
-                background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
+                background_tasks.add_task(Users.aupdate_user_last_active_by_id, user.id)
         return user
     else:
         raise HTTPException(
@@ -245,8 +245,8 @@ def get_current_user(
         )
 
 
-def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+async def get_current_user_by_api_key(api_key: str):
+    user = await Users.aget_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -262,7 +262,7 @@ def get_current_user_by_api_key(api_key: str):
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
-        Users.update_user_last_active_by_id(user.id)
+        await Users.aupdate_user_last_active_by_id(user.id)
 
     return user
 
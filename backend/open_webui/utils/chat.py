@@ -43,8 +43,10 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    get_function_valves_from_cache,
 )
 from open_webui.utils.models import get_all_models, check_model_access
+from open_webui.utils.resolver import get_metadata_resolver
 from open_webui.utils.payload import convert_payload_openai_to_ollama
 from open_webui.utils.response import (
     convert_response_ollama_to_openai,
@@ -199,7 +201,7 @@ async def generate_chat_completion(
         # Check if user has access to the model
         if not bypass_filter and user.role == "user":
             try:
-                check_model_access(user, model)
+                check_model_access(user, model, get_metadata_resolver(request))
             except Exception as e:
                 raise e
 
@@ -333,7 +335,7 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
 
     try:
         filter_functions = [
-            Functions.get_function_by_id(filter_id)
+            get_metadata_resolver(request).get_function(filter_id)
             for filter_id in get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
@@ -357,7 +359,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     else:
         sub_action_id = None
 
-    action = Functions.get_function_by_id(action_id)
+    action = get_metadata_resolver(request).get_function(action_id)
     if not action:
         raise Exception(f"Action not found: {action_id}")
 
@@ -398,8 +400,8 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     function_module, _, _ = get_function_module_from_cache(request, action_id)
 
     if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(action_id)
-        function_module.valves = function_module.Valves(**(valves if valves else {}))
+        valves = get_function_valves_from_cache(request, action_id)
+        function_module.valves = function_module.Valves(**valves)
 
     if hasattr(function_module, "action"):
         try:
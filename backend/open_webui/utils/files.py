@@ -0,0 +1,276 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import mimetypes
+import re
+import uuid
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.models.chats import Chats
+from open_webui.models.files import FileForm, FileModel, Files
+from open_webui.models.users import UserModel
+from open_webui.storage.provider import Storage
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+INLINE_IMAGE_PATTERN = re.compile(
+    r"data:(image/[\w.+-]+);base64,([A-Za-z0-9+/]+={0,2})"
+)
+# Content URL of a stored file, as written by `extract_inline_images`
+FILE_CONTENT_URL_PATTERN = re.compile(r"^/api/v1/files/([\w-]+)/content(?:$|[?#])")
+# The same URL anywhere in a string (e.g. markdown), as long as it's relative
+FILE_CONTENT_PATH_PATTERN = re.compile(
+    r"(?<![\w.:/-])/api/v1/files/([\w-]+)/content(?![\w/-])"
+)
+# `meta.source` of the files holding images extracted from chats
+CHAT_IMAGE_SOURCE = "chat"
+
+
+def get_file_id_from_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Get the id of the file a content URL points to, if it's relative or on
+    `base_url` (this server). URLs of other hosts never match.
+    """
+    base_url = (base_url or "").rstrip("/")
+    if base_url and url.startswith(f"{base_url}/"):
+        url = url[len(base_url) :]
+
+    match = FILE_CONTENT_URL_PATTERN.match(url)
+    return match.group(1) if match else None
+
+
+def map_strings(value: Any, fn: Callable[[str], str]) -> Any:
+    """Apply `fn` to every string of a JSON document, in place."""
+    if isinstance(value, str):
+        return fn(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = map_strings(item, fn)
+    elif isinstance(value, list):
+        for idx, item in enumerate(value):
+            value[idx] = map_strings(item, fn)
+    return value
+
+
+def get_file_ids(value: Any) -> set[str]:
+    """Get the ids of the files a chat document links to with relative URLs."""
+    ids = set()
+
+    def collect(value: str) -> str:
+        ids.update(FILE_CONTENT_PATH_PATTERN.findall(value))
+        return value
+
+    map_strings(value, collect)
+    return ids
+
+
+def is_chat_image(file: FileModel) -> bool:
+    return (file.meta or {}).get("source") == CHAT_IMAGE_SOURCE
+
+
+def save_inline_image(
+    request: Request, content_type: str, encoded: str, user: UserModel
+) -> str:
+    """
+    Store a base64 image as a file of the user and return its content URL.
+    The file id is derived from the image, so saving a chat that still holds
+    the image inline again (e.g. from a tab opened before) reuses the file.
+    These files are marked as chat images, which are left out of the file
+    listings and deleted along with the last chat using them.
+    """
+    data = base64.b64decode(encoded, validate=True)
+    hash = hashlib.sha256(data).hexdigest()
+    id = str(uuid.uuid5(uuid.NAMESPACE_OID, f"{user.id}:{hash}"))
+
+    if Files.get_file_by_id(id) is None:
+        name = f"image{mimetypes.guess_extension(content_type) or ''}"
+        tags = {
+            "OpenWebUI-User-Email": user.email,
+            "OpenWebUI-User-Id": user.id,
+            "OpenWebUI-User-Name": user.name,
+            "OpenWebUI-File-Id": id,
+        }
+        _, file_path = Storage.upload_file(io.BytesIO(data), f"{id}_{name}", tags)
+        Files.insert_new_file(
+            user.id,
+            FileForm(
+                id=id,
+                hash=hash,
+                filename=name,
+                path=file_path,
+                meta={
+                    "name": name,
+                    "content_type": content_type,
+                    "size": len(data),
+                    "source": CHAT_IMAGE_SOURCE,
+                },
+            ),
+        )
+
+    return request.app.url_path_for("get_file_content_by_id", id=id)
+
+
+def extract_inline_images(request: Request, value: Any, user: UserModel) -> Any:
+    """
+    Move the base64 images found anywhere in a chat document (message files,
+    `image_url` parts, markdown in the content) to the storage provider and
+    replace them with the URL of the file, in place. Returns the document.
+    """
+    urls = {}
+
+    def replace(match: re.Match) -> str:
+        if match.group(0) not in urls:
+            try:
+                urls[match.group(0)] = save_inline_image(
+                    request, match.group(1), match.group(2), user
+                )
+            except (binascii.Error, ValueError) as e:
+                log.debug(f"Keeping an inline image that can't be decoded: {e}")
+                urls[match.group(0)] = match.group(0)
+        return urls[match.group(0)]
+
+    def extract(value: str) -> str:
+        if "data:image/" in value:
+            return INLINE_IMAGE_PATTERN.sub(replace, value)
+        return value
+
+    return map_strings(value, extract)
+
+
+def get_file_data_url(file: FileModel) -> str:
+    with open(Storage.get_file(file.path), "rb") as f:
+        data = f.read()
+
+    content_type = (file.meta or {}).get("content_type") or mimetypes.guess_type(
+        file.filename
+    )[0]
+    return f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+
+
+def inline_file_images(value: Any, user_id: str) -> Any:
+    """
+    Replace the content URLs of the image files of `user_id` found in a chat
+    document with base64 data URLs, in place, i.e. undo `extract_inline_images`
+    for copies of the chat that other users read. Returns the document.
+    """
+    ids = get_file_ids(value)
+    if not ids:
+        return value
+
+    data_urls = {}
+    for file in Files.get_files_by_ids(list(ids)):
+        content_type = (file.meta or {}).get("content_type") or ""
+        if file.user_id == user_id and content_type.startswith("image/"):
+            try:
+                data_urls[file.id] = get_file_data_url(file)
+            except Exception as e:
+                log.warning(f"Failed to load image file {file.id}: {e}")
+
+    def inline(value: str) -> str:
+        if "/api/v1/files/" in value:
+            return FILE_CONTENT_PATH_PATTERN.sub(
+                lambda match: data_urls.get(match.group(1), match.group(0)), value
+            )
+        return value
+
+    return map_strings(value, inline)
+
+
+def copy_file_images(
+    request: Request, value: Any, owner_id: Optional[str], user: UserModel
+) -> Any:
+    """
+    Make the image files of `owner_id` and the inline images in a chat document
+    copied by `user` (e.g. a cloned shared chat) files of `user`, who can't
+    read the owner's files. Returns the document.
+    """
+    if owner_id and owner_id != user.id:
+        inline_file_images(value, owner_id)
+    return extract_inline_images(request, value, user)
+
+
+def delete_unused_chat_images(user_id: str, ids: Optional[set[str]] = None):
+    """
+    Delete the chat images of `user_id` (among `ids`, if given) that none of
+    the user's chats links to anymore, e.g. once chats were deleted.
+    """
+    if ids is not None and not ids:
+        return
+
+    files = [
+        file
+        for file in (
+            Files.get_files_by_user_id(user_id)
+            if ids is None
+            else Files.get_files_by_ids(list(ids))
+        )
+        if file.user_id == user_id and is_chat_image(file)
+    ]
+    if not files:
+        return
+
+    used_ids = set()
+    for chat in Chats.get_chats_by_user_id(user_id):
+        used_ids.update(get_file_ids(chat.chat))
+
+    for file in files:
+        if file.id in used_ids:
+            continue
+
+        try:
+            Files.delete_file_by_id(file.id)
+            Storage.delete_file(file.path)
+        except Exception as e:
+            log.warning(f"Failed to delete image file {file.id}: {e}")
+
+
+async def rehydrate_images(
+    messages: list[dict], user: UserModel, base_url: Optional[str] = None
+) -> list[dict]:
+    """
+    Inline the images of `messages` that point to stored files (relative URLs
+    or URLs on `base_url`) as base64 data URLs, which is what vision models
+    expect. Images of files the user can't read are left untouched.
+    """
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, list):
+            continue
+
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "image_url":
+                url = (part.get("image_url") or {}).get("url") or ""
+                id = get_file_id_from_url(url, base_url)
+                if id:
+                    parts.append((part, id))
+
+    if not parts:
+        return messages
+
+    files = {
+        file.id: file
+        for file in await Files.aget_files_by_ids(list({id for _, id in parts}))
+        if file.user_id == user.id or user.role == "admin"
+    }
+
+    data_urls = {}
+    for part, id in parts:
+        if id not in files:
+            continue
+
+        try:
+            if id not in data_urls:
+                data_urls[id] = await asyncio.to_thread(get_file_data_url, files[id])
+            part["image_url"]["url"] = data_urls[id]
+        except Exception as e:
+            log.warning(f"Failed to load image file {id}: {e}")
+
+    return messages
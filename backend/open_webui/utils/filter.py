@@ -4,8 +4,10 @@ import logging
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    get_function_valves_from_cache,
 )
 from open_webui.models.functions import Functions
+from open_webui.utils.resolver import get_metadata_resolver
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
@@ -24,19 +26,23 @@ def get_function_module(request, function_id, load_from_db=True):
 
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
     def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
+        valves = get_function_valves_from_cache(request, function_id)
+        return valves.get("priority", 0)
 
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
+    resolver = get_metadata_resolver(request)
+
+    filter_ids = [
+        function.id
+        for function in resolver.get_functions_by_type(
+            "filter", active_only=True, global_only=True
+        )
+    ]
     if "info" in model and "meta" in model["info"]:
         filter_ids.extend(model["info"]["meta"].get("filterIds", []))
         filter_ids = list(set(filter_ids))
     active_filter_ids = [
         function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        for function in resolver.get_functions_by_type("filter", active_only=True)
     ]
 
     def get_active_status(filter_id):
@@ -82,10 +88,8 @@ async def process_filter_functions(
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+            valves = get_function_valves_from_cache(request, filter_id)
+            function_module.valves = function_module.Valves(**valves)
 
         try:
             # Prepare parameters
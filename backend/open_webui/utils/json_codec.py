@@ -0,0 +1,87 @@
+"""
+Drop-in replacement for the `dumps`/`loads` pair of the `json` module backed
+by the fastest codec available (see `JSON_CODEC`).
+
+Both functions keep the stdlib behaviour: `dumps` returns a `str` and falls
+back to `json.dumps` for values the fast codec rejects (e.g. integers over
+64 bits), and `loads` falls back to `json.loads` for documents it rejects
+(e.g. `NaN`, which `json.dumps` writes), so invalid input still raises
+`json.JSONDecodeError`. The module can be passed wherever a `json` module is
+expected, e.g. `socketio.AsyncServer(json=...)`.
+
+One difference is deliberate: orjson and msgspec write non-finite floats
+(`NaN`, `Infinity`) as `null`, where `json.dumps` writes tokens that aren't
+JSON and that PostgreSQL's `json` type and browsers' `JSON.parse` reject.
+Detecting them to fall back would mean walking every document in Python,
+which costs more than the stdlib encoder saves.
+"""
+
+import json
+import logging
+from typing import Any
+
+from open_webui.env import JSON_CODEC, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _json_dumps(obj: Any, **kwargs) -> str:
+    return json.dumps(obj, **kwargs)
+
+
+def _json_loads(s: str | bytes, **kwargs) -> Any:
+    return json.loads(s, **kwargs)
+
+
+def _orjson_dumps(obj: Any, **kwargs) -> str:
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(obj, **kwargs)
+
+
+def _orjson_loads(s: str | bytes, **kwargs) -> Any:
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        return json.loads(s, **kwargs)
+
+
+def _msgspec_dumps(obj: Any, **kwargs) -> str:
+    try:
+        return msgspec.json.encode(obj).decode()
+    except (TypeError, OverflowError):
+        return json.dumps(obj, **kwargs)
+
+
+def _msgspec_loads(s: str | bytes, **kwargs) -> Any:
+    try:
+        return msgspec.json.decode(s)
+    except msgspec.DecodeError:
+        return json.loads(s, **kwargs)
+
+
+if JSON_CODEC in ("auto", "orjson") and orjson is not None:
+    CODEC = "orjson"
+    dumps, loads = _orjson_dumps, _orjson_loads
+elif JSON_CODEC in ("auto", "msgspec") and msgspec is not None:
+    CODEC = "msgspec"
+    dumps, loads = _msgspec_dumps, _msgspec_loads
+else:
+    if JSON_CODEC not in ("auto", "json"):
+        log.warning(f"JSON codec {JSON_CODEC} is not available, using json")
+    CODEC = "json"
+    dumps, loads = _json_dumps, _json_loads
+
+JSONDecodeError = json.JSONDecodeError
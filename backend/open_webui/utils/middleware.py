@@ -15,7 +15,6 @@ import re
 import ast
 
 from uuid import uuid4
-from concurrent.futures import ThreadPoolExecutor
 
 
 from fastapi import Request, HTTPException
@@ -51,6 +50,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.retrieval.utils import get_sources_from_files
+from open_webui.utils.resolver import get_metadata_resolver
 
 
 from open_webui.utils.chat import generate_chat_completion
@@ -69,6 +69,7 @@ from open_webui.utils.misc import (
     prepend_to_first_user_message_content,
     convert_logit_bias_input_to_json,
 )
+from open_webui.utils.files import rehydrate_images
 from open_webui.utils.tools import get_tools
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
@@ -89,6 +90,8 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
+    TOOL_CALLS_CONCURRENCY,
+    TOOL_CALL_TIMEOUT,
 )
 from open_webui.constants import TASKS
 
@@ -98,6 +101,36 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
+async def wait_for_tool_result(coroutine, tool_name: str):
+    """
+    Await a tool call, giving up after TOOL_CALL_TIMEOUT seconds. Async tools
+    are cancelled, synchronous ones can't be and may still finish (and have
+    their side effects) afterwards.
+    """
+    try:
+        return await asyncio.wait_for(coroutine, TOOL_CALL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise Exception(
+            f"Tool `{tool_name}` timed out after {TOOL_CALL_TIMEOUT}s, "
+            "it may still complete in the background"
+        )
+
+
+async def execute_tool_calls(tool_calls: list, handler) -> list:
+    """
+    Run `handler` for every tool call of an assistant turn concurrently, with
+    at most TOOL_CALLS_CONCURRENCY running at once. Results are returned in
+    the same order as the tool calls.
+    """
+    semaphore = asyncio.Semaphore(TOOL_CALLS_CONCURRENCY)
+
+    async def run(tool_call):
+        async with semaphore:
+            return await handler(tool_call)
+
+    return await asyncio.gather(*[run(tool_call) for tool_call in tool_calls])
+
+
 async def chat_completion_tools_handler(
     request: Request, body: dict, extra_params: dict, user: UserModel, models, tools
 ) -> tuple[dict, dict]:
@@ -178,14 +211,12 @@ async def chat_completion_tools_handler(
 
             result = json.loads(content)
 
-            async def tool_call_handler(tool_call):
-                nonlocal skip_files
-
+            async def execute_tool_call(tool_call):
                 log.debug(f"{tool_call=}")
 
                 tool_function_name = tool_call.get("name", None)
                 if tool_function_name not in tools:
-                    return body, {}
+                    return None
 
                 tool_function_params = tool_call.get("parameters", {})
 
@@ -203,25 +234,37 @@ async def chat_completion_tools_handler(
                     }
 
                     if tool.get("direct", False):
-                        tool_result = await event_caller(
-                            {
-                                "type": "execute:tool",
-                                "data": {
-                                    "id": str(uuid4()),
-                                    "name": tool_function_name,
-                                    "params": tool_function_params,
-                                    "server": tool.get("server", {}),
-                                    "session_id": metadata.get("session_id", None),
-                                },
-                            }
+                        tool_result = await wait_for_tool_result(
+                            event_caller(
+                                {
+                                    "type": "execute:tool",
+                                    "data": {
+                                        "id": str(uuid4()),
+                                        "name": tool_function_name,
+                                        "params": tool_function_params,
+                                        "server": tool.get("server", {}),
+                                        "session_id": metadata.get("session_id", None),
+                                    },
+                                }
+                            ),
+                            tool_function_name,
                         )
                     else:
                         tool_function = tool["callable"]
-                        tool_result = await tool_function(**tool_function_params)
+                        tool_result = await wait_for_tool_result(
+                            tool_function(**tool_function_params), tool_function_name
+                        )
 
                 except Exception as e:
                     tool_result = str(e)
 
+                return tool_function_name, tool_function_params, tool_result
+
+            def tool_result_handler(
+                tool_function_name, tool_function_params, tool_result
+            ):
+                nonlocal skip_files
+
                 tool_result_files = []
                 if isinstance(tool_result, list):
                     for item in tool_result:
@@ -275,11 +318,14 @@ async def chat_completion_tools_handler(
                         skip_files = True
 
             # check if "tool_calls" in result
-            if result.get("tool_calls"):
-                for tool_call in result.get("tool_calls"):
-                    await tool_call_handler(tool_call)
-            else:
-                await tool_call_handler(result)
+            tool_calls = result.get("tool_calls") or [result]
+
+            # Run the tool calls concurrently, then apply their results in call order
+            for tool_call_result in await execute_tool_calls(
+                tool_calls, execute_tool_call
+            ):
+                if tool_call_result is not None:
+                    tool_result_handler(*tool_call_result)
 
         except Exception as e:
             log.debug(f"Error: {e}")
@@ -634,27 +680,21 @@ async def chat_completion_files_handler(
             queries = [get_last_user_message(body["messages"])]
 
         try:
-            # Offload get_sources_from_files to a separate thread
-            loop = asyncio.get_running_loop()
-            with ThreadPoolExecutor() as executor:
-                sources = await loop.run_in_executor(
-                    executor,
-                    lambda: get_sources_from_files(
-                        request=request,
-                        files=files,
-                        queries=queries,
-                        embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                            query, prefix=prefix, user=user
-                        ),
-                        k=request.app.state.config.TOP_K,
-                        reranking_function=request.app.state.rf,
-                        k_reranker=request.app.state.config.TOP_K_RERANKER,
-                        r=request.app.state.config.RELEVANCE_THRESHOLD,
-                        hybrid_bm25_weight=request.app.state.config.HYBRID_BM25_WEIGHT,
-                        hybrid_search=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH,
-                        full_context=request.app.state.config.RAG_FULL_CONTEXT,
-                    ),
-                )
+            sources = await get_sources_from_files(
+                request=request,
+                files=files,
+                queries=queries,
+                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
+                    query, prefix=prefix, user=user
+                ),
+                k=request.app.state.config.TOP_K,
+                reranking_function=request.app.state.rf,
+                k_reranker=request.app.state.config.TOP_K_RERANKER,
+                r=request.app.state.config.RELEVANCE_THRESHOLD,
+                hybrid_bm25_weight=request.app.state.config.HYBRID_BM25_WEIGHT,
+                hybrid_search=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH,
+                full_context=request.app.state.config.RAG_FULL_CONTEXT,
+            )
         except Exception as e:
             log.exception(e)
 
@@ -720,6 +760,13 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     form_data = apply_params_to_form_data(form_data, model)
     log.debug(f"form_data: {form_data}")
 
+    # Chats keep their images as stored files, inline them for vision models only
+    capabilities = model.get("info", {}).get("meta", {}).get("capabilities") or {}
+    if capabilities.get("vision", True):
+        form_data["messages"] = await rehydrate_images(
+            form_data["messages"], user, str(request.base_url)
+        )
+
     event_emitter = get_event_emitter(metadata)
     event_call = get_event_call(metadata)
 
@@ -810,7 +857,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     try:
 
         filter_functions = [
-            Functions.get_function_by_id(filter_id)
+            get_metadata_resolver(request).get_function(filter_id)
             for filter_id in get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
@@ -1216,7 +1263,7 @@ async def process_chat_response(
                     )
 
                     # Send a webhook notification if the user is not active
-                    if not get_active_status_by_user_id(user.id):
+                    if not await get_active_status_by_user_id(user.id):
                         webhook_url = Users.get_user_webhook_url_by_id(user.id)
                         if webhook_url:
                             post_webhook(
@@ -1284,7 +1331,7 @@ async def process_chat_response(
         "__model__": model,
     }
     filter_functions = [
-        Functions.get_function_by_id(filter_id)
+        get_metadata_resolver(request).get_function(filter_id)
         for filter_id in get_sorted_filter_ids(
             request, model, metadata.get("filter_ids", [])
         )
@@ -2006,8 +2053,7 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
-                    for tool_call in response_tool_calls:
+                    async def execute_tool_call(tool_call):
                         tool_call_id = tool_call.get("id", "")
                         tool_name = tool_call.get("function", {}).get("name", "")
 
@@ -2049,25 +2095,29 @@ async def process_chat_response(
                                 }
 
                                 if tool.get("direct", False):
-                                    tool_result = await event_caller(
-                                        {
-                                            "type": "execute:tool",
-                                            "data": {
-                                                "id": str(uuid4()),
-                                                "name": tool_name,
-                                                "params": tool_function_params,
-                                                "server": tool.get("server", {}),
-                                                "session_id": metadata.get(
-                                                    "session_id", None
-                                                ),
-                                            },
-                                        }
+                                    tool_result = await wait_for_tool_result(
+                                        event_caller(
+                                            {
+                                                "type": "execute:tool",
+                                                "data": {
+                                                    "id": str(uuid4()),
+                                                    "name": tool_name,
+                                                    "params": tool_function_params,
+                                                    "server": tool.get("server", {}),
+                                                    "session_id": metadata.get(
+                                                        "session_id", None
+                                                    ),
+                                                },
+                                            }
+                                        ),
+                                        tool_name,
                                     )
 
                                 else:
                                     tool_function = tool["callable"]
-                                    tool_result = await tool_function(
-                                        **tool_function_params
+                                    tool_result = await wait_for_tool_result(
+                                        tool_function(**tool_function_params),
+                                        tool_name,
                                     )
 
                             except Exception as e:
@@ -2086,17 +2136,20 @@ async def process_chat_response(
                         ):
                             tool_result = json.dumps(tool_result, indent=2)
 
-                        results.append(
-                            {
-                                "tool_call_id": tool_call_id,
-                                "content": tool_result,
-                                **(
-                                    {"files": tool_result_files}
-                                    if tool_result_files
-                                    else {}
-                                ),
-                            }
-                        )
+                        return {
+                            "tool_call_id": tool_call_id,
+                            "content": tool_result,
+                            **(
+                                {"files": tool_result_files}
+                                if tool_result_files
+                                else {}
+                            ),
+                        }
+
+                    # Run the tool calls concurrently, results are kept in call order
+                    results = await execute_tool_calls(
+                        response_tool_calls, execute_tool_call
+                    )
 
                     content_blocks[-1]["results"] = results
 
@@ -2338,7 +2391,7 @@ async def process_chat_response(
                     )
 
                 # Send a webhook notification if the user is not active
-                if not get_active_status_by_user_id(user.id):
+                if not await get_active_status_by_user_id(user.id):
                     webhook_url = Users.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         post_webhook(
@@ -0,0 +1,202 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_REGISTRY_MAX_BACKOFF,
+    MODELS_REGISTRY_TTL,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
+    SRC_LOG_LEVELS,
+)
+from open_webui.models.users import UserModel
+from open_webui.utils.redis import get_async_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+MODELS_REGISTRY_PREFIX = "open-webui:models:registry"
+
+# Keep entries of connections that are no longer configured from piling up in Redis
+MODELS_REGISTRY_EXPIRE = 24 * 60 * 60
+
+
+class ModelRegistry:
+    """
+    Stale-while-revalidate registry of the model lists returned by each
+    upstream connection.
+
+    A listed connection is answered from the registry; once its entry is
+    older than `ttl` the stale list is still returned while a single
+    background task refreshes it. Failed refreshes keep the last good list
+    and back off exponentially (up to `max_backoff`) before the connection
+    is contacted again. Entries live in Redis when configured so every
+    worker shares the same lists and health state.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 60,
+        max_backoff: int = 300,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+    ):
+        self.ttl = ttl
+        self.max_backoff = max_backoff
+        self._entries: dict[str, dict] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._redis = None
+
+        if redis_url:
+            self._redis = get_async_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+
+    def get_key(self, url: str, key: Optional[str] = None, user=None) -> str:
+        # Responses may depend on the forwarded user, so keep them apart
+        user_id = user.id if (ENABLE_FORWARD_USER_INFO_HEADERS and user) else None
+        return hashlib.sha256(json.dumps([url, key, user_id]).encode()).hexdigest()
+
+    async def _load(self, registry_key: str) -> Optional[dict]:
+        if self._redis:
+            try:
+                entry = await self._redis.get(
+                    f"{MODELS_REGISTRY_PREFIX}:{registry_key}"
+                )
+                return json.loads(entry) if entry else None
+            except Exception as e:
+                log.warning(f"Failed to read model registry from Redis: {e}")
+
+        entry = self._entries.get(registry_key)
+        return copy.deepcopy(entry) if entry else None
+
+    async def _save(self, registry_key: str, entry: dict):
+        if self._redis:
+            try:
+                await self._redis.set(
+                    f"{MODELS_REGISTRY_PREFIX}:{registry_key}",
+                    json.dumps(entry),
+                    ex=MODELS_REGISTRY_EXPIRE,
+                )
+                return
+            except Exception as e:
+                log.warning(f"Failed to write model registry to Redis: {e}")
+
+        self._entries[registry_key] = copy.deepcopy(entry)
+
+    async def _acquire_refresh(self, registry_key: str) -> bool:
+        # Only one worker refreshes a given connection at a time
+        if not self._redis:
+            return True
+
+        try:
+            return bool(
+                await self._redis.set(
+                    f"{MODELS_REGISTRY_PREFIX}:lock:{registry_key}",
+                    1,
+                    nx=True,
+                    ex=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST or self.ttl,
+                )
+            )
+        except Exception as e:
+            log.warning(f"Failed to lock model registry entry in Redis: {e}")
+            return True
+
+    async def _fetch(
+        self, registry_key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Optional[dict]:
+        try:
+            data = await fetch()
+        except Exception as e:
+            log.debug(f"Failed to fetch models: {e}")
+            data = None
+
+        entry = await self._load(registry_key) or {
+            "data": None,
+            "fetched_at": 0,
+            "failures": 0,
+            "retry_at": 0,
+        }
+
+        now = time.time()
+        if data is not None:
+            entry.update({"data": data, "fetched_at": now, "failures": 0})
+            entry["retry_at"] = 0
+        else:
+            # Keep serving the last good list while backing off
+            entry["failures"] += 1
+            entry["retry_at"] = now + min(
+                2 ** (entry["failures"] - 1), self.max_backoff
+            )
+
+        await self._save(registry_key, entry)
+        return entry
+
+    def _refresh(
+        self, registry_key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self._tasks.get(registry_key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch(registry_key, fetch))
+            task.add_done_callback(lambda _: self._tasks.pop(registry_key, None))
+            self._tasks[registry_key] = task
+        return task
+
+    async def get(
+        self,
+        fetch: Callable[[], Awaitable[Any]],
+        url: str,
+        key: Optional[str] = None,
+        user: Optional[UserModel] = None,
+    ) -> Optional[Any]:
+        """
+        Get the model list of a connection, calling `fetch` only when the
+        connection has never been listed (or its entry is stale, in which
+        case the fetch runs in the background). Returns None for connections
+        that are unreachable and have no previous list.
+        """
+        registry_key = self.get_key(url, key, user)
+        entry = await self._load(registry_key)
+        now = time.time()
+
+        if entry is None or entry["data"] is None:
+            if entry is not None and entry["retry_at"] > now:
+                # Unhealthy connection in backoff, don't wait on it
+                return None
+
+            entry = await asyncio.shield(self._refresh(registry_key, fetch))
+        elif (
+            now - entry["fetched_at"] > self.ttl
+            and entry["retry_at"] <= now
+            and await self._acquire_refresh(registry_key)
+        ):
+            self._refresh(registry_key, fetch)
+
+        return copy.deepcopy(entry["data"]) if entry else None
+
+    async def invalidate(self, url: str, key: Optional[str] = None, user=None):
+        """
+        Mark the model list of a connection as stale, e.g. after models were
+        copied or deleted, so the next lookup refreshes it.
+        """
+        registry_key = self.get_key(url, key, user)
+        entry = await self._load(registry_key)
+        if entry is not None:
+            entry["fetched_at"] = 0
+            entry["retry_at"] = 0
+            await self._save(registry_key, entry)
+
+
+MODEL_REGISTRY = ModelRegistry(
+    ttl=MODELS_REGISTRY_TTL,
+    max_backoff=MODELS_REGISTRY_MAX_BACKOFF,
+    redis_url=REDIS_URL,
+    redis_sentinels=get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+)
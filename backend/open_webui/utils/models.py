@@ -1,7 +1,10 @@
 import time
 import logging
 import asyncio
+import hashlib
+import json
 import sys
+from typing import Optional
 
 from aiocache import cached
 from fastapi import Request
@@ -11,6 +14,7 @@ from open_webui.functions import get_function_models
 
 
 from open_webui.models.functions import Functions
+from open_webui.models.groups import Groups
 from open_webui.models.models import Models
 
 
@@ -19,14 +23,29 @@ from open_webui.utils.plugin import (
     get_function_module_from_cache,
 )
 from open_webui.utils.access_control import has_access
+from open_webui.utils.resolver import MetadataResolver
 
 
 from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_CACHE_TTL,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    UVICORN_WORKERS,
+)
 from open_webui.models.users import UserModel
+from open_webui.utils.redis import (
+    get_async_redis_connection,
+    get_redis_connection,
+    get_sentinels_from_env,
+)
 
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -34,6 +53,36 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
+MODELS_VERSION_KEY = "open-webui:models:version"
+
+# Maximum number of per-user filtered views kept for a single catalog
+MODEL_CATALOG_MAX_VIEWS = 1024
+
+# Maximum number of per-user catalogs kept when user info is forwarded upstream
+MODEL_CATALOG_MAX_USERS = 256
+
+_models_version = 0
+_models_version_redis = (
+    get_redis_connection(
+        REDIS_URL,
+        get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+        decode_responses=True,
+    )
+    if REDIS_URL
+    else None
+)
+_models_version_aredis = (
+    get_async_redis_connection(
+        REDIS_URL,
+        get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+        decode_responses=True,
+    )
+    if REDIS_URL
+    else None
+)
+_model_catalog_lock = asyncio.Lock()
+
+
 async def fetch_ollama_models(request: Request, user: UserModel = None):
     raw_ollama_models = await ollama.get_all_models(request, user=user)
     return [
@@ -118,20 +167,29 @@ async def get_all_models(request, user: UserModel = None):
             ]
         models = models + arena_models
 
+    # Load all functions once instead of querying them per action and filter
+    resolver = MetadataResolver()
+
     global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
+        function.id
+        for function in resolver.get_functions_by_type(
+            "action", active_only=True, global_only=True
+        )
     ]
     enabled_action_ids = [
         function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+        for function in resolver.get_functions_by_type("action", active_only=True)
     ]
 
     global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
+        function.id
+        for function in resolver.get_functions_by_type(
+            "filter", active_only=True, global_only=True
+        )
     ]
     enabled_filter_ids = [
         function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        for function in resolver.get_functions_by_type("filter", active_only=True)
     ]
 
     custom_models = Models.get_all_models()
@@ -271,7 +329,7 @@ async def get_all_models(request, user: UserModel = None):
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
+            action_function = resolver.get_function(action_id)
             if action_function is None:
                 raise Exception(f"Action not found: {action_id}")
 
@@ -282,7 +340,7 @@ async def get_all_models(request, user: UserModel = None):
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
+            filter_function = resolver.get_function(filter_id)
             if filter_function is None:
                 raise Exception(f"Filter not found: {filter_id}")
 
@@ -299,7 +357,204 @@ async def get_all_models(request, user: UserModel = None):
     return models
 
 
-def check_model_access(user, model):
+def bump_models_version():
+    """
+    Invalidate the model catalog in every worker, e.g. after a model or
+    function has been created, updated or deleted.
+    """
+    global _models_version
+    if _models_version_redis:
+        try:
+            _models_version_redis.incr(MODELS_VERSION_KEY)
+            return
+        except Exception as e:
+            log.warning(f"Failed to bump models version in Redis: {e}")
+
+    _models_version += 1
+
+
+async def get_models_version() -> str | None:
+    """
+    Get the current version of the model catalog, or None if it can't be
+    trusted (e.g. multiple workers without Redis) and must be rebuilt.
+    """
+    if _models_version_aredis:
+        try:
+            return await _models_version_aredis.get(MODELS_VERSION_KEY) or "0"
+        except Exception as e:
+            log.warning(f"Failed to read models version from Redis: {e}")
+            return None
+
+    if UVICORN_WORKERS > 1:
+        # Local version counters can't see bumps made by other workers
+        return None
+
+    return str(_models_version)
+
+
+def get_models_config_hash(request: Request) -> str:
+    # Connection and arena settings are synced across workers by `AppConfig`,
+    # so hashing them picks up connection changes without an explicit bump
+    config = request.app.state.config
+    return hashlib.sha256(
+        json.dumps(
+            [
+                config.ENABLE_OPENAI_API,
+                config.OPENAI_API_BASE_URLS,
+                config.OPENAI_API_KEYS,
+                config.OPENAI_API_CONFIGS,
+                config.ENABLE_OLLAMA_API,
+                config.OLLAMA_BASE_URLS,
+                config.OLLAMA_API_CONFIGS,
+                config.ENABLE_EVALUATION_ARENA_MODELS,
+                config.EVALUATION_ARENA_MODELS,
+                config.MODEL_ORDER_LIST,
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+async def get_model_catalog(request: Request, user: UserModel = None) -> dict:
+    """
+    Get the materialized model catalog used by `/api/models`.
+
+    The catalog holds the decorated, tagged and ordered model list along with
+    the owner and access control of every model, and is only rebuilt when
+    models, functions or connections changed or after MODELS_CACHE_TTL
+    seconds (to pick up models added or removed upstream).
+
+    The catalog is shared by all users and built without one, unless user
+    info is forwarded to the connections: their lists may then depend on the
+    user, so every user gets a catalog of their own.
+    """
+    catalog_user = user if (ENABLE_FORWARD_USER_INFO_HEADERS and user) else None
+    catalog_user_id = catalog_user.id if catalog_user else None
+
+    if not hasattr(request.app.state, "MODEL_CATALOGS"):
+        request.app.state.MODEL_CATALOGS = {}
+    catalogs = request.app.state.MODEL_CATALOGS
+
+    def is_fresh(catalog, key):
+        return (
+            catalog is not None
+            and catalog["key"] == key
+            and catalog["expires_at"] > time.monotonic()
+        )
+
+    async def build_catalog(key):
+        all_models = await get_all_models(request, user=catalog_user)
+
+        models = []
+        for model in all_models:
+            # Filter out filter pipelines
+            if "pipeline" in model and model["pipeline"].get("type", None) == "filter":
+                continue
+
+            try:
+                model_tags = [
+                    tag.get("name")
+                    for tag in model.get("info", {}).get("meta", {}).get("tags", [])
+                ]
+                tags = [tag.get("name") for tag in model.get("tags", [])]
+
+                tags = list(set(model_tags + tags))
+                model["tags"] = [{"name": tag} for tag in tags]
+            except Exception as e:
+                log.debug(f"Error processing model tags: {e}")
+                model["tags"] = []
+                pass
+
+            models.append(model)
+
+        model_order_list = request.app.state.config.MODEL_ORDER_LIST
+        if model_order_list:
+            model_order_dict = {
+                model_id: i for i, model_id in enumerate(model_order_list)
+            }
+            # Sort models by order list priority, with fallback for those not in the list
+            models.sort(
+                key=lambda x: (model_order_dict.get(x["id"], float("inf")), x["name"])
+            )
+
+        catalog = {
+            "key": key,
+            "expires_at": time.monotonic() + MODELS_CACHE_TTL,
+            "models": models,
+            "access": {
+                model.id: (model.user_id, model.access_control)
+                for model in Models.get_all_models()
+            },
+            "views": {},
+        }
+        if catalog_user_id not in catalogs and len(catalogs) >= MODEL_CATALOG_MAX_USERS:
+            catalogs.clear()
+        catalogs[catalog_user_id] = catalog
+        return catalog
+
+    version = await get_models_version()
+    key = (version, get_models_config_hash(request))
+    if version is None:
+        return await build_catalog(key)
+
+    catalog = catalogs.get(catalog_user_id)
+    if is_fresh(catalog, key):
+        return catalog
+
+    async with _model_catalog_lock:
+        # Another request may have rebuilt the catalog while we were waiting
+        catalog = catalogs.get(catalog_user_id)
+        if is_fresh(catalog, key):
+            return catalog
+
+        return await build_catalog(key)
+
+
+def get_filtered_models(catalog: dict, user: UserModel) -> list[dict]:
+    """
+    Filter the catalog down to the models the user has read access to.
+    Views are cached per user and group membership, so this costs a single
+    group lookup once the catalog has been built.
+    """
+    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    view_key = (user.id, tuple(sorted(user_group_ids)))
+
+    views = catalog["views"]
+    if view_key in views:
+        return views[view_key]
+
+    filtered_models = []
+    for model in catalog["models"]:
+        if model.get("arena"):
+            if has_access(
+                user.id,
+                type="read",
+                access_control=model.get("info", {})
+                .get("meta", {})
+                .get("access_control", {}),
+                user_group_ids=user_group_ids,
+            ):
+                filtered_models.append(model)
+            continue
+
+        if model["id"] in catalog["access"]:
+            owner_id, access_control = catalog["access"][model["id"]]
+            if user.id == owner_id or has_access(
+                user.id,
+                type="read",
+                access_control=access_control,
+                user_group_ids=user_group_ids,
+            ):
+                filtered_models.append(model)
+
+    if len(views) >= MODEL_CATALOG_MAX_VIEWS:
+        views.clear()
+    views[view_key] = filtered_models
+    return filtered_models
+
+
+def check_model_access(user, model, resolver: Optional[MetadataResolver] = None):
     if model.get("arena"):
         if not has_access(
             user.id,
@@ -310,7 +565,11 @@ def check_model_access(user, model):
         ):
             raise Exception("Model not found")
     else:
-        model_info = Models.get_model_by_id(model.get("id"))
+        model_info = (
+            resolver.get_model(model.get("id"))
+            if resolver
+            else Models.get_model_by_id(model.get("id"))
+        )
         if not model_info:
             raise Exception("Model not found")
         elif not (
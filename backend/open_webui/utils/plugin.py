@@ -5,16 +5,48 @@ import sys
 from importlib import util
 import types
 import tempfile
+import time
 import logging
 
-from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    FUNCTION_VERSION_CACHE_TTL,
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    UVICORN_WORKERS,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.plugin_worker import IsolatedFunction, is_isolated
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
+FUNCTION_VERSION_PREFIX = "open-webui:functions:version"
+
+# Version bumped when functions are synced in bulk, folded into every function version
+ALL_FUNCTIONS = "__all__"
+
+_function_versions: dict[str, int] = {}
+# Versions last read from Redis with the time they expire, keeps Redis (and its
+# blocking client) off the path of every function dispatch
+_function_versions_read: dict[str, tuple[float, str]] = {}
+_function_versions_redis = (
+    get_redis_connection(
+        REDIS_URL,
+        get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+        decode_responses=True,
+    )
+    if REDIS_URL
+    else None
+)
+
+
 def extract_frontmatter(content):
     """
     Extract frontmatter as a dictionary from the provided content string.
@@ -77,8 +109,10 @@ def load_tool_module_by_id(tool_id, content=None):
 
         content = tool.content
 
-        content = replace_imports(content)
-        Tools.update_tool_by_id(tool_id, {"content": content})
+        new_content = replace_imports(content)
+        if new_content != content:
+            content = new_content
+            Tools.update_tool_by_id(tool_id, {"content": content})
     else:
         frontmatter = extract_frontmatter(content)
         # Install required packages found within the frontmatter
@@ -148,35 +182,118 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
 
         # Create appropriate object based on available class type in the module
         if hasattr(module, "Pipe"):
-            return module.Pipe(), "pipe", frontmatter
+            function_module, function_type = module.Pipe(), "pipe"
         elif hasattr(module, "Filter"):
-            return module.Filter(), "filter", frontmatter
+            function_module, function_type = module.Filter(), "filter"
         elif hasattr(module, "Action"):
             return module.Action(), "action", frontmatter
         else:
             raise Exception("No Function class found in the module")
+
+        # Run the pipe/filter hooks in the plugin worker pool when opted in
+        if is_isolated(frontmatter):
+            function_module = IsolatedFunction(function_id, content, function_module)
+
+        return function_module, function_type, frontmatter
     except Exception as e:
         log.error(f"Error loading module: {function_id}: {e}")
         # Cleanup by removing the module in case of error
         del sys.modules[module_name]
 
         Functions.update_function_by_id(function_id, {"is_active": False})
+        bump_function_version(function_id)
         raise e
     finally:
         os.unlink(temp_file.name)
 
 
+def bump_function_version(function_id: str | None = None):
+    """
+    Invalidate the cached module and valves of a function in every worker.
+    Bumps the version of all functions when no function id is given.
+    """
+    function_id = function_id or ALL_FUNCTIONS
+    if _function_versions_redis:
+        # Changes made by this worker are seen here right away, other workers
+        # see them within FUNCTION_VERSION_CACHE_TTL
+        if function_id == ALL_FUNCTIONS:
+            _function_versions_read.clear()
+        else:
+            _function_versions_read.pop(function_id, None)
+
+        try:
+            _function_versions_redis.incr(f"{FUNCTION_VERSION_PREFIX}:{function_id}")
+            return
+        except Exception as e:
+            log.warning(f"Failed to bump function version in Redis: {e}")
+
+    _function_versions[function_id] = _function_versions.get(function_id, 0) + 1
+
+
+def get_function_version(function_id: str) -> str | None:
+    """
+    Get the current version of a function, or None if it can't be trusted
+    (e.g. multiple workers without Redis) and the database must be checked.
+    """
+    if _function_versions_redis:
+        expires_at, version = _function_versions_read.get(function_id, (0, None))
+        if expires_at > time.monotonic():
+            return version
+
+        try:
+            versions = _function_versions_redis.mget(
+                [
+                    f"{FUNCTION_VERSION_PREFIX}:{ALL_FUNCTIONS}",
+                    f"{FUNCTION_VERSION_PREFIX}:{function_id}",
+                ]
+            )
+            version = ":".join(version or "0" for version in versions)
+            _function_versions_read[function_id] = (
+                time.monotonic() + FUNCTION_VERSION_CACHE_TTL,
+                version,
+            )
+            return version
+        except Exception as e:
+            log.warning(f"Failed to read function version from Redis: {e}")
+            return None
+
+    if UVICORN_WORKERS > 1:
+        # Local version counters can't see bumps made by other workers
+        return None
+
+    return f"{_function_versions.get(ALL_FUNCTIONS, 0)}:{_function_versions.get(function_id, 0)}"
+
+
 def get_function_module_from_cache(request, function_id, load_from_db=True):
+    if not hasattr(request.app.state, "FUNCTION_VERSIONS"):
+        request.app.state.FUNCTION_VERSIONS = {}
+
+    if not hasattr(request.app.state, "FUNCTION_VALVES"):
+        request.app.state.FUNCTION_VALVES = {}
+
     if load_from_db:
-        # Always load from the database by default
+        # Load from the database whenever the function version changed
         # This is useful for hooks like "inlet" or "outlet" where the content might change
         # and we want to ensure the latest content is used.
 
+        version = get_function_version(function_id)
+        if (
+            version is not None
+            and request.app.state.FUNCTION_VERSIONS.get(function_id) == version
+            and function_id in getattr(request.app.state, "FUNCTIONS", {})
+        ):
+            return request.app.state.FUNCTIONS[function_id], None, None
+
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
         content = function.content
 
+        request.app.state.FUNCTION_VALVES[function_id] = (
+            Functions.get_function_valves_by_id(function_id) or {}
+        )
+        request.app.state.FUNCTION_VERSIONS[function_id] = version
+
         new_content = replace_imports(content)
         if new_content != content:
             content = new_content
@@ -222,6 +339,17 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
     return function_module, function_type, frontmatter
 
 
+def get_function_valves_from_cache(request, function_id) -> dict:
+    """
+    Get the valves of a function loaded with `get_function_module_from_cache`,
+    falling back to the database if they haven't been cached yet.
+    """
+    valves = getattr(request.app.state, "FUNCTION_VALVES", {}).get(function_id)
+    if valves is None:
+        valves = Functions.get_function_valves_by_id(function_id)
+    return valves if valves else {}
+
+
 def install_frontmatter_requirements(requirements: str):
     if requirements:
         try:
@@ -0,0 +1,439 @@
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import inspect
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import types
+import uuid
+from typing import Any, Iterator, Optional
+
+from pydantic import BaseModel
+
+from open_webui.env import PLUGIN_WORKER_POOL_SIZE, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+# Frontmatter opt-in, e.g. `isolation: process`
+ISOLATION_FRONTMATTER_KEY = "isolation"
+ISOLATION_PROCESS = "process"
+
+# Methods that run in the worker pool for isolated functions
+ISOLATED_METHODS = ("pipe", "inlet", "outlet")
+
+# Seconds to wait for the last message of a worker that has exited
+MESSAGE_POLL_INTERVAL = 1
+
+
+####################
+# Worker process
+####################
+
+_function_modules: dict[tuple[str, str], Any] = {}
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _load_function_module(function_id: str, content: str):
+    content_hash = hashlib.sha256(content.encode()).hexdigest()
+    if (function_id, content_hash) in _function_modules:
+        return _function_modules[(function_id, content_hash)]
+
+    module_name = f"function_{function_id}"
+    module = types.ModuleType(module_name)
+    sys.modules[module_name] = module
+
+    # Mirror `load_function_module_by_id`, which gives the module a `__file__`
+    temp_file = tempfile.NamedTemporaryFile(delete=False)
+    temp_file.close()
+    try:
+        with open(temp_file.name, "w", encoding="utf-8") as f:
+            f.write(content)
+        module.__dict__["__file__"] = temp_file.name
+        exec(content, module.__dict__)
+    finally:
+        os.unlink(temp_file.name)
+
+    if hasattr(module, "Pipe"):
+        function_module = module.Pipe()
+    elif hasattr(module, "Filter"):
+        function_module = module.Filter()
+    else:
+        raise Exception("No Function class found in the module")
+
+    # Only keep the latest version of each function around
+    for key in [key for key in _function_modules if key[0] == function_id]:
+        del _function_modules[key]
+
+    _function_modules[(function_id, content_hash)] = function_module
+    log.info(f"Loaded module in plugin worker {os.getpid()}: {module_name}")
+    return function_module
+
+
+def _run(coroutine):
+    global _event_loop
+    if _event_loop is None:
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop.run_until_complete(coroutine)
+
+
+def _run_function_method(
+    function_id: str,
+    content: str,
+    method: str,
+    valves: Optional[dict],
+    user_valves: Optional[dict],
+    params: dict,
+    call_id: str,
+    messages,
+    replies,
+    cancelled,
+):
+    """
+    Entry point of a worker process. Calls `method` of the function and
+    reports its result, stream chunks and events through `messages`, tagged
+    with `call_id`. A stream stops at its next chunk once `cancelled` is set.
+    """
+
+    def send(kind: str, data: Any = None):
+        messages.put((call_id, kind, data))
+
+    try:
+        function_module = _load_function_module(function_id, content)
+
+        if valves is not None and hasattr(function_module, "Valves"):
+            function_module.valves = function_module.Valves(**valves)
+
+        if user_valves is not None and hasattr(function_module, "UserValves"):
+            params["__user__"]["valves"] = function_module.UserValves(**user_valves)
+
+        # Relay events to the emitter and caller of the server process
+        async def event_emitter(event: dict):
+            send("event", event)
+
+        async def event_call(event: dict):
+            send("call", event)
+            return replies.get()
+
+        if params.get("__event_emitter__"):
+            params["__event_emitter__"] = event_emitter
+        if params.get("__event_call__"):
+            params["__event_call__"] = event_call
+
+        result = getattr(function_module, method)(**params)
+        if inspect.isawaitable(result):
+            result = _run(result)
+
+        if inspect.isasyncgen(result):
+            send("stream")
+            try:
+                while not cancelled.is_set():
+                    try:
+                        send("chunk", _run(result.__anext__()))
+                    except StopAsyncIteration:
+                        break
+            finally:
+                _run(result.aclose())
+            send("done")
+        elif isinstance(result, Iterator):
+            send("stream")
+            try:
+                for chunk in result:
+                    send("chunk", chunk)
+                    if cancelled.is_set():
+                        break
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            send("done")
+        else:
+            send("result", result)
+    except Exception as e:
+        send("error", f"{type(e).__name__}: {e}")
+
+
+####################
+# Server process
+####################
+
+
+def get_picklable_params(params: dict) -> tuple[dict, Optional[dict]]:
+    """
+    Prepare the parameters of a call for a worker process. Returns the
+    parameters along with the user valves, which are rebuilt by the worker.
+    Parameters that can't leave this process (e.g. `__request__`) are
+    passed as None; event emitters are relayed instead.
+    """
+    picklable_params = {}
+    user_valves = None
+
+    for key, value in params.items():
+        if key in ("__event_emitter__", "__event_call__"):
+            picklable_params[key] = value is not None
+            continue
+
+        if key == "__user__" and isinstance(value, dict):
+            value = {**value}
+            valves = value.pop("valves", None)
+            if isinstance(valves, BaseModel):
+                user_valves = valves.model_dump()
+
+        try:
+            pickle.dumps(value)
+            picklable_params[key] = value
+        except Exception:
+            log.debug(f"Passing None for {key}, it can't be sent to a plugin worker")
+            picklable_params[key] = None
+
+    return picklable_params, user_valves
+
+
+class PluginWorkerPool:
+    """
+    Pool of worker processes running the `pipe`, `inlet` and `outlet` methods
+    of functions that declare `isolation: process` in their frontmatter, so
+    CPU heavy functions don't stall every other request on the event loop.
+
+    Workers report through a single queue, which a dispatcher thread routes
+    to the call each message belongs to. Plain results are returned as is,
+    while generators come back as async generators yielding each chunk as
+    soon as the worker produces it. Calls to `__event_emitter__` and
+    `__event_call__` are forwarded to the callables of the server process.
+    Results and chunks must be picklable (a `StreamingResponse` is not).
+
+    Closing a stream early (e.g. the client disconnected) stops the worker at
+    its next chunk, so an abandoned stream doesn't keep a worker busy.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor = None
+        self._manager = None
+        self._messages = None
+        self._calls: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _start(self):
+        async with self._lock:
+            if self._executor is None:
+                # Forking a process running an event loop (and threads) isn't safe
+                context = multiprocessing.get_context("spawn")
+                self._manager = await asyncio.to_thread(context.Manager)
+                self._messages = await asyncio.to_thread(self._manager.Queue)
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context
+                )
+                # A single thread waits on the workers for every call
+                threading.Thread(
+                    target=self._dispatch,
+                    args=(self._messages,),
+                    name="plugin-worker-dispatcher",
+                    daemon=True,
+                ).start()
+
+    def _dispatch(self, messages):
+        """
+        Route the messages of the workers to the queue of their call until
+        None is received or the manager goes away.
+        """
+        while True:
+            try:
+                message = messages.get()
+            except Exception:
+                break
+            if message is None:
+                break
+
+            call_id, kind, data = message
+            self._post(call_id, (kind, data))
+
+    def _post(self, call_id: str, message: tuple):
+        # Messages of finished or abandoned calls are dropped
+        target = self._calls.get(call_id)
+        if target is None:
+            return
+        loop, inbox = target
+        try:
+            loop.call_soon_threadsafe(inbox.put_nowait, message)
+        except RuntimeError:
+            # The event loop of the call was closed
+            pass
+
+    async def call(
+        self,
+        function_id: str,
+        content: str,
+        method: str,
+        params: dict,
+        valves: Optional[dict] = None,
+    ) -> Any:
+        await self._start()
+
+        event_emitter = params.get("__event_emitter__")
+        event_call = params.get("__event_call__")
+        params, user_valves = get_picklable_params(params)
+
+        call_id = uuid.uuid4().hex
+        inbox = asyncio.Queue()
+        self._calls[call_id] = (asyncio.get_running_loop(), inbox)
+
+        try:
+            replies = self._manager.Queue()
+            cancelled = self._manager.Event()
+            future = self._executor.submit(
+                _run_function_method,
+                function_id,
+                content,
+                method,
+                valves,
+                user_valves,
+                params,
+                call_id,
+                self._messages,
+                replies,
+                cancelled,
+            )
+        except BaseException:
+            self._calls.pop(call_id, None)
+            raise
+
+        future.add_done_callback(lambda _: self._post(call_id, ("exit", None)))
+
+        def cancel():
+            # Drop the call if it hasn't started yet, otherwise have the worker
+            # stop streaming and unblock a pending `__event_call__`
+            self._calls.pop(call_id, None)
+            if future.cancel() or future.done():
+                return
+            try:
+                cancelled.set()
+                replies.put(None)
+            except Exception as e:
+                log.debug(f"Could not cancel plugin worker call: {e}")
+
+        async def get_message():
+            exited = False
+            while True:
+                if exited:
+                    # The last message of the worker may still be on its way
+                    try:
+                        kind, data = await asyncio.wait_for(
+                            inbox.get(), MESSAGE_POLL_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        raise Exception("Plugin worker exited without a result")
+                else:
+                    kind, data = await inbox.get()
+
+                if kind == "exit":
+                    # Raises if the worker died
+                    future.result()
+                    exited = True
+                elif kind == "event":
+                    if event_emitter:
+                        await event_emitter(data)
+                elif kind == "call":
+                    reply = await event_call(data) if event_call else None
+                    replies.put(reply)
+                elif kind == "error":
+                    raise Exception(data)
+                else:
+                    return kind, data
+
+        try:
+            kind, data = await get_message()
+        except BaseException:
+            cancel()
+            raise
+
+        if kind == "result":
+            self._calls.pop(call_id, None)
+            return data
+
+        async def stream():
+            try:
+                while True:
+                    kind, data = await get_message()
+                    if kind == "done":
+                        break
+                    yield data
+            finally:
+                # Also runs on GeneratorExit/CancelledError when abandoned
+                cancel()
+
+        return stream()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            try:
+                # Stop the dispatcher
+                self._messages.put(None)
+            except Exception:
+                pass
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
+            self._messages = None
+            self._calls.clear()
+
+
+PLUGIN_WORKER_POOL = PluginWorkerPool(max_workers=PLUGIN_WORKER_POOL_SIZE)
+
+
+class IsolatedFunction:
+    """
+    Stand-in for a function instance whose `pipe`, `inlet` and `outlet` run
+    in the plugin worker pool. Everything else (valves, `pipes`, `stream`,
+    ...) is served by the instance loaded in the server process.
+
+    The `Request` can't be sent to a worker, so handlers declaring
+    `__request__` get None for it.
+    """
+
+    def __init__(self, function_id: str, content: str, function_module: Any):
+        object.__setattr__(self, "_function_id", function_id)
+        object.__setattr__(self, "_content", content)
+        object.__setattr__(self, "_function_module", function_module)
+
+        for method in ISOLATED_METHODS:
+            handler = getattr(function_module, method, None)
+            if handler is not None:
+                if "__request__" in inspect.signature(handler).parameters:
+                    log.warning(
+                        f"{function_id}.{method} runs in a plugin worker, "
+                        "its __request__ will be None"
+                    )
+                object.__setattr__(self, method, self._get_handler(method, handler))
+
+    def __getattr__(self, name):
+        return getattr(self._function_module, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._function_module, name, value)
+
+    def _get_handler(self, method: str, handler):
+        # Keep the signature of the handler, callers inspect it to pick the params
+        @functools.wraps(handler)
+        async def isolated_handler(**params):
+            valves = getattr(self._function_module, "valves", None)
+            return await PLUGIN_WORKER_POOL.call(
+                self._function_id,
+                self._content,
+                method,
+                params,
+                valves=valves.model_dump() if isinstance(valves, BaseModel) else None,
+            )
+
+        return isolated_handler
+
+
+def is_isolated(frontmatter: dict) -> bool:
+    return frontmatter.get(ISOLATION_FRONTMATTER_KEY, "").lower() == ISOLATION_PROCESS
@@ -0,0 +1,104 @@
+import logging
+from typing import Iterable, Optional
+
+from fastapi import Request
+
+from open_webui.models.functions import FunctionModel, Functions
+from open_webui.models.models import ModelModel, Models
+from open_webui.models.tools import ToolModel, Tools
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class MetadataResolver:
+    """
+    Memoized lookup of the models, functions and tools used while handling a
+    single request.
+
+    Models and tools are fetched in batches of the ids that haven't been seen
+    yet, and the (small) function table is loaded once, so the filter, action
+    and tool lookups made along the chat completion path don't each go back to
+    the database.
+    """
+
+    def __init__(self):
+        self._models: dict[str, Optional[ModelModel]] = {}
+        self._tools: dict[str, Optional[ToolModel]] = {}
+        self._functions: Optional[dict[str, FunctionModel]] = None
+
+    def load(
+        self,
+        model_ids: Iterable[str] = (),
+        tool_ids: Iterable[str] = (),
+    ):
+        model_ids = [id for id in set(model_ids) if id and id not in self._models]
+        if model_ids:
+            models = {model.id: model for model in Models.get_models_by_ids(model_ids)}
+            for model_id in model_ids:
+                self._models[model_id] = models.get(model_id)
+
+        tool_ids = [id for id in set(tool_ids) if id and id not in self._tools]
+        if tool_ids:
+            tools = {tool.id: tool for tool in Tools.get_tools_by_ids(tool_ids)}
+            for tool_id in tool_ids:
+                self._tools[tool_id] = tools.get(tool_id)
+
+    def resolve(self, model_id: str, tool_ids: Optional[list[str]] = None):
+        """
+        Load a model along with its base model, tools and all functions
+        (filters and actions) in one batch per table.
+        """
+        self.load(model_ids=[model_id])
+        model = self._models.get(model_id)
+
+        model_ids = []
+        tool_ids = list(tool_ids or [])
+        if model is not None:
+            model_ids.append(model.base_model_id)
+            if model.meta:
+                tool_ids.extend(getattr(model.meta, "toolIds", None) or [])
+
+        self.load(model_ids=model_ids, tool_ids=tool_ids)
+        self.get_functions()
+
+    def get_model(self, model_id: str) -> Optional[ModelModel]:
+        self.load(model_ids=[model_id])
+        return self._models.get(model_id)
+
+    def get_tool(self, tool_id: str) -> Optional[ToolModel]:
+        self.load(tool_ids=[tool_id])
+        return self._tools.get(tool_id)
+
+    def get_functions(self) -> dict[str, FunctionModel]:
+        if self._functions is None:
+            self._functions = {
+                function.id: function for function in Functions.get_functions()
+            }
+        return self._functions
+
+    def get_function(self, function_id: str) -> Optional[FunctionModel]:
+        return self.get_functions().get(function_id)
+
+    def get_functions_by_type(
+        self, type: str, active_only=False, global_only=False
+    ) -> list[FunctionModel]:
+        return [
+            function
+            for function in self.get_functions().values()
+            if function.type == type
+            and (function.is_active or not active_only)
+            and (function.is_global or not global_only)
+        ]
+
+
+def get_metadata_resolver(request: Request) -> MetadataResolver:
+    """
+    Get the resolver bound to the request, creating it on first use.
+    """
+    resolver = getattr(request.state, "metadata_resolver", None)
+    if resolver is None:
+        resolver = MetadataResolver()
+        request.state.metadata_resolver = resolver
+    return resolver
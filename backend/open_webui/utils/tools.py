@@ -4,6 +4,10 @@ import re
 import inspect
 import aiohttp
 import asyncio
+import contextvars
+import hashlib
+import json
+import time
 import yaml
 
 from pydantic import BaseModel
@@ -22,6 +26,7 @@ from typing import (
     Optional,
     Type,
 )
+from concurrent.futures import ThreadPoolExecutor
 from functools import update_wrapper, partial
 
 
@@ -33,21 +38,37 @@ from langchain_core.utils.function_calling import (
 )
 
 
-from open_webui.models.tools import Tools
+from open_webui.models.tools import ToolModel, Tools
 from open_webui.models.users import UserModel
 from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.resolver import get_metadata_resolver
 from open_webui.env import (
     SRC_LOG_LEVELS,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    TOOL_SERVER_SPEC_CACHE_TTL,
+    SYNC_TOOL_THREAD_POOL_SIZE,
 )
 
 import copy
+from collections import OrderedDict
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 
+# Compiled tool server specs along with the validators used to revalidate them,
+# least recently used first. Session tokens give every user their own entry, so
+# the cache is bounded
+TOOL_SERVER_SPECS_MAX_SIZE = 256
+TOOL_SERVER_SPECS: OrderedDict[str, dict] = OrderedDict()
+_tool_server_refresh_tasks: dict[str, asyncio.Task] = {}
+
+SYNC_TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SYNC_TOOL_THREAD_POOL_SIZE, thread_name_prefix="sync-tool"
+)
+
+
 def get_async_tool_function_and_apply_extra_params(
     function: Callable, extra_params: dict
 ) -> Callable[..., Awaitable]:
@@ -59,21 +80,111 @@ def get_async_tool_function_and_apply_extra_params(
         update_wrapper(partial_func, function)
         return partial_func
     else:
-        # Make it a coroutine function
+        # Make it a coroutine function, running in a thread of its own executor
+        # so a blocking tool doesn't stall the event loop. A timeout only stops
+        # waiting for it, the thread keeps running until the tool returns
         async def new_function(*args, **kwargs):
-            return partial_func(*args, **kwargs)
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(
+                SYNC_TOOL_EXECUTOR,
+                partial(context.run, partial_func, *args, **kwargs),
+            )
 
         update_wrapper(new_function, function)
         return new_function
 
 
+def get_tool_module_from_cache(request: Request, tool: ToolModel):
+    """
+    Get the loaded module of a tool, reloading it when its content changed
+    (e.g. the tool was updated through another worker).
+    """
+    module = request.app.state.TOOLS.get(tool.id, None)
+    if module is None or request.app.state.TOOL_CONTENTS.get(tool.id) != tool.content:
+        module, _ = load_tool_module_by_id(tool.id)
+        request.app.state.TOOLS[tool.id] = module
+        request.app.state.TOOL_CONTENTS[tool.id] = tool.content
+
+    return module
+
+
+def get_tool_digest(tool: ToolModel, valves: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            [tool.content, tool.specs, valves], sort_keys=True, default=str
+        ).encode()
+    ).hexdigest()
+
+
+def get_tool_specs_from_cache(request: Request, tool: ToolModel) -> tuple:
+    """
+    Get the module of a tool along with its prepared specs, valves and
+    metadata. These only depend on the tool itself, so they are cached per
+    (tool id, version) and only the extra params binding is left per request.
+    """
+    module = get_tool_module_from_cache(request, tool)
+
+    valves = tool.valves or {}
+
+    # `updated_at` only has a one second resolution, the digest catches
+    # changes made within the same second
+    version = (tool.updated_at, get_tool_digest(tool, valves), id(module))
+    tool_specs = request.app.state.TOOL_SPECS.get(tool.id, None)
+    if tool_specs is not None and tool_specs["version"] == version:
+        return module, tool_specs
+
+    # Set valves for the tool
+    if hasattr(module, "valves") and hasattr(module, "Valves"):
+        module.valves = module.Valves(**valves)
+
+    specs = []
+    for spec in copy.deepcopy(tool.specs):
+        # TODO: Fix hack for OpenAI API
+        # Some times breaks OpenAI but others don't. Leaving the comment
+        for val in spec.get("parameters", {}).get("properties", {}).values():
+            if val.get("type") == "str":
+                val["type"] = "string"
+
+        # Remove internal reserved parameters (e.g. __id__, __user__)
+        spec["parameters"]["properties"] = {
+            key: val
+            for key, val in spec["parameters"]["properties"].items()
+            if not key.startswith("__")
+        }
+
+        # TODO: Support Pydantic models as parameters
+        function_name = spec["name"]
+        doc = getattr(module, function_name).__doc__
+        if doc and doc.strip() != "":
+            s = re.split(":(param|return)", doc, 1)
+            spec["description"] = s[0]
+        else:
+            spec["description"] = function_name
+
+        specs.append(spec)
+
+    tool_specs = {
+        "version": version,
+        "specs": specs,
+        "metadata": {
+            "file_handler": hasattr(module, "file_handler") and module.file_handler,
+            "citation": hasattr(module, "citation") and module.citation,
+        },
+    }
+    request.app.state.TOOL_SPECS[tool.id] = tool_specs
+    return module, tool_specs
+
+
 def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
     tools_dict = {}
 
+    resolver = get_metadata_resolver(request)
+    resolver.load(tool_ids=tool_ids)
+
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
+        tool = resolver.get_tool(tool_id)
         if tool is None:
             if tool_id.startswith("server:"):
                 server_idx = int(tool_id.split(":")[1])
@@ -140,36 +251,16 @@ def get_tools(
             else:
                 continue
         else:
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module, tool_specs = get_tool_specs_from_cache(request, tool)
 
             extra_params["__id__"] = tool_id
 
-            # Set valves for the tool
-            if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
             if hasattr(module, "UserValves"):
                 extra_params["__user__"]["valves"] = module.UserValves(  # type: ignore
                     **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
-
+            for spec in tool_specs["specs"]:
                 # convert to function that takes only model params and inserts custom params
                 function_name = spec["name"]
                 tool_function = getattr(module, function_name)
@@ -177,23 +268,12 @@ def get_tools(
                     tool_function, extra_params
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
                     "spec": spec,
                     # Misc info
-                    "metadata": {
-                        "file_handler": hasattr(module, "file_handler")
-                        and module.file_handler,
-                        "citation": hasattr(module, "citation") and module.citation,
-                    },
+                    "metadata": tool_specs["metadata"],
                 }
 
                 # TODO: if collision, prepend toolkit name
@@ -334,20 +414,29 @@ def get_tool_specs(tool_module: object) -> list[dict]:
     return specs
 
 
-def resolve_schema(schema, components):
+def resolve_schema(schema, components, resolved_refs: Optional[dict] = None):
     """
     Recursively resolves a JSON schema using OpenAPI components.
+    `resolved_refs` memoizes `$ref` targets so each one is only resolved once.
     """
     if not schema:
         return {}
 
+    if resolved_refs is None:
+        resolved_refs = {}
+
     if "$ref" in schema:
         ref_path = schema["$ref"]
-        ref_parts = ref_path.strip("#/").split("/")
-        resolved = components
-        for part in ref_parts[1:]:  # Skip the initial 'components'
-            resolved = resolved.get(part, {})
-        return resolve_schema(resolved, components)
+        if ref_path not in resolved_refs:
+            ref_parts = ref_path.strip("#/").split("/")
+            resolved = components
+            for part in ref_parts[1:]:  # Skip the initial 'components'
+                resolved = resolved.get(part, {})
+            resolved_refs[ref_path] = resolve_schema(
+                resolved, components, resolved_refs
+            )
+        # Every $ref gets its own copy so callers can't alias one another
+        return copy.deepcopy(resolved_refs[ref_path])
 
     resolved_schema = copy.deepcopy(schema)
 
@@ -355,11 +444,13 @@ def resolve_schema(schema, components):
     if "properties" in resolved_schema:
         for prop, prop_schema in resolved_schema["properties"].items():
             resolved_schema["properties"][prop] = resolve_schema(
-                prop_schema, components
+                prop_schema, components, resolved_refs
             )
 
     if "items" in resolved_schema:
-        resolved_schema["items"] = resolve_schema(resolved_schema["items"], components)
+        resolved_schema["items"] = resolve_schema(
+            resolved_schema["items"], components, resolved_refs
+        )
 
     return resolved_schema
 
@@ -375,6 +466,7 @@ def convert_openapi_to_tool_payload(openapi_spec):
         list: A list of tool payloads.
     """
     tool_payload = []
+    resolved_refs = {}
 
     for path, methods in openapi_spec.get("paths", {}).items():
         for method, operation in methods.items():
@@ -416,7 +508,9 @@ def convert_openapi_to_tool_payload(openapi_spec):
                     json_schema = content.get("application/json", {}).get("schema")
                     if json_schema:
                         resolved_schema = resolve_schema(
-                            json_schema, openapi_spec.get("components", {})
+                            json_schema,
+                            openapi_spec.get("components", {}),
+                            resolved_refs,
                         )
 
                         if resolved_schema.get("properties"):
@@ -440,13 +534,29 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
+def get_tool_server_cache_key(token: str, url: str) -> str:
+    return hashlib.sha256(f"{url}:{token or ''}".encode()).hexdigest()
+
+
 async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
+    """
+    Fetch and compile the OpenAPI spec of a tool server. A previously compiled
+    spec is revalidated with a conditional GET and reused if unchanged.
+    """
+    cache_key = get_tool_server_cache_key(token, url)
+    cached = TOOL_SERVER_SPECS.get(cache_key)
+
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
     }
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
 
     error = None
     try:
@@ -455,6 +565,10 @@ async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
             async with session.get(
                 url, headers=headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
             ) as response:
+                if response.status == 304 and cached:
+                    cached["fetched_at"] = time.time()
+                    return cached["data"]
+
                 if response.status != 200:
                     error_body = await response.json()
                     raise Exception(error_body)
@@ -465,6 +579,9 @@ async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
                     res = yaml.safe_load(text_content)
                 else:
                     res = await response.json()
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -479,12 +596,55 @@ async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
         "specs": convert_openapi_to_tool_payload(res),
     }
 
+    TOOL_SERVER_SPECS[cache_key] = {
+        "data": data,
+        "etag": etag,
+        "last_modified": last_modified,
+        "fetched_at": time.time(),
+    }
+    TOOL_SERVER_SPECS.move_to_end(cache_key)
+    while len(TOOL_SERVER_SPECS) > TOOL_SERVER_SPECS_MAX_SIZE:
+        TOOL_SERVER_SPECS.popitem(last=False)
+
     log.info("Fetched data:", data)
     return data
 
 
+async def get_cached_tool_server_data(token: str, url: str) -> Dict[str, Any]:
+    """
+    Get the compiled spec of a tool server, fetching it only the first time.
+    Specs older than TOOL_SERVER_SPEC_CACHE_TTL are returned as is while they
+    are revalidated in the background.
+    """
+    cache_key = get_tool_server_cache_key(token, url)
+    cached = TOOL_SERVER_SPECS.get(cache_key)
+    if cached is None:
+        return await get_tool_server_data(token, url)
+    TOOL_SERVER_SPECS.move_to_end(cache_key)
+
+    if time.time() - cached["fetched_at"] > TOOL_SERVER_SPEC_CACHE_TTL:
+        task = _tool_server_refresh_tasks.get(cache_key)
+        if task is None or task.done():
+
+            async def refresh():
+                try:
+                    await get_tool_server_data(token, url)
+                except Exception as e:
+                    log.warning(f"Failed to refresh tool server spec from {url}: {e}")
+
+            task = asyncio.create_task(refresh())
+            task.add_done_callback(
+                lambda _: _tool_server_refresh_tasks.pop(cache_key, None)
+            )
+            _tool_server_refresh_tasks[cache_key] = task
+
+    return cached["data"]
+
+
 async def get_tool_servers_data(
-    servers: List[Dict[str, Any]], session_token: Optional[str] = None
+    servers: List[Dict[str, Any]],
+    session_token: Optional[str] = None,
+    refresh: bool = False,
 ) -> List[Dict[str, Any]]:
     # Prepare list of enabled servers along with their original index
     server_entries = []
@@ -513,10 +673,9 @@ async def get_tool_servers_data(
                 token = session_token
             server_entries.append((idx, server, full_url, info, token))
 
-    # Create async tasks to fetch data
-    tasks = [
-        get_tool_server_data(token, url) for (_, _, url, _, token) in server_entries
-    ]
+    # Create async tasks to fetch data, revalidating cached specs when refreshing
+    get_data = get_tool_server_data if refresh else get_cached_tool_server_data
+    tasks = [get_data(token, url) for (_, _, url, _, token) in server_entries]
 
     # Execute tasks concurrently
     responses = await asyncio.gather(*tasks, return_exceptions=True)
@@ -531,6 +690,9 @@ async def get_tool_servers_data(
         openapi_data = response.get("openapi", {})
 
         if info and isinstance(openapi_data, dict):
+            # Copy before overriding so the cached spec stays untouched
+            openapi_data = {**openapi_data, "info": {**openapi_data.get("info", {})}}
+
             if "name" in info:
                 openapi_data["info"]["title"] = info.get("name", "Tool Server")
 
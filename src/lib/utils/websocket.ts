@@ -44,6 +44,14 @@ export const setupSocket = async (enableWebsocket) => {
 		activeUserIds.set(data.user_ids);
 	});
 
+	_socket.on('user-presence', (data) => {
+		console.log('user-presence', data);
+		activeUserIds.update((userIds) => [
+			...(userIds ?? []).filter((id) => !data.joined.includes(id) && !data.left.includes(id)),
+			...data.joined
+		]);
+	});
+
 	_socket.on('usage', (data) => {
 		console.log('usage', data);
 		USAGE_POOL.set(data['models']);